@@ -1,17 +1,25 @@
 # The 'HashTable' class is a data structure that stores key-value pairs.
 # It uses a hash function to compute an index into an array in which an element will be inserted or searched.
 # This allows for constant time average complexity for search, insert, and delete operations.
+from collections import namedtuple
+
+# The 'HashTableStats' tuple describes how full a table is and how well its keys are spread: 'load' is the number of
+# entries per bucket (or slot), 'longest_chain' the most entries compared by one lookup, 'collisions' the entries
+# that are not found at their first position, and 'resizes' how often the table has been re-hashed.
+HashTableStats = namedtuple("HashTableStats", ["size", "capacity", "load", "max_load", "longest_chain",
+                                               "collisions", "resizes"])
+
 
 class HashTable:
     # The __init__ method initializes a new instance of the HashTable class.
     # The time complexity of the init method is O(n), where n is the number of items in the list
     # that the hashtable is initialized with.
     def __init__(self, items=None, load_factor=0.75):
+        self.size = 0
+        self.resizes = 0
         if items is None:
-            self.size = 0
             self.capacity = 10
         else:
-            self.size = len(items)
             self.capacity = self._calculate_capacity(len(items), load_factor)
 
         self.load_factor = load_factor
@@ -21,6 +29,15 @@ class HashTable:
             for key, value in items:
                 self.set(key, value)
 
+    # The 'from_iterable' class method builds a hashtable from (key, value) pairs in one pass.
+    # 'size_hint' is the expected number of pairs; when it is given (or the items have a length) the
+    # table is sized once up front instead of doubling log2(n) times. The time complexity is O(n).
+    @classmethod
+    def from_iterable(cls, items, size_hint=None, load_factor=0.75):
+        hashtable = cls(load_factor=load_factor)
+        hashtable.update(items, size_hint)
+        return hashtable
+
     # The _hash method returns a hash value for a given key. The time complexity is O(1).
     def _hash(self, key):
         return hash(key) % self.capacity
@@ -36,10 +53,11 @@ class HashTable:
         return capacity
 
     # The _resize method resizes the hash table when the size exceeds capacity*load_factor.
-    # It doubles the capacity of the table and re-hashes all the key-value pairs in the table.
+    # It doubles the capacity of the table (or uses 'new_capacity') and re-hashes all the key-value pairs.
     # The time complexity of this method is O(n), where n is the number of elements in the hash table.
-    def _resize(self):
-        new_capacity = self.capacity * 2
+    def _resize(self, new_capacity=None):
+        if new_capacity is None:
+            new_capacity = self.capacity * 2
         new_table = [[] for _ in range(new_capacity)]
 
         for bucket in self.table:
@@ -49,6 +67,25 @@ class HashTable:
 
         self.table = new_table
         self.capacity = new_capacity
+        self.resizes += 1
+
+    # The reserve method makes room for 'num_items' entries in total with at most one re-hash, so a
+    # bulk load of that many entries triggers no further resizes. The time complexity is O(n).
+    def reserve(self, num_items):
+        capacity = self._calculate_capacity(num_items, self.load_factor)
+        if capacity > self.capacity:
+            self._resize(capacity)
+
+    # The update method adds every (key, value) pair from an iterable. 'size_hint' is the number of
+    # new pairs expected; it defaults to len(items) when available and is used to reserve space once.
+    # The average time complexity is O(n), where n is the number of pairs.
+    def update(self, items, size_hint=None):
+        if size_hint is None and hasattr(items, '__len__'):
+            size_hint = len(items)
+        if size_hint:
+            self.reserve(self.size + size_hint)
+        for key, value in items:
+            self.set(key, value)
 
     # The set method adds a key-value pair to the hashtable. If the key already exists in the hashtable,
     # it updates the value. The average time complexity of this method is O(1).
@@ -96,6 +133,37 @@ class HashTable:
 
         return False
 
+    # The items method yields every (key, value) pair, bucket by bucket. O(n + capacity) for a full pass.
+    def items(self):
+        for bucket in self.table:
+            for key, value in bucket:
+                yield key, value
+
+    # The values method yields every stored value. O(n + capacity) for a full pass.
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+    # '__iter__' yields the keys, like a dict. O(n + capacity) for a full pass.
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    # '__len__' returns the number of stored pairs in O(1).
+    def __len__(self):
+        return self.size
+
+    # '__contains__' checks whether a key is stored, even if its value is None. O(1) average.
+    def __contains__(self, key):
+        return any(current_key == key for current_key, _ in self.table[self._hash(key)])
+
+    # The 'stats' method returns a HashTableStats: the load factor the table is at, the longest bucket, how many
+    # entries share a bucket with an earlier one and the number of resizes. The time complexity is O(capacity).
+    def stats(self):
+        chains = [len(bucket) for bucket in self.table]
+        return HashTableStats(self.size, self.capacity, self.size / self.capacity, self.load_factor,
+                              max(chains, default=0), self.size - (len(chains) - chains.count(0)), self.resizes)
+
     # The __str__ method provides a string representation of the hashtable.
     # It's helpful for debugging and understanding the distribution of key-value pairs across the buckets.
     # The time complexity of this method is O(n), where n is the number of elements in the hashtable.
@@ -106,3 +174,206 @@ class HashTable:
                 key, value = key_value_pair
                 result += f"Bucket {index}: {key} => {value}\n"
         return result
+
+
+# Sentinels that mark never-used and deleted slots in the open-addressing table.
+_EMPTY = object()
+_DELETED = object()
+
+
+# The 'OpenAddressingHashTable' class is an array-backed alternative to 'HashTable' with the same
+# set/get/delete API. Keys and values live in two parallel lists instead of per-entry [key, value]
+# lists, and collisions are resolved with linear probing. Deleted slots are marked with a tombstone
+# so probe sequences stay intact, tombstones are reused by later inserts, and the table shrinks when
+# it becomes mostly empty. Search, insert and delete are O(1) average time complexity.
+class OpenAddressingHashTable:
+    _MIN_CAPACITY = 8
+
+    # The __init__ method initializes the parallel key/value arrays. 'shrink_factor' is the load below
+    # which a delete halves the table. The time complexity is O(n) for the initial items.
+    def __init__(self, items=None, load_factor=0.75, shrink_factor=0.2):
+        self.load_factor = load_factor
+        self.shrink_factor = shrink_factor
+        self.size = 0
+        self.tombstones = 0
+        self.resizes = 0
+
+        num_items = 0 if items is None else len(items)
+        self._allocate(max(self._MIN_CAPACITY, self._calculate_capacity(num_items, load_factor)))
+
+        if items is not None:
+            for key, value in items:
+                self.set(key, value)
+
+    # Capacities are powers of two so the probe start can be computed with a bit mask.
+    _calculate_capacity = HashTable._calculate_capacity
+
+    # The 'from_iterable' class method builds a table from (key, value) pairs, sized once from 'size_hint'.
+    # The time complexity is O(n).
+    @classmethod
+    def from_iterable(cls, items, size_hint=None, load_factor=0.75):
+        table = cls(load_factor=load_factor)
+        table.update(items, size_hint)
+        return table
+
+    # The _allocate method replaces the arrays with empty ones of the given capacity. O(capacity).
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self.slot_keys = [_EMPTY] * capacity
+        self.slot_values = [None] * capacity
+
+    # The _find method returns the slot holding 'key', or -1 if the key is not present.
+    # The average time complexity is O(1).
+    def _find(self, key):
+        keys = self.slot_keys
+        mask = self._mask
+        index = hash(key) & mask
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return -1
+            if slot_key is not _DELETED and slot_key == key:
+                return index
+            index = (index + 1) & mask
+
+    # The _rehash method moves every live entry into freshly allocated arrays of the new capacity.
+    # Tombstones are dropped in the process. The time complexity is O(n).
+    def _rehash(self, new_capacity):
+        old_keys, old_values = self.slot_keys, self.slot_values
+        self._allocate(new_capacity)
+        self.tombstones = 0
+        self.resizes += 1
+
+        keys, values, mask = self.slot_keys, self.slot_values, self._mask
+        for key, value in zip(old_keys, old_values):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            index = hash(key) & mask
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            keys[index] = key
+            values[index] = value
+
+    # The reserve method makes room for 'num_items' live entries with at most one rehash. O(n).
+    def reserve(self, num_items):
+        capacity = self._calculate_capacity(num_items, self.load_factor)
+        if capacity > self.capacity:
+            self._rehash(capacity)
+
+    # The update method adds every (key, value) pair from an iterable, reserving space once from
+    # 'size_hint' (or len(items)). The average time complexity is O(n).
+    def update(self, items, size_hint=None):
+        if size_hint is None and hasattr(items, '__len__'):
+            size_hint = len(items)
+        if size_hint:
+            self.reserve(self.size + size_hint)
+        for key, value in items:
+            self.set(key, value)
+
+    # The set method adds a key-value pair or updates the value of an existing key. The first tombstone
+    # seen on the probe path is reused for a new key. When live entries plus tombstones pass the load
+    # factor, the table doubles, or is rebuilt at the same size if most of the used slots are tombstones.
+    # The average time complexity is O(1).
+    def set(self, key, value):
+        keys = self.slot_keys
+        mask = self._mask
+        index = hash(key) & mask
+        first_tombstone = -1
+
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                break
+            if slot_key is _DELETED:
+                if first_tombstone < 0:
+                    first_tombstone = index
+            elif slot_key == key:
+                self.slot_values[index] = value
+                return
+            index = (index + 1) & mask
+
+        if first_tombstone >= 0:
+            index = first_tombstone
+            self.tombstones -= 1
+
+        keys[index] = key
+        self.slot_values[index] = value
+        self.size += 1
+
+        if self.size + self.tombstones > self.capacity * self.load_factor:
+            if self.size > self.capacity * self.load_factor / 2:
+                self._rehash(self.capacity * 2)
+            else:
+                self._rehash(self.capacity)
+
+    # The get method retrieves a value based on the provided key, or None if it is not present.
+    # The average time complexity is O(1).
+    def get(self, key):
+        index = self._find(key)
+        if index < 0:
+            return None
+        return self.slot_values[index]
+
+    # The delete method replaces the entry with a tombstone and shrinks the table by half once the
+    # live entries fall below the shrink factor. The average time complexity is O(1).
+    def delete(self, key):
+        index = self._find(key)
+        if index < 0:
+            return False
+
+        self.slot_keys[index] = _DELETED
+        self.slot_values[index] = None
+        self.size -= 1
+        self.tombstones += 1
+
+        if self.capacity > self._MIN_CAPACITY and self.size < self.capacity * self.shrink_factor:
+            self._rehash(self.capacity // 2)
+        return True
+
+    # The items method yields every live (key, value) pair in slot order. O(capacity) for a full pass.
+    def items(self):
+        for key, value in zip(self.slot_keys, self.slot_values):
+            if key is not _EMPTY and key is not _DELETED:
+                yield key, value
+
+    # The values method yields every stored value. O(capacity) for a full pass.
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+    # '__iter__' yields the keys, like a dict. O(capacity) for a full pass.
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    # '__len__' returns the number of live entries in O(1).
+    def __len__(self):
+        return self.size
+
+    # '__contains__' checks whether a key is stored, even if its value is None. O(1) average.
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    # The 'stats' method returns a HashTableStats for the live entries: 'longest_chain' is the longest probe
+    # sequence a lookup of a stored key walks and 'collisions' the keys not stored in their home slot. Rebuilds at
+    # the same size or smaller count as resizes. The time complexity is O(capacity).
+    def stats(self):
+        longest, collisions = 0, 0
+        for index, key in enumerate(self.slot_keys):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            probes = ((index - (hash(key) & self._mask)) & self._mask) + 1
+            longest = max(longest, probes)
+            collisions += probes > 1
+        return HashTableStats(self.size, self.capacity, self.size / self.capacity, self.load_factor, longest,
+                              collisions, self.resizes)
+
+    # The __str__ method provides a string representation of the occupied slots.
+    # The time complexity of this method is O(capacity).
+    def __str__(self):
+        result = ""
+        for index, (key, value) in enumerate(zip(self.slot_keys, self.slot_values)):
+            if key is not _EMPTY and key is not _DELETED:
+                result += f"Slot {index}: {key} => {value}\n"
+        return result
@@ -0,0 +1,78 @@
+# The 'AddressRegistry' class wraps the rows loaded from Addresses.csv and indexes them once.
+# Routing used to find an address by scanning the whole address list on every lookup, which made
+# a single route cost O(N^2 * A). The registry keeps dictionaries keyed by address ID, by the exact
+# address string and by a normalized form of the address, so every lookup is O(1) on average.
+import re
+
+_SEPARATORS = re.compile(r"[.,]")
+_DIRECTIONS = {"north": "n", "south": "s", "east": "e", "west": "w"}
+
+
+# The 'normalize_address' function reduces an address to a canonical form so that small spelling
+# differences ("South" vs "S", extra spaces, different case) map to the same key.
+# The time complexity is O(L), where L is the length of the address.
+def normalize_address(address):
+    words = _SEPARATORS.sub(" ", address).casefold().split()
+    return " ".join(_DIRECTIONS.get(word, word) for word in words)
+
+
+class AddressRegistry:
+    # The __init__ method builds the ID and exact-address indexes from a list of (id, name, address) rows.
+    # The normalized index is built lazily on the first lookup that misses the exact index.
+    # The time complexity is O(A), where A is the number of addresses.
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self._by_id = {}
+        self._exact = {}
+        self._normalized = None
+        self._partial = {}
+
+        for row in self.rows:
+            address_id, _, address = row
+            self._by_id.setdefault(address_id, row)
+            self._exact.setdefault(address, address_id)
+
+    # The 'wrap' class method returns the registry unchanged, or builds one from a plain list of rows.
+    # This lets the routing functions accept either form without every caller having to change.
+    @classmethod
+    def wrap(cls, addresses):
+        if isinstance(addresses, cls):
+            return addresses
+        return cls(addresses)
+
+    # The 'get' method returns the (id, name, address) row for an address ID, or None.
+    # The average time complexity is O(1).
+    def get(self, address_id):
+        return self._by_id.get(address_id)
+
+    # The 'index_of' method returns the address ID for an address string, or None if it is unknown.
+    # It tries the exact string, then the normalized string, and finally falls back to the substring
+    # match that 'extract_address' has always used. Fallback results are cached, so each distinct
+    # address string pays for at most one O(A) scan. The average time complexity is O(1).
+    def index_of(self, address):
+        address_id = self._exact.get(address)
+        if address_id is not None:
+            return address_id
+
+        if self._normalized is None:
+            self._normalized = {}
+            for row_id, _, row_address in self.rows:
+                self._normalized.setdefault(normalize_address(row_address), row_id)
+
+        address_id = self._normalized.get(normalize_address(address))
+        if address_id is not None:
+            return address_id
+
+        if address not in self._partial:
+            self._partial[address] = next((row[0] for row in self.rows if address in row[2]), None)
+        return self._partial[address]
+
+    # The following methods let the registry be used anywhere the plain list of rows was used.
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
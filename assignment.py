@@ -0,0 +1,591 @@
+# The 'assignment' module partitions the package manifest across the trucks automatically, replacing the
+# hand-written shipment lists. The constraints hidden in the package notes are parsed first:
+#   "Can only be on truck N"                        -> the package must ride on truck N
+#   "Delayed on flight---will not arrive ... 9:05 am" -> the package is not at the depot before 9:05
+#   "Must be delivered with 13, 15"                 -> the packages travel together (transitively)
+#   "Wrong address listed"                          -> optionally held until the address is corrected
+# Packages that must travel together become one unit. Units are clustered around far-apart seed addresses so
+# the savings step works on small blocks, then the Clarke-Wright savings heuristic merges units into routes
+# that respect truck capacity, truck restrictions, availability times and deadlines. Finally every route is
+# given to a compatible truck. A load is only given to a truck when the route 'calculate_route' drives for it,
+# leaving when the truck really can (after the truck whose driver it waits for is back), reaches every deadline;
+# only when no assignment does are the deadlines checked against a straight drive from the depot instead.
+# Building the savings of a cluster is vectorized with NumPy; the whole solve is about O(n * c log c) for n units
+# in clusters of at most c units, plus one route calculation for every load that is checked.
+import datetime
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from address_registry import AddressRegistry
+from distance_matrix import DistanceMatrix
+from package import Package
+from vehicle import Vehicle
+
+DEFAULT_DEPOT = "4001 South 700 East"
+DEFAULT_CLUSTER_SIZE = 150
+_NO_DEADLINE = datetime.timedelta(days=1)  # the deadline of a unit whose packages are all due at the end of the day
+CAPACITY_FRACTIONS = (1.0, 0.75, 0.5, 0.25)
+
+_TRUCK_NOTE = re.compile(r"can only be on truck\s+(\d+)", re.IGNORECASE)
+_DELAYED_NOTE = re.compile(r"delayed.*until\s+(\d{1,2}:\d{2}\s*[ap]m)", re.IGNORECASE)
+_WITH_NOTE = re.compile(r"must be delivered with\s+([\d,\s]+)", re.IGNORECASE)
+_WRONG_ADDRESS_NOTE = re.compile(r"wrong address", re.IGNORECASE)
+
+# A 'Trip' is one depot round trip that some truck still has to be chosen for: its package IDs in driving order,
+# the truck it is restricted to (or None), when its packages are all at the depot, the latest departure that
+# still reaches its deadlines and how long the round trip takes (None when it is not known).
+Trip = namedtuple("Trip", ["packages", "truck", "available_at", "latest_start", "duration"], defaults=(None,))
+PackageConstraints = namedtuple("PackageConstraints", ["truck", "available_at", "deliver_with", "deadline",
+                                                       "wrong_address"])
+
+
+# The 'parse_clock' function converts a "10:30 AM" style string to a timedelta since midnight, or None for EOD.
+# Each distinct string is parsed once.
+@lru_cache(maxsize=None)
+def parse_clock(text):
+    text = text.strip().upper()
+    if not text or text == 'EOD':
+        return None
+    parsed = datetime.datetime.strptime(text.replace(" ", ""), '%I:%M%p')
+    return datetime.timedelta(hours=parsed.hour, minutes=parsed.minute)
+
+
+# The 'parse_constraints' function reads a package's deadline and notes into a PackageConstraints tuple.
+# The time complexity is O(L) in the length of the notes.
+def parse_constraints(package):
+    notes = package.notes or ""
+    truck = _TRUCK_NOTE.search(notes)
+    delayed = _DELAYED_NOTE.search(notes)
+    deliver_with = _WITH_NOTE.search(notes)
+    return PackageConstraints(
+        truck=int(truck.group(1)) if truck else None,
+        available_at=parse_clock(delayed.group(1)) if delayed else None,
+        deliver_with=tuple(int(value) for value in re.findall(r"\d+", deliver_with.group(1))) if deliver_with else (),
+        deadline=parse_clock(package.deadline),
+        wrong_address=bool(_WRONG_ADDRESS_NOTE.search(notes)),
+    )
+
+
+# The 'package_groups' function joins the packages that must travel together (transitively, through "Must be
+# delivered with" notes) with a union-find structure. It returns the groups, each in 'package_ids' order, and the
+# parsed constraints of every package. The time complexity is O(n alpha(n)).
+def package_groups(hashtable, package_ids):
+    parent = {package_id: package_id for package_id in package_ids}
+
+    def find(package_id):
+        while parent[package_id] != package_id:
+            parent[package_id] = parent[parent[package_id]]
+            package_id = parent[package_id]
+        return package_id
+
+    constraints = {package_id: parse_constraints(hashtable.get(package_id)) for package_id in package_ids}
+    for package_id in package_ids:
+        for other in constraints[package_id].deliver_with:
+            if other in parent:
+                parent[find(other)] = find(package_id)
+
+    groups = {}
+    for package_id in package_ids:
+        groups.setdefault(find(package_id), []).append(package_id)
+    return list(groups.values()), constraints
+
+
+# The '_Route' class is one candidate truck load: an ordered list of units plus its merged constraints.
+# 'latest_start' is the latest departure from the depot that can still reach every deadline stop directly, a bound
+# that the driven route can only be later than.
+class _Route:
+    __slots__ = ('units', 'load', 'truck', 'available_at', 'deadline', 'latest_start')
+
+    def __init__(self, unit, info):
+        self.units = [unit]
+        self.load = len(info["packages"])
+        self.truck = info["truck"]
+        self.available_at = info["available_at"]
+        self.deadline = info["deadline"]
+        self.latest_start = info["latest_start"]
+
+    # The 'compatible' method checks whether two routes can share a truck of the given capacity. With
+    # 'same_arrival' their packages must also reach the depot at the same time.
+    def compatible(self, other, capacity, same_arrival=False):
+        if self.load + other.load > capacity:
+            return False
+        if same_arrival and self.available_at != other.available_at:
+            return False
+        if self.truck is not None and other.truck is not None and self.truck != other.truck:
+            return False
+        return max(self.available_at, other.available_at) <= min(self.latest_start, other.latest_start)
+
+    # The 'absorb' method appends another route's units (already oriented by the caller) and merges constraints.
+    def absorb(self, other):
+        self.units.extend(other.units)
+        self.load += other.load
+        self.truck = self.truck if self.truck is not None else other.truck
+        self.available_at = max(self.available_at, other.available_at)
+        self.deadline = min(self.deadline, other.deadline)
+        self.latest_start = min(self.latest_start, other.latest_start)
+
+    # The 'copy' method returns a route with the same units and constraints that can be changed on its own.
+    def copy(self):
+        route = _Route.__new__(_Route)
+        for slot in _Route.__slots__:
+            setattr(route, slot, getattr(self, slot))
+        route.units = list(self.units)
+        return route
+
+
+class AssignmentSolver:
+    # The __init__ method stores the package table and routing data. 'address_correction_time' holds packages
+    # with a "Wrong address listed" note until that time (by default they are not held). 'optimizer' and
+    # 'deadline_aware' are the options 'calculate_route' will drive the routes with, so they are checked the same way.
+    def __init__(self, hashtable, addresses, distances, depot_address=DEFAULT_DEPOT,
+                 cluster_size=DEFAULT_CLUSTER_SIZE, address_correction_time=None, optimizer=None,
+                 deadline_aware=False):
+        self.hashtable = hashtable
+        self.addresses = AddressRegistry.wrap(addresses)
+        self.distances = DistanceMatrix.wrap(distances)
+        self.depot_address = depot_address
+        self.depot_index = self.addresses.index_of(depot_address)
+        self.cluster_size = cluster_size
+        self.address_correction_time = address_correction_time
+        self.optimizer = optimizer
+        self.deadline_aware = deadline_aware
+        self._driven = {}
+
+    # The 'solve' method assigns every package to one of 'vehicles' (Vehicle objects), sets each vehicle's
+    # shipments and moves its departure time to when its load is available, and returns {vehicle_id: [ids]}.
+    # 'start_after' ({vehicle_id: vehicle IDs}) are the vehicles whose drivers a vehicle waits for, as given to
+    # FleetPlanner.add_vehicle: it leaves when the first of them is back, so they must come before it in 'vehicles'.
+    # A ValueError is raised when the constraints cannot all be met by the fleet.
+    def solve(self, vehicles, package_ids=None, start_after=None):
+        if package_ids is None:
+            package_ids = list(self.hashtable)
+        vehicles = list(vehicles)
+        start_after = {vehicle_id: tuple(waits) for vehicle_id, waits in (start_after or {}).items() if waits}
+        earlier = set()
+        for vehicle in vehicles:
+            unknown = [vehicle_id for vehicle_id in start_after.get(vehicle.id, ()) if vehicle_id not in earlier]
+            if unknown:
+                raise ValueError(f"Vehicle {vehicle.id} starts after vehicles {unknown} that do not come before it.")
+            earlier.add(vehicle.id)
+        capacity = max(vehicle.max_load for vehicle in vehicles)
+        velocity = min(vehicle.velocity for vehicle in vehicles)
+
+        units = self._build_units(package_ids, {vehicle.id for vehicle in vehicles}, velocity)
+        # Every truck-restricted unit starts in its truck's single route; the rest are clustered. When the
+        # routes cannot all be placed, the leftover units are tried again tightest deadline first, then the
+        # routes are built again with a smaller load limit, which leaves more room to reinsert units. The
+        # driven routes are checked first, with savings routes kept apart by the time their packages arrive (so
+        # the early packages can leave early) and then without, and only then is the straight-line bound used.
+        attempts = [(driven, same_arrival, fraction, deadline_first)
+                    for driven, same_arrival in ((True, True), (True, False), (False, False))
+                    for fraction in CAPACITY_FRACTIONS for deadline_first in (False, True)]
+        self._driven.clear()
+        try:
+            for driven, same_arrival, fraction, deadline_first in attempts:
+                routes, open_units = self._truck_routes(units)
+                for cluster in self._clusters(units, open_units):
+                    routes.extend(self._savings(units, cluster, max(1, int(capacity * fraction)), same_arrival))
+                try:
+                    plans = self._assign_routes(units, routes, vehicles, deadline_first,
+                                                start_after if driven else None)
+                    break
+                except ValueError:
+                    if (driven, same_arrival, fraction, deadline_first) == attempts[-1]:
+                        raise
+        finally:
+            self._driven.clear()
+
+        assignment = {}
+        for vehicle in vehicles:
+            route = plans[vehicle.id]
+            shipments = [] if route is None else [package_id for unit in route.units
+                                                  for package_id in units[unit]["packages"]]
+            assignment[vehicle.id] = shipments
+            vehicle.shipments = list(shipments)
+            if route is None:
+                continue
+            start = max(vehicle.departure_time, route.available_at)
+            vehicle.departure_time = start
+            vehicle.current_time = start
+        return assignment
+
+    # The 'trips' method splits the packages into depot round trips of at most 'capacity' packages, for trucks that
+    # can drive several trips a day, without giving the trips to trucks: the units, clusters and savings routes are
+    # the ones 'solve' builds, except that the units restricted to one truck are split into as many trips as that
+    # truck's capacity needs. 'truck_ids' are the trucks of the fleet and 'velocity' the slowest truck's speed.
+    # Each trip is routed once from when its packages are at the depot, so its latest start and duration are those
+    # of the stop order 'calculate_route' drives. It returns Trip tuples, the tightest latest start first. A
+    # ValueError is raised for a group of packages larger than 'capacity'. The time complexity is
+    # O(n * c log c), like 'solve' without the matching, plus one route per trip.
+    def trips(self, capacity, velocity, truck_ids, package_ids=None):
+        if package_ids is None:
+            package_ids = list(self.hashtable)
+        units = self._build_units(package_ids, set(truck_ids), velocity)
+        oversized = [unit["packages"] for unit in units if len(unit["packages"]) > capacity]
+        if oversized:
+            raise ValueError(f"Packages {oversized[0]} must travel together but do not fit in one truck.")
+
+        restricted, open_units = self._truck_routes(units)
+        routes = []
+        for chain in restricted:
+            route = None
+            for unit in chain.units:
+                if route is not None and route.load + len(units[unit]["packages"]) > capacity:
+                    routes.append(route)
+                    route = None
+                if route is None:
+                    route = _Route(unit, units[unit])
+                else:
+                    route.absorb(_Route(unit, units[unit]))
+            routes.append(route)
+        for cluster in self._clusters(units, open_units):
+            routes.extend(self._savings(units, cluster, capacity))
+
+        trips = []
+        self._driven.clear()
+        try:
+            for route in routes:
+                package_ids = [package_id for unit in route.units for package_id in units[unit]["packages"]]
+                times, back, _ = self._drive(package_ids, route.available_at, velocity)
+                deadlines = {package_id: parse_clock(self.hashtable.get(package_id).deadline)
+                             for package_id in package_ids}
+                latest_start = min([route.latest_start] + [route.available_at + deadline - times[package_id]
+                                                           for package_id, deadline in deadlines.items()
+                                                           if deadline is not None])
+                trips.append(Trip(package_ids, route.truck, route.available_at, latest_start,
+                                  back - route.available_at))
+        finally:
+            self._driven.clear()
+        trips.sort(key=lambda trip: (trip.latest_start, trip.available_at, trip.packages[0]))
+        return trips
+
+    # The _build_units method turns the groups of packages that must travel together ('package_groups') into
+    # units. Each unit records its packages, representative address and merged constraints, including the latest
+    # start that reaches its deadline stops driving straight from the depot at 'velocity'.
+    # The time complexity is O(n alpha(n)).
+    def _build_units(self, package_ids, truck_ids, velocity):
+        groups, constraints = package_groups(self.hashtable, package_ids)
+        units = []
+        for members in groups:
+            trucks = {constraints[key].truck for key in members if constraints[key].truck is not None}
+            if len(trucks) > 1:
+                raise ValueError(f"Packages {members} must travel together but are restricted to trucks {trucks}.")
+            truck = trucks.pop() if trucks else None
+            if truck is not None and truck not in truck_ids:
+                raise ValueError(f"Packages {members} need truck {truck}, which is not in the fleet.")
+
+            available_at = max((constraints[key].available_at or datetime.timedelta(0) for key in members))
+            if self.address_correction_time is not None and any(constraints[key].wrong_address for key in members):
+                available_at = max(available_at, self.address_correction_time)
+            stops = [self.addresses.index_of(self.hashtable.get(key).address) for key in members]
+            deadlines = [constraints[key].deadline or _NO_DEADLINE for key in members]
+            latest_start = min(deadline - datetime.timedelta(hours=self.distances.distance(self.depot_index, stop)
+                                                             / velocity)
+                               for deadline, stop in zip(deadlines, stops))
+
+            # The unit's representative address is the stop closest to the unit's other stops
+            block = self.distances.values[np.ix_(stops, stops)]
+            units.append({"packages": members, "index": stops[int(np.argmin(block.sum(axis=1)))],
+                          "truck": truck, "available_at": available_at, "deadline": min(deadlines),
+                          "latest_start": latest_start})
+        return units
+
+    # The _truck_routes method puts every unit restricted to the same truck into one route, chained nearest
+    # neighbour first from the depot, because a truck makes one trip. It returns those routes and the indexes
+    # of the unrestricted units. The time complexity is O(n + r^2) for r restricted units.
+    def _truck_routes(self, units):
+        by_truck = {}
+        open_units = []
+        for position, unit in enumerate(units):
+            if unit["truck"] is None:
+                open_units.append(position)
+            else:
+                by_truck.setdefault(unit["truck"], []).append(position)
+
+        routes = []
+        values = self.distances.values
+        for members in by_truck.values():
+            current = self.depot_index
+            remaining = list(members)
+            route = None
+            while remaining:
+                nearest = min(remaining, key=lambda position: values[current, units[position]["index"]])
+                remaining.remove(nearest)
+                current = units[nearest]["index"]
+                if route is None:
+                    route = _Route(nearest, units[nearest])
+                else:
+                    route.absorb(_Route(nearest, units[nearest]))
+            routes.append(route)
+        return routes, open_units
+
+    # The _clusters method splits the units at positions 'members' into blocks of roughly 'cluster_size' around
+    # farthest-first seed addresses; every unit joins its nearest seed. The time complexity is O(n * k) for
+    # k clusters.
+    def _clusters(self, units, members):
+        count = len(members)
+        if count <= self.cluster_size:
+            return [list(members)] if members else []
+
+        members = np.asarray(members, dtype=np.intp)
+        indexes = np.array([units[position]["index"] for position in members], dtype=np.intp)
+        values = self.distances.values
+        seeds = [int(np.argmax(values[self.depot_index, indexes]))]
+        nearest = values[indexes[seeds[0]], indexes]
+        for _ in range(math.ceil(count / self.cluster_size) - 1):
+            seeds.append(int(np.argmax(nearest)))
+            nearest = np.minimum(nearest, values[indexes[seeds[-1]], indexes])
+
+        labels = np.argmin(values[np.ix_(indexes[seeds], indexes)], axis=0)
+        return [members[labels == label].tolist() for label in range(len(seeds))]
+
+    # The _savings method runs Clarke-Wright on one cluster. Every unit starts as its own depot round trip;
+    # joining the end of one route to the start of another saves d(0, i) + d(0, j) - d(i, j). Pairs are tried
+    # from the largest saving down and merged when both units are route ends and the constraints allow it (with
+    # 'same_arrival', only units whose packages arrive at the same time are merged).
+    # The time complexity is O(c^2 log c) for a cluster of c units.
+    def _savings(self, units, cluster, capacity, same_arrival=False):
+        routes = {unit: _Route(unit, units[unit]) for unit in cluster}
+        if len(cluster) < 2:
+            return list(routes.values())
+
+        indexes = np.array([units[unit]["index"] for unit in cluster], dtype=np.intp)
+        values = self.distances.values
+        from_depot = values[self.depot_index, indexes]
+        savings = from_depot[:, None] + from_depot[None, :] - values[np.ix_(indexes, indexes)]
+        first, second = np.triu_indices(len(cluster), k=1)
+        pair_savings = savings[first, second]
+        positive = pair_savings > 0
+        ranked = np.argsort(-pair_savings[positive], kind='stable')
+        first, second = first[positive][ranked], second[positive][ranked]
+
+        for i, j in zip(first.tolist(), second.tolist()):
+            unit_i, unit_j = cluster[i], cluster[j]
+            route_i, route_j = routes[unit_i], routes[unit_j]
+            if route_i is route_j or not route_i.compatible(route_j, capacity, same_arrival):
+                continue
+            # Orient both routes so that unit_i ends the first and unit_j starts the second
+            if route_i.units[-1] != unit_i:
+                if route_i.units[0] != unit_i:
+                    continue
+                route_i.units.reverse()
+            if route_j.units[0] != unit_j:
+                if route_j.units[-1] != unit_j:
+                    continue
+                route_j.units.reverse()
+            route_i.absorb(route_j)
+            for unit in route_j.units:
+                routes[unit] = route_i
+
+        unique = {id(route): route for route in routes.values()}
+        return list(unique.values())
+
+    # The _assign_routes method gives routes to trucks, most constrained route first (fewest trucks that could
+    # take it, then largest load), each to the eligible free truck that can leave soonest. Routes left without a
+    # truck are broken up and their units are inserted one by one, most constrained unit first, at the cheapest
+    # position of a truck's route that keeps it feasible (with 'deadline_first', the earliest latest start goes
+    # first). Unless 'start_after' is None, a truck is only eligible when every driven route of the fleet still
+    # reaches its deadlines with the change (see '_schedule'). A ValueError is raised when a unit fits nowhere.
+    # The time complexity is O(R * V) for the matching plus O(u * V * L) for u reinserted units, and one route
+    # calculation for every changed load that is checked.
+    def _assign_routes(self, units, routes, vehicles, deadline_first=False, start_after=None):
+        plans = {vehicle.id: None for vehicle in vehicles}
+        vehicles_by_id = {vehicle.id: vehicle for vehicle in vehicles}
+        # A changed load moves the vehicle and every vehicle that (through others) waits for it
+        moved = {}
+        for vehicle in vehicles:
+            moved[vehicle.id] = {vehicle.id}
+            for other in vehicles:
+                if any(vehicle_id in moved[vehicle.id] for vehicle_id in (start_after or {}).get(other.id, ())):
+                    moved[vehicle.id].add(other.id)
+        schedule = None if start_after is None else self._schedule(plans, vehicles, units, start_after)
+
+        def on_time(vehicle_id, route):
+            # (start of the vehicle with 'route', schedule of the fleet), or None when a route would be late
+            if start_after is None:
+                return max(vehicles_by_id[vehicle_id].departure_time, route.available_at), None
+            trial = self._schedule({**plans, vehicle_id: route}, vehicles, units, start_after, schedule,
+                                   moved[vehicle_id])
+            if any(trial[moving][2] for moving in moved[vehicle_id]):
+                return None
+            return trial[vehicle_id][0], trial
+
+        def place(vehicle_id, route, trial):
+            nonlocal schedule
+            plans[vehicle_id] = route
+            schedule = trial
+
+        leftovers = []
+        ranked = sorted(routes, key=lambda route: (sum(self._fits(vehicle, route) for vehicle in vehicles),
+                                                   -route.load))
+        for route in ranked:
+            starts = [(on_time(vehicle.id, route), vehicle.id) for vehicle in vehicles
+                      if plans[vehicle.id] is None and self._fits(vehicle, route)]
+            starts = [(found[0], vehicle_id, found[1]) for found, vehicle_id in starts if found is not None]
+            if starts:
+                _, vehicle_id, trial = min(starts, key=lambda found: found[:2])
+                place(vehicle_id, route, trial)
+            else:
+                leftovers.extend(route.units)
+
+        def urgency(unit):
+            fits = sum(self._fits(vehicle, _Route(unit, units[unit])) for vehicle in vehicles)
+            if deadline_first:
+                return fits, units[unit]["latest_start"], -units[unit]["available_at"]
+            return fits, -units[unit]["available_at"], units[unit]["latest_start"]
+
+        def insert(unit, excluded=None):
+            # Put 'unit' at the cheapest position of a route (not the one of 'excluded') that keeps the fleet on
+            # time; only as many routes are driven as it takes to find one
+            single = _Route(unit, units[unit])
+            insertions = [self._insertion(units, plans[vehicle.id], unit) + (vehicle.id,) for vehicle in vehicles
+                          if vehicle.id != excluded and self._fits(vehicle, single, plans[vehicle.id])]
+            for _, position, vehicle_id in sorted(insertions, key=lambda insertion: (insertion[0], insertion[2])):
+                route = self._inserted(plans[vehicle_id], single, position)
+                found = on_time(vehicle_id, route)
+                if found is not None:
+                    place(vehicle_id, route, found[1])
+                    return True
+            return False
+
+        def exchange(unit):
+            # Put 'unit' in the place of a less urgent unit of some route, and that unit on another truck
+            single = _Route(unit, units[unit])
+            for vehicle in vehicles:
+                route, before = plans[vehicle.id], schedule
+                for other in ([] if route is None else list(route.units)):
+                    if units[other]["latest_start"] <= units[unit]["latest_start"]:
+                        continue
+                    rest = self._route_of(units, [member for member in route.units if member != other])
+                    if not self._fits(vehicle, single, rest):
+                        continue
+                    swapped = self._inserted(rest, single, self._insertion(units, rest, unit)[1])
+                    found = on_time(vehicle.id, swapped)
+                    if found is None:
+                        continue
+                    place(vehicle.id, swapped, found[1])
+                    if insert(other, excluded=vehicle.id):
+                        return True
+                    place(vehicle.id, route, before)
+            return False
+
+        leftovers.sort(key=urgency)
+        for unit in leftovers:
+            if not insert(unit) and not exchange(unit):
+                raise ValueError(f"Packages {units[unit]['packages']} cannot be placed on any truck.")
+        return plans
+
+    # The _inserted method returns a copy of 'route' (None for an empty one) with the one-unit route 'single'
+    # inserted at 'position'.
+    @staticmethod
+    def _inserted(route, single, position):
+        if route is None:
+            return single
+        route = route.copy()
+        route.absorb(single)
+        route.units.insert(position, route.units.pop())
+        return route
+
+    # The _route_of method builds the route through 'members' (unit positions, in order), or None without any.
+    @staticmethod
+    def _route_of(units, members):
+        route = None
+        for unit in members:
+            if route is None:
+                route = _Route(unit, units[unit])
+            else:
+                route.absorb(_Route(unit, units[unit]))
+        return route
+
+    # The _schedule method drives the loads of 'plans' ({vehicle_id: _Route or None}) in the order of 'vehicles'
+    # and returns {vehicle_id: (start, time back at the depot, late package IDs)}. A vehicle leaves once its
+    # packages are at the depot and, with vehicles to wait for in 'start_after', once the first of them is back,
+    # as the FleetPlanner will send it. With 'base', only the vehicles in 'changed' are driven again. A load
+    # without deadlines that no vehicle waits for is not driven (it cannot be late and its return is not needed),
+    # and the time back of a vehicle that no one waits for is only a lower bound.
+    # The time complexity is one '_drive' per vehicle whose load or start changed.
+    def _schedule(self, plans, vehicles, units, start_after, base=None, changed=None):
+        waited_for = {vehicle_id for waits in start_after.values() for vehicle_id in waits}
+        schedule = {}
+        for vehicle in vehicles:
+            if base is not None and vehicle.id not in changed:
+                schedule[vehicle.id] = base[vehicle.id]
+                continue
+            route = plans[vehicle.id]
+            start = vehicle.departure_time if route is None else max(vehicle.departure_time, route.available_at)
+            waits = start_after.get(vehicle.id, ())
+            if waits:
+                start = max(start, min(schedule[vehicle_id][1] for vehicle_id in waits))
+            if route is None:
+                schedule[vehicle.id] = (start, start, ())
+            elif route.deadline >= _NO_DEADLINE and vehicle.id not in waited_for:
+                schedule[vehicle.id] = (start, None, ())
+            else:
+                package_ids = [package_id for unit in route.units for package_id in units[unit]["packages"]]
+                if vehicle.id not in waited_for and self.optimizer is None and not self.deadline_aware:
+                    # 'calculate_route' drives the packages with a deadline first, in the same order without the
+                    # others, so only they are driven when the return time is not needed
+                    package_ids = [package_id for package_id in package_ids
+                                   if parse_clock(self.hashtable.get(package_id).deadline) is not None]
+                _, back, late = self._drive(package_ids, start, vehicle.velocity)
+                schedule[vehicle.id] = (start, back, late)
+        return schedule
+
+    # The _drive method routes 'package_ids' as the FleetPlanner will, with 'calculate_route' (and this solver's
+    # optimizer and deadline mode) on copies of the packages, leaving the depot at 'start' and coming back to it.
+    # It returns ({package ID: delivery time}, time back at the depot, late package IDs). A load driven before
+    # from the same start is not driven again. The time complexity is that of 'calculate_route'.
+    def _drive(self, package_ids, start, velocity):
+        from main import calculate_return_trip, calculate_route
+
+        key = (tuple(package_ids), start, velocity)
+        if key not in self._driven:
+            packages = {}
+            for package_id in package_ids:
+                package = self.hashtable.get(package_id)
+                packages[package_id] = Package(package.package_id, package.address, package.city, package.state,
+                                               package.zip_code, package.deadline, package.weight, package.notes)
+            vehicle = Vehicle(None, len(package_ids), velocity, None, list(package_ids), 0.0, start,
+                              self.depot_address)
+            calculate_route(vehicle, packages, self.addresses, self.distances, None, self.optimizer,
+                            self.deadline_aware)
+            calculate_return_trip(vehicle, vehicle.current_address, self.depot_address, self.distances,
+                                  self.addresses)
+            times = {package_id: package.delivery_time for package_id, package in packages.items()}
+            late = tuple(package_id for package_id, package in packages.items()
+                         if parse_clock(package.deadline) is not None and package.delivery_time >
+                         parse_clock(package.deadline))
+            self._driven[key] = (times, vehicle.current_time, late)
+        return self._driven[key]
+
+    # The _fits method checks whether 'route' (joined with 'extra' when given) can be driven by 'vehicle':
+    # the load fits, the truck restriction matches and the truck can leave before the latest start.
+    @staticmethod
+    def _fits(vehicle, route, extra=None):
+        load, truck = route.load, route.truck
+        available_at, latest_start = route.available_at, route.latest_start
+        if extra is not None:
+            load += extra.load
+            truck = truck if truck is not None else extra.truck
+            available_at = max(available_at, extra.available_at)
+            latest_start = min(latest_start, extra.latest_start)
+        if load > vehicle.max_load or (truck is not None and truck != vehicle.id):
+            return False
+        return max(vehicle.departure_time, available_at) <= latest_start
+
+    # The _insertion method returns (extra distance, position) of the cheapest place for 'unit' in a depot round
+    # trip through the units of 'route'. The time complexity is O(L) vectorized work.
+    def _insertion(self, units, route, unit):
+        values = self.distances.values
+        stop = units[unit]["index"]
+        if route is None:
+            return 2 * values[self.depot_index, stop], 0
+        path = np.array([self.depot_index] + [units[member]["index"] for member in route.units]
+                        + [self.depot_index], dtype=np.intp)
+        costs = values[path[:-1], stop] + values[stop, path[1:]] - values[path[:-1], path[1:]]
+        position = int(np.argmin(costs))
+        return float(costs[position]), position
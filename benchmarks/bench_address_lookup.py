@@ -0,0 +1,76 @@
+# bench_address_lookup.py
+# Compares the address lookups done in the routing inner loop before and after the AddressRegistry.
+# For every candidate parcel on every greedy step the route resolves two address strings to IDs
+# and then fetches both address rows by ID. The legacy versions below are the linear scans that
+# 'extract_address' and 'distance_between_addresses' used to do.
+#
+# Usage: python benchmarks/bench_address_lookup.py [stops]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from address_registry import AddressRegistry  # noqa: E402
+from main import extract_address  # noqa: E402
+
+
+def legacy_extract_address(address, addresses):
+    for row in addresses:
+        if address in row[2]:
+            return int(row[0])
+
+
+def legacy_address_rows(address_id_1, address_id_2, address_data):
+    address_1 = next((address for address in address_data if address[0] == address_id_1), None)
+    address_2 = next((address for address in address_data if address[0] == address_id_2), None)
+    return address_1, address_2
+
+
+def synthetic_addresses(count):
+    return [(index, f"Stop {index}", f"{index * 10 + 1} South {index % 97} East") for index in range(count)]
+
+
+def run(address_count, stops, seed=7):
+    rows = synthetic_addresses(address_count)
+    registry = AddressRegistry(rows)
+    rng = random.Random(seed)
+    stop_addresses = [rows[rng.randrange(address_count)][2] for _ in range(stops)]
+
+    def legacy_step(address_1, address_2):
+        id_1 = legacy_extract_address(address_1, rows)
+        id_2 = legacy_extract_address(address_2, rows)
+        return legacy_address_rows(id_1, id_2, rows)
+
+    def registry_step(address_1, address_2):
+        id_1 = extract_address(address_1, registry)
+        id_2 = extract_address(address_2, registry)
+        return registry.get(id_1), registry.get(id_2)
+
+    results = {}
+    for label, step in (("linear scan", legacy_step), ("registry", registry_step)):
+        start = time.perf_counter()
+        current = stop_addresses[0]
+        remaining = list(stop_addresses)
+        evaluations = 0
+        while remaining:
+            for address in remaining:
+                step(current, address)
+                evaluations += 1
+            current = remaining.pop()
+        results[label] = time.perf_counter() - start
+    return evaluations, results
+
+
+def main():
+    stops = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    print(f"{'addresses':>10} {'evaluations':>12} {'linear scan (s)':>16} {'registry (s)':>13} {'speedup':>8}")
+    for address_count in (1_000, 10_000):
+        evaluations, results = run(address_count, stops)
+        legacy, indexed = results["linear scan"], results["registry"]
+        print(f"{address_count:>10} {evaluations:>12} {legacy:>16.3f} {indexed:>13.4f} {legacy / indexed:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
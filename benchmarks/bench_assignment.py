@@ -0,0 +1,74 @@
+# bench_assignment.py
+# Benchmark for the AssignmentSolver: a synthetic depot whose packages carry the same kinds of notes as the
+# project manifest (truck restrictions, delayed arrivals, co-delivery groups and deadlines). It reports the
+# solve time and the planned mileage against a naive split of the manifest by package ID.
+#
+# Usage: python benchmarks/bench_assignment.py [trucks] [stops_per_truck]
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assignment import AssignmentSolver  # noqa: E402
+from bench_fleet_planner import synthetic_depot  # noqa: E402
+from fleet_planner import FleetPlanner  # noqa: E402
+from vehicle import Vehicle  # noqa: E402
+
+
+def add_notes(hashtable, trucks, seed=11):
+    rng = np.random.default_rng(seed)
+    package_ids = list(hashtable)
+    for package_id in package_ids:
+        package = hashtable.get(package_id)
+        roll = rng.random()
+        if roll < 0.02:
+            package.notes = f"Can only be on truck {rng.integers(1, trucks + 1)}"
+        elif roll < 0.05:
+            package.notes = "Delayed on flight---will not arrive to depot until 9:05 am"
+        elif roll < 0.07 and package_id > 2:
+            package.notes = f"Must be delivered with {package_id - 1}, {package_id - 2}"
+        elif roll < 0.20:
+            package.deadline = "5:00 PM"
+
+
+def fleet(trucks, capacity):
+    return [Vehicle(truck, capacity, 18, None, [], 0.0, datetime.timedelta(hours=8)) for truck in range(1, trucks + 1)]
+
+
+def mileage(hashtable, addresses, distances, vehicles):
+    planner = FleetPlanner(hashtable, addresses, distances, addresses[0][2])
+    for vehicle in vehicles:
+        vehicle.current_address = addresses[0][2]
+        vehicle.current_time = vehicle.departure_time
+        planner.add_vehicle(vehicle)
+    return planner.plan()[1]
+
+
+def main():
+    trucks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    stops = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    hashtable, addresses, distances, shipments = synthetic_depot(trucks, stops)
+    add_notes(hashtable, trucks)
+    capacity = int(stops * 1.1)
+    print(f"trucks: {trucks}, packages: {len(hashtable)}, capacity: {capacity}")
+
+    vehicles = fleet(trucks, capacity)
+    start = time.perf_counter()
+    AssignmentSolver(hashtable, addresses, distances, addresses[0][2]).solve(vehicles)
+    elapsed = time.perf_counter() - start
+    solved = mileage(hashtable, addresses, distances, vehicles)
+
+    naive = fleet(trucks, capacity)
+    for vehicle, truck_shipments in zip(naive, shipments):
+        vehicle.shipments = list(truck_shipments)
+    print(f"solve time: {elapsed:.2f} s")
+    print(f"miles, split by package ID: {mileage(hashtable, addresses, distances, naive):.1f}")
+    print(f"miles, AssignmentSolver:    {solved:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_candidates.py
+# Compares routing with and without the k-nearest-neighbour CandidateIndex (candidates.py) on synthetic depots from
+# synthetic_data.py, with one truck carrying every package. For each size it reports the time to build the index,
+# the greedy construction time of 'calculate_route' with a full scan and with candidates (the routes must be
+# identical), and the 2-opt / Or-opt RouteOptimizer run to convergence (or its time budget) on that greedy route
+# with and without candidates: miles, time and the quality gap of the candidate search.
+#
+# Usage: python benchmarks/bench_candidates.py [k] [time budget in seconds]
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import DEPOT_ADDRESS, write_instance  # noqa: E402
+
+from address_registry import AddressRegistry  # noqa: E402
+from candidates import CandidateIndex  # noqa: E402
+from HashTable import HashTable  # noqa: E402
+from main import calculate_route, load_address_data, load_distance_data, load_packages_into_hash  # noqa: E402
+from route_optimizer import RouteOptimizer  # noqa: E402
+from vehicle import Vehicle  # noqa: E402
+
+SIZES = ((500, 500), (1_000, 2_000), (2_000, 5_000), (3_000, 10_000))  # (addresses, packages)
+
+
+def construct(hashtable, addresses, distances, candidates):
+    vehicle = Vehicle(1, len(hashtable), 18, None, list(hashtable), 0.0, datetime.timedelta(hours=8), DEPOT_ADDRESS)
+    began = time.perf_counter()
+    calculate_route(vehicle, hashtable, addresses, distances, candidates=candidates)
+    return list(vehicle.shipments), vehicle.total_distance, time.perf_counter() - began
+
+
+def main():
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+    print(f"k = {k}, local search budget {budget:g} s")
+    print(f"{'addresses':>9}{'stops':>7}{'index ms':>10}{'greedy mi':>11}{'full ms':>9}{'cand ms':>9}{'scans':>7}"
+          f"{'full mi':>10}{'full s':>8}{'cand mi':>9}{'cand s':>8}{'gap':>7}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for address_count, package_count in SIZES:
+            paths = write_instance(os.path.join(directory, f"{address_count}-{package_count}"), address_count,
+                                   package_count)
+            hashtable = HashTable()
+            load_packages_into_hash(hashtable, paths["packages"])
+            addresses = AddressRegistry(load_address_data(paths["addresses"]))
+            distances = load_distance_data(paths["distances"])
+
+            began = time.perf_counter()
+            index = CandidateIndex(distances, k)
+            building = time.perf_counter() - began
+            route, greedy_miles, full_time = construct(hashtable, addresses, distances, None)
+            candidate_route, _, candidate_time = construct(hashtable, addresses, distances, index)
+            if candidate_route != route:
+                raise SystemExit("The routes built with and without candidates differ.")
+
+            depot = addresses.index_of(DEPOT_ADDRESS)
+            stops = [addresses.index_of(hashtable.get(int(package_id)).address) for package_id in route]
+            full = RouteOptimizer(time_budget=budget).improve(depot, stops, distances, end_index=depot)
+            near = RouteOptimizer(time_budget=budget, candidates=index).improve(depot, stops, distances,
+                                                                                end_index=depot)
+            gap = near.final_distance / full.final_distance - 1
+            print(f"{address_count:>9}{len(stops):>7}{building * 1e3:>10.1f}{greedy_miles:>11.1f}"
+                  f"{full_time * 1e3:>9.1f}{candidate_time * 1e3:>9.1f}{index.full_scans:>7}"
+                  f"{full.final_distance:>10.1f}{full.elapsed:>8.2f}{near.final_distance:>9.1f}{near.elapsed:>8.2f}"
+                  f"{gap:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
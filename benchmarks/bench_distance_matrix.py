@@ -0,0 +1,75 @@
+# bench_distance_matrix.py
+# Compares the old lower-triangular list of lists with the dense DistanceMatrix:
+# memory for the stored distances and the cost of one greedy nearest-stop step.
+#
+# Usage: python benchmarks/bench_distance_matrix.py [addresses]
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distance_matrix import DistanceMatrix  # noqa: E402
+
+
+def triangular_rows(size, seed=7):
+    rng = random.Random(seed)
+    return [[round(rng.uniform(0.5, 15.0), 1) for _ in range(i)] + [0.0] + [None] * (size - i - 1)
+            for i in range(size)]
+
+
+def list_memory(size):
+    tracemalloc.start()
+    rows = triangular_rows(size)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, current
+
+
+def legacy_nearest(current, stops, rows):
+    best, best_distance = None, float('inf')
+    for stop in stops:
+        distance = rows[current][stop]
+        if distance is None:
+            distance = rows[stop][current]
+        if distance <= best_distance:
+            best, best_distance = stop, distance
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    rows, list_bytes = list_memory(size)
+    matrix64 = DistanceMatrix.from_rows(rows)
+    matrix32 = DistanceMatrix.from_rows(rows, np.float32)
+
+    print(f"addresses: {size}")
+    print(f"list of lists:       {list_bytes / 2**20:9.1f} MiB")
+    print(f"DistanceMatrix f64:  {matrix64.nbytes / 2**20:9.1f} MiB ({list_bytes / matrix64.nbytes:.1f}x smaller)")
+    print(f"DistanceMatrix f32:  {matrix32.nbytes / 2**20:9.1f} MiB ({list_bytes / matrix32.nbytes:.1f}x smaller)")
+
+    stops = list(range(1, size))
+    stop_indexes = np.array(stops, dtype=np.intp)
+    repeats = 50
+
+    start = time.perf_counter()
+    for current in range(repeats):
+        legacy_nearest(current, stops, rows)
+    legacy = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for current in range(repeats):
+        candidates = matrix64.row(current)[stop_indexes]
+        len(candidates) - 1 - int(np.argmin(candidates[::-1]))
+    vectorized = (time.perf_counter() - start) / repeats
+
+    print(f"nearest stop over {len(stops)} stops: python loop {legacy * 1e3:.3f} ms, "
+          f"argmin {vectorized * 1e3:.3f} ms ({legacy / vectorized:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
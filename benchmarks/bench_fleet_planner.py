@@ -0,0 +1,69 @@
+# bench_fleet_planner.py
+# Scaling benchmark for the FleetPlanner: a synthetic depot with many trucks, each routed with the greedy
+# construction plus the RouteOptimizer, planned with 1, 2, 4 and 8 worker processes. Speedup is bounded
+# by the number of CPU cores available.
+#
+# Usage: python benchmarks/bench_fleet_planner.py [trucks] [stops_per_truck]
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from address_registry import AddressRegistry  # noqa: E402
+from distance_matrix import DistanceMatrix  # noqa: E402
+from fleet_planner import FleetPlanner  # noqa: E402
+from HashTable import HashTable  # noqa: E402
+from package import Package  # noqa: E402
+from route_optimizer import RouteOptimizer  # noqa: E402
+from vehicle import Vehicle  # noqa: E402
+
+
+def synthetic_depot(trucks, stops, seed=7):
+    rng = np.random.default_rng(seed)
+    address_count = trucks * stops // 2 + 1
+    points = rng.random((address_count, 2)) * 20
+    distances = DistanceMatrix(np.round(np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1)), 1))
+    rows = [(index, f"Stop {index}", f"{index} Main St") for index in range(address_count)]
+
+    hashtable = HashTable()
+    shipments = []
+    for truck in range(trucks):
+        truck_shipments = []
+        for _ in range(stops):
+            package_id = len(hashtable) + 1
+            hashtable.set(package_id, Package(str(package_id), rows[rng.integers(1, address_count)][2],
+                                              "Salt Lake City", "UT", "84111", "EOD", "1", ""))
+            truck_shipments.append(package_id)
+        shipments.append(truck_shipments)
+    return hashtable, AddressRegistry(rows), distances, shipments
+
+
+def plan(hashtable, addresses, distances, shipments, workers):
+    planner = FleetPlanner(hashtable, addresses, distances, addresses[0][2], workers,
+                           RouteOptimizer(time_budget=10.0, max_iterations=3))
+    for truck, truck_shipments in enumerate(shipments, start=1):
+        planner.add_vehicle(Vehicle(truck, len(truck_shipments), 18, None, list(truck_shipments), 0.0,
+                                    datetime.timedelta(hours=8), addresses[0][2]))
+    start = time.perf_counter()
+    _, total_distance = planner.plan()
+    return time.perf_counter() - start, total_distance
+
+
+def main():
+    trucks = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    stops = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    print(f"trucks: {trucks}, stops per truck: {stops}, CPU cores: {os.cpu_count()}")
+    baseline = None
+    for workers in (1, 2, 4, 8):
+        hashtable, addresses, distances, shipments = synthetic_depot(trucks, stops)
+        elapsed, total_distance = plan(hashtable, addresses, distances, shipments, workers)
+        baseline = baseline or elapsed
+        print(f"workers {workers}: {elapsed:6.2f} s  speedup {baseline / elapsed:4.2f}x  miles {total_distance:.1f}")
+
+
+if __name__ == "__main__":
+    main()
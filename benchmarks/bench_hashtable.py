@@ -0,0 +1,75 @@
+# bench_hashtable.py
+# Micro-benchmark of the chained HashTable, the OpenAddressingHashTable and the built-in dict.
+# Each table receives N package IDs, answers N lookups, then churns through N delete/insert pairs
+# the way the package store does during a day. Memory is the traced allocation of the filled table.
+#
+# Usage: python benchmarks/bench_hashtable.py [N]
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from HashTable import HashTable, OpenAddressingHashTable  # noqa: E402
+
+
+class DictTable:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+
+def traced_memory(table_class, count):
+    value = object()
+    tracemalloc.start()
+    table = table_class()
+    for key in range(count):
+        table.set(key, value)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory
+
+
+def measure(table_class, count):
+    value = object()
+    start = time.perf_counter()
+    table = table_class()
+    for key in range(count):
+        table.set(key, value)
+    insert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in range(count):
+        table.get(key)
+    lookup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in range(count):
+        table.delete(key)
+        table.set(key + count, value)
+    churn = time.perf_counter() - start
+    return insert, lookup, churn, traced_memory(table_class, count)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"N = {count}")
+    print(f"{'table':<24} {'insert (s)':>10} {'get (s)':>9} {'churn (s)':>10} {'bytes/entry':>12}")
+    for label, table_class in (("HashTable (chained)", HashTable),
+                               ("OpenAddressingHashTable", OpenAddressingHashTable),
+                               ("dict", DictTable)):
+        insert, lookup, churn, memory = measure(table_class, count)
+        print(f"{label:<24} {insert:>10.3f} {lookup:>9.3f} {churn:>10.3f} {memory / count:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_incremental_router.py
+# Latency benchmark for IncrementalRoute: one truck with hundreds of stops is planned once, then packages are
+# inserted, removed and re-addressed while it drives. Each change is timed and compared with re-planning the
+# remaining route from scratch with the greedy construction and the RouteOptimizer.
+#
+# Usage: python benchmarks/bench_incremental_router.py [stops] [changes]
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_fleet_planner import synthetic_depot  # noqa: E402
+from event_log import EventLog  # noqa: E402
+from incremental_router import IncrementalRoute  # noqa: E402
+from main import calculate_route  # noqa: E402
+from package import Package  # noqa: E402
+from route_optimizer import RouteOptimizer  # noqa: E402
+from vehicle import Vehicle  # noqa: E402
+
+
+def main():
+    stops = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    hashtable, addresses, distances, (shipments,) = synthetic_depot(1, stops)
+    depot = addresses[0][2]
+    vehicle = Vehicle(1, stops, 18, None, list(shipments), 0.0, datetime.timedelta(hours=8), depot)
+    event_log = EventLog()
+    calculate_route(vehicle, hashtable, addresses, distances, event_log)
+    route = IncrementalRoute.from_event_log(event_log, 1, 18, distances)
+    print(f"stops: {stops}, route: {route.total_distance():.1f} miles")
+
+    rng = np.random.default_rng(2)
+    at = datetime.timedelta(hours=8)
+    step = (route.arrival(len(route) - 1) - at) / (changes * 2)
+    latencies = []
+    next_id = len(hashtable) + 1
+    for change in range(changes):
+        at += step
+        fixed = route.fixed_count(at)
+        open_ids = route.package_ids[fixed:]
+        kind = change % 3
+        start = time.perf_counter()
+        if kind == 0 or len(open_ids) < 2:
+            route.insert(next_id, int(rng.integers(1, len(addresses))), at)
+            next_id += 1
+        elif kind == 1:
+            route.remove(open_ids[int(rng.integers(len(open_ids)))], at)
+        else:
+            route.update_address(open_ids[int(rng.integers(len(open_ids)))], int(rng.integers(1, len(addresses))), at)
+        latencies.append(time.perf_counter() - start)
+
+    latencies = np.array(latencies) * 1e3
+    print(f"incremental change: median {np.median(latencies):.2f} ms, max {latencies.max():.2f} ms")
+
+    # Re-planning the remaining stops from scratch, for comparison
+    fixed = route.fixed_count(at)
+    remaining = Vehicle(2, stops, 18, None, [], 0.0, at, addresses[route.indexes[fixed - 1]][2] if fixed else depot)
+    for position in range(fixed, len(route)):
+        package_id = route.package_ids[position]
+        hashtable.set(package_id, Package(str(package_id), addresses[route.indexes[position]][2],
+                                          "Salt Lake City", "UT", "84111", "EOD", "1", ""))
+        remaining.shipments.append(package_id)
+    start = time.perf_counter()
+    calculate_route(remaining, hashtable, addresses, distances, optimizer=RouteOptimizer(max_iterations=3))
+    print(f"full re-plan of {len(remaining.shipments)} remaining stops: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
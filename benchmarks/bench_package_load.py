@@ -0,0 +1,42 @@
+# bench_package_load.py
+# Measures startup time for loading a large package manifest into a HashTable, with the table
+# growing one resize at a time (size_hint=0, the old behaviour) and sized once from the row count.
+#
+# Usage: python benchmarks/bench_package_load.py [packages]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from HashTable import HashTable, OpenAddressingHashTable  # noqa: E402
+from main import load_packages_into_hash  # noqa: E402
+
+
+def write_manifest(filename, count):
+    with open(filename, 'w', newline='') as csvfile:
+        csvfile.write("Package ID,Address,City,State,Zip,Deadline,Weight,Notes\n")
+        for package_id in range(1, count + 1):
+            csvfile.write(f"{package_id},{package_id % 900} S State St,Salt Lake City,UT,84111,EOD,"
+                          f"{package_id % 50 + 1},\n")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "Packages.csv")
+        write_manifest(filename, count)
+        print(f"packages: {count}")
+        for table_class in (HashTable, OpenAddressingHashTable):
+            for label, size_hint in (("one set() at a time", 0), ("sized from row count", None)):
+                hashtable = table_class()
+                start = time.perf_counter()
+                load_packages_into_hash(hashtable, filename, size_hint=size_hint)
+                elapsed = time.perf_counter() - start
+                print(f"{table_class.__name__:<24} {label:<22} {elapsed:7.2f} s  capacity {hashtable.capacity}")
+                del hashtable
+
+
+if __name__ == "__main__":
+    main()
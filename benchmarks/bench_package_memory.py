@@ -0,0 +1,63 @@
+# bench_package_memory.py
+# Reports memory per package for the old '__dict__' Package layout and the slotted, interned layout.
+# Rows are parsed with csv.reader, like the loader does, so every field starts as a fresh string object.
+#
+# Usage: python benchmarks/bench_package_memory.py [packages]
+import csv
+import io
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package import Package  # noqa: E402
+
+
+# The Package layout before '__slots__' and interning, kept here for comparison.
+class DictPackage:
+    def __init__(self, package_id, address, city, state, zip_code, deadline, weight, notes):
+        self.status = None
+        self.package_id = package_id
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zip_code = zip_code
+        self.deadline = deadline
+        self.weight = weight
+        self.notes = notes
+        self.departure_time = None
+        self.delivery_time = None
+
+
+def manifest(count, seed=7):
+    rng = random.Random(seed)
+    cities = ["Salt Lake City", "West Valley City", "Murray", "Holladay", "Millcreek", "Sandy", "Draper"]
+    deadlines = ["EOD", "EOD", "EOD", "10:30 AM", "9:00 AM"]
+    lines = io.StringIO()
+    writer = csv.writer(lines)
+    for package_id in range(1, count + 1):
+        writer.writerow([package_id, f"{rng.randrange(2000)} S {rng.randrange(90) * 100} E", rng.choice(cities),
+                         "UT", str(84100 + rng.randrange(60)), rng.choice(deadlines), rng.randrange(1, 90), ""])
+    return lines.getvalue()
+
+
+def measure(package_class, text):
+    tracemalloc.start()
+    packages = [package_class(*row) for row in csv.reader(io.StringIO(text))]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory / len(packages)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    text = manifest(count)
+    print(f"packages: {count}")
+    for label, package_class in (("__dict__ layout", DictPackage), ("__slots__ + interned", Package)):
+        print(f"{label:<22} {measure(package_class, text):8.1f} bytes/package")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_plan_cache.py
+# Start-up benchmark for the plan cache: planning the project's routes (greedy, and with the route optimizer and
+# deadline-aware ordering) against a cache hit, which hashes the data files, reads the cached plan and restores the
+# packages' times and the event log without routing.
+#
+# Usage: python benchmarks/bench_plan_cache.py [repeats]
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from HashTable import HashTable  # noqa: E402
+from event_log import EventLog  # noqa: E402
+from main import plan_deliveries  # noqa: E402
+from plan_cache import PlanCache, plan_key, plan_record, restore_plan  # noqa: E402
+from route_optimizer import RouteOptimizer  # noqa: E402
+from snapshot import load_data  # noqa: E402
+from vehicle import PROJECT_FLEET  # noqa: E402
+
+DATA_FILES = {"distances": "Data/Distances.csv", "addresses": "Data/Addresses.csv", "packages": "Data/Packages.csv"}
+
+
+def load():
+    hashtable = HashTable()
+    distances, addresses = load_data(hashtable, DATA_FILES["distances"], DATA_FILES["addresses"],
+                                     DATA_FILES["packages"], "Data/project.snapshot")
+    return hashtable, addresses, distances
+
+
+def best_of(repeats, function):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    directory = tempfile.mkdtemp()
+    try:
+        cache = PlanCache(directory)
+        for name, options in (("greedy", {"optimize": False, "deadline_aware": False, "assign": False}),
+                              ("optimized", {"optimize": True, "deadline_aware": True, "assign": False})):
+            def plan():
+                hashtable, addresses, distances = load()
+                event_log = EventLog()
+                vehicles, total = plan_deliveries(hashtable, addresses, distances, event_log,
+                                                  RouteOptimizer() if options["optimize"] else None,
+                                                  deadline_aware=options["deadline_aware"])
+                return plan_record(vehicles, total, hashtable, event_log, options)
+
+            def hit():
+                hashtable, _, _ = load()
+                restore_plan(cache.get(plan_key(DATA_FILES, PROJECT_FLEET, options)), hashtable, EventLog())
+
+            planned = best_of(repeats, plan)
+            cache.put(plan_key(DATA_FILES, PROJECT_FLEET, options), plan())
+            cached = best_of(repeats, hit)
+            print(f"{name:<10} plan: {planned:8.2f} ms   cache hit: {cached:6.2f} ms   ({planned / cached:5.1f}x)")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# bench_route_optimizer.py
+# Plans the project's three-truck day on Data/ with the greedy routes alone and with the 2-opt / Or-opt
+# RouteOptimizer, and reports the miles per vehicle, the miles saved and the packages delivered after
+# their deadline. A second table runs the optimizer on random depot-to-depot routes of growing size.
+#
+# Usage: python benchmarks/bench_route_optimizer.py
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from address_registry import AddressRegistry  # noqa: E402
+from distance_matrix import DistanceMatrix  # noqa: E402
+from HashTable import HashTable  # noqa: E402
+from main import load_packages_into_hash, load_distance_data, load_address_data, plan_deliveries  # noqa: E402
+from route_optimizer import RouteOptimizer  # noqa: E402
+
+
+def late_packages(hashtable):
+    late = []
+    for package_id, package in hashtable.items():
+        if package.deadline == 'EOD' or package.delivery_time is None:
+            continue
+        deadline = datetime.datetime.strptime(package.deadline, '%I:%M %p')
+        if package.delivery_time > datetime.timedelta(hours=deadline.hour, minutes=deadline.minute):
+            late.append(package_id)
+    return late
+
+
+def plan_project_day(optimizer):
+    hashtable = HashTable()
+    load_packages_into_hash(hashtable, 'Data/Packages.csv')
+    addresses = AddressRegistry(load_address_data('Data/Addresses.csv'))
+    distances = load_distance_data('Data/Distances.csv')
+    start = time.perf_counter()
+    vehicles, total_distance = plan_deliveries(hashtable, addresses, distances, optimizer=optimizer)
+    return vehicles, total_distance, late_packages(hashtable), time.perf_counter() - start
+
+
+def random_routes():
+    rng = np.random.default_rng(7)
+    optimizer = RouteOptimizer(time_budget=2.0)
+    print(f"{'stops':>6} {'greedy':>9} {'optimized':>10} {'saved':>7} {'passes':>7} {'time (s)':>9}")
+    for stops in (50, 200, 500):
+        points = rng.random((stops + 1, 2)) * 10
+        distances = DistanceMatrix(np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1)))
+        current, remaining, order = 0, list(range(1, stops + 1)), []
+        while remaining:
+            current = remaining.pop(int(np.argmin(distances.values[current, remaining])))
+            order.append(current)
+        result = optimizer.improve(0, order, distances, end_index=0)
+        saved = 1 - result.final_distance / result.initial_distance
+        print(f"{stops:>6} {result.initial_distance:>9.1f} {result.final_distance:>10.1f} {saved:>6.1%} "
+              f"{result.iterations:>7} {result.elapsed:>9.2f}")
+
+
+def main():
+    greedy, greedy_total, greedy_late, greedy_time = plan_project_day(None)
+    optimized, optimized_total, optimized_late, optimized_time = plan_project_day(RouteOptimizer(time_budget=0.5))
+
+    print("Data/ three-truck plan (vehicle miles; vehicles 1 and 2 include the return to the depot)")
+    for before, after in zip(greedy, optimized):
+        print(f"  vehicle {before.id}: greedy {before.total_distance:6.1f}  optimized {after.total_distance:6.1f}")
+    print(f"  total:     greedy {greedy_total:6.1f}  optimized {optimized_total:6.1f}  "
+          f"saved {greedy_total - optimized_total:.1f} miles (route miles, excluding returns)")
+    print(f"  late deadline packages: greedy {greedy_late}, optimized {optimized_late}")
+    print(f"  planning time: greedy {greedy_time * 1e3:.1f} ms, optimized {optimized_time * 1e3:.1f} ms")
+    print()
+    random_routes()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# bench_scenarios.py
+# Throughput benchmark for the scenario batch runner: a few thousand what-if scenarios on the project data
+# (fleet size, drivers, speed, departure time and capacity varied together) are run with one process and with a
+# process pool. The data is loaded once per process, so the cost per scenario is assignment and routing only.
+#
+# Usage: python benchmarks/bench_scenarios.py [scenarios] [workers]
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scenarios import parse_scenario, run_scenarios  # noqa: E402
+
+
+def what_if_scenarios(count):
+    grid = itertools.product((3, 4, 5), (2, 3), (16, 18, 20), ("08:00", "08:15", "08:30", "08:45"), (16, 20))
+    scenarios = []
+    for number, (trucks, drivers, velocity, departure, capacity) in enumerate(itertools.cycle(grid), start=1):
+        if len(scenarios) == count:
+            break
+        scenarios.append(parse_scenario({"trucks": trucks, "drivers": min(drivers, trucks), "velocity": velocity,
+                                         "departure": departure, "capacity": capacity}, number))
+    return scenarios
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    scenarios = what_if_scenarios(count)
+
+    for pool_size in sorted({1, workers}):
+        start = time.perf_counter()
+        results = run_scenarios(scenarios, pool_size)
+        elapsed = time.perf_counter() - start
+        failed = sum(result.error is not None for result in results)
+        late = sum(result.late_count or 0 for result in results)
+        print(f"workers: {pool_size:2d}  {count} scenarios in {elapsed:6.2f} s ({count / elapsed:7.1f}/s), "
+              f"{failed} infeasible, {late} late packages in total")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# bench_shortest_paths.py
+# Benchmark for the shortest-path closure of a sparse distance table (each address only knows its nearest
+# neighbours): the vectorized Floyd-Warshall closure, a full closure by Dijkstra from every source, and the
+# cost of single-source Dijkstra queries with and without the LRU cache.
+#
+# Usage: python benchmarks/bench_shortest_paths.py [addresses] [neighbours]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shortest_paths import ShortestPaths  # noqa: E402
+
+
+def sparse_table(size, neighbours, seed=5):
+    rng = np.random.default_rng(seed)
+    points = rng.random((size, 2)) * 20
+    full = np.round(np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1)), 1)
+    nearest = np.argsort(full, axis=1)[:, 1:neighbours + 1]
+    rows = np.repeat(np.arange(size), neighbours)
+    values = np.full((size, size), np.inf)
+    np.fill_diagonal(values, 0.0)
+    values[rows, nearest.ravel()] = values[nearest.ravel(), rows] = full[rows, nearest.ravel()]
+    chain = np.arange(size - 1)
+    values[chain, chain + 1] = values[chain + 1, chain] = full[chain, chain + 1]
+    return values
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    neighbours = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    values = sparse_table(size, neighbours)
+    print(f"addresses: {size}, defined legs: {int(np.isfinite(values).sum()) - size}")
+
+    elapsed, (floyd, _) = timed(ShortestPaths(values, method="floyd-warshall").closure)
+    print(f"Floyd-Warshall closure:    {elapsed:8.3f} s")
+    elapsed, (dijkstra, _) = timed(ShortestPaths(values, method="dijkstra").closure)
+    print(f"Dijkstra closure:          {elapsed:8.3f} s  (max difference {np.abs(floyd - dijkstra).max():.2e})")
+
+    paths = ShortestPaths(values, method="dijkstra")
+    sources = np.random.default_rng(1).integers(size, size=1000)
+    elapsed, _ = timed(lambda: [paths.distance(source, 0) for source in sources[:50]])
+    print(f"Dijkstra query (cold):     {elapsed / 50 * 1e3:8.3f} ms")
+    elapsed, _ = timed(lambda: [paths.distance(source, 0) for source in sources[:50]])
+    print(f"Dijkstra query (cached):   {elapsed / 50 * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
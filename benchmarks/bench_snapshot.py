@@ -0,0 +1,78 @@
+# bench_snapshot.py
+# Startup benchmark for the binary snapshot: a synthetic lower-triangular Distances.csv with many addresses,
+# plus matching Addresses.csv and Packages.csv, is loaded by parsing the CSVs and by opening a compiled
+# snapshot. Opening the snapshot maps the distance matrix without reading it.
+#
+# Usage: python benchmarks/bench_snapshot.py [addresses] [packages]
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from HashTable import HashTable  # noqa: E402
+from main import load_address_data, load_distance_data, load_packages_into_hash  # noqa: E402
+from snapshot import Snapshot, compile_snapshot  # noqa: E402
+
+
+def write_sources(directory, address_count, package_count, seed=3):
+    rng = np.random.default_rng(seed)
+    points = rng.random((address_count, 2)) * 20
+    paths = [os.path.join(directory, name) for name in ('Distances.csv', 'Addresses.csv', 'Packages.csv')]
+
+    with open(paths[0], 'w', newline='') as output:
+        writer = csv.writer(output)
+        for i in range(address_count):
+            row = np.round(np.sqrt(((points[:i + 1] - points[i]) ** 2).sum(-1)), 1)
+            writer.writerow([f"{value:.1f}" for value in row] + [""] * (address_count - i - 1))
+    with open(paths[1], 'w', newline='') as output:
+        csv.writer(output).writerows((i, f"Stop {i}", f"{i} Main St") for i in range(address_count))
+    with open(paths[2], 'w', newline='') as output:
+        writer = csv.writer(output)
+        writer.writerow(["Package ID", "Address", "City", "State", "Zip", "Deadline", "Weight", "Notes"])
+        for package_id in range(1, package_count + 1):
+            writer.writerow([package_id, f"{rng.integers(address_count)} Main St", "Salt Lake City", "UT", "84111",
+                             "EOD", rng.integers(1, 50), ""])
+    return paths
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    address_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    package_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        distances_csv, addresses_csv, packages_csv = write_sources(directory, address_count, package_count)
+        snapshot_path = os.path.join(directory, 'project.snapshot')
+        print(f"addresses: {address_count}, packages: {package_count}")
+
+        elapsed, _ = timed(lambda: load_distance_data(distances_csv))
+        print(f"distances from CSV:      {elapsed:8.3f} s")
+        elapsed, _ = timed(lambda: load_address_data(addresses_csv))
+        print(f"addresses from CSV:      {elapsed:8.3f} s")
+        elapsed, _ = timed(lambda: load_packages_into_hash(HashTable(), packages_csv))
+        print(f"packages from CSV:       {elapsed:8.3f} s")
+
+        elapsed, _ = timed(lambda: compile_snapshot(snapshot_path, distances_csv, addresses_csv, packages_csv))
+        print(f"compile snapshot:        {elapsed:8.3f} s ({os.path.getsize(snapshot_path) / 2 ** 20:.1f} MiB)")
+
+        elapsed, snapshot = timed(lambda: Snapshot(snapshot_path))
+        print(f"open snapshot:           {elapsed:8.3f} s")
+        elapsed, _ = timed(snapshot.distances)
+        print(f"distances from snapshot: {elapsed:8.3f} s")
+        elapsed, _ = timed(snapshot.addresses)
+        print(f"addresses from snapshot: {elapsed:8.3f} s")
+        elapsed, _ = timed(lambda: snapshot.load_packages(HashTable()))
+        print(f"packages from snapshot:  {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# bench_status_board.py
+# Times "status of every package at time T" with one update_status call per package and with the
+# vectorized StatusBoard, plus a 96-point timeline (every 15 minutes of a day).
+#
+# Usage: python benchmarks/bench_status_board.py [packages]
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from HashTable import HashTable  # noqa: E402
+from main import check_package_status  # noqa: E402
+from package import Package  # noqa: E402
+from status_board import StatusBoard  # noqa: E402
+
+
+def synthetic_packages(count, seed=7):
+    rng = random.Random(seed)
+    hashtable = HashTable.from_iterable(((package_id, Package(str(package_id), "410 S State St", "Salt Lake City",
+                                                              "UT", "84111", "EOD", "1", ""))
+                                         for package_id in range(1, count + 1)), size_hint=count)
+    for package in hashtable.values():
+        departure = rng.randrange(8 * 3600, 11 * 3600)
+        package.departure_time = datetime.timedelta(seconds=departure)
+        package.delivery_time = datetime.timedelta(seconds=departure + rng.randrange(600, 4 * 3600))
+    return hashtable
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    hashtable = synthetic_packages(count)
+    at = datetime.datetime(1900, 1, 1, 10, 0)
+
+    start = time.perf_counter()
+    for package_id in hashtable:
+        check_package_status(hashtable, package_id, at)
+    per_package = time.perf_counter() - start
+
+    start = time.perf_counter()
+    board = StatusBoard.from_packages(hashtable)
+    build = time.perf_counter() - start
+
+    repeats = 200
+    start = time.perf_counter()
+    for _ in range(repeats):
+        board.status_codes(at)
+    vectorized = (time.perf_counter() - start) / repeats
+
+    times = [datetime.timedelta(minutes=15 * step) for step in range(96)]
+    start = time.perf_counter()
+    board.timeline(times)
+    timeline = time.perf_counter() - start
+
+    print(f"packages: {count}")
+    print(f"update_status per package:  {per_package * 1e3:9.2f} ms")
+    print(f"StatusBoard build (once):   {build * 1e3:9.2f} ms")
+    print(f"StatusBoard query:          {vectorized * 1e3:9.3f} ms")
+    print(f"StatusBoard 96-step timeline:{timeline * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
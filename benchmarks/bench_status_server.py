@@ -0,0 +1,88 @@
+# bench_status_server.py
+# Load test for the status server: a server process is started (or an already running one is used with --port),
+# then many concurrent clients send status and mileage queries over line-delimited JSON, one request at a time
+# per connection. Most queries ask for one package, some for a batch of ten and some for the mileage. Halfway
+# through, one client asks for a replan, so the latency while a new plan is built and swapped in is included.
+# The p50, p99 and maximum latency and the throughput are reported.
+#
+# Usage: python benchmarks/bench_status_server.py [clients] [requests per client] [--port=PORT]
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def request_mix(rng, count):
+    requests = []
+    for number in range(count):
+        at = f"{rng.randint(8, 13):02d}:{rng.randint(0, 59):02d}:00"
+        kind = rng.random()
+        if kind < 0.80:
+            requests.append({"op": "status", "id": rng.randint(1, 40), "at": at, "request_id": number})
+        elif kind < 0.95:
+            requests.append({"op": "status", "ids": rng.sample(range(1, 41), 10), "at": at, "request_id": number})
+        else:
+            requests.append({"op": "mileage", "at": at, "request_id": number})
+    return requests
+
+
+async def client(host, port, requests, latencies, replan_at=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    for number, request in enumerate(requests):
+        if number == replan_at:
+            request = {"op": "replan", "options": {"deadline_aware": True}}
+        start = time.perf_counter()
+        writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        if number != replan_at:
+            latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def load_test(host, port, clients, per_client):
+    rng = random.Random(5)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, request_mix(rng, per_client), latencies,
+                                  per_client // 2 if number == 0 else None)
+                           for number in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1e3
+    print(f"{clients} clients x {per_client} requests: {len(latencies) / elapsed:,.0f} requests/s, "
+          f"p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms, "
+          f"max {latencies.max():.2f} ms")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--port")]
+    ports = [arg.split("=", 1)[1] for arg in sys.argv[1:] if arg.startswith("--port=")]
+    clients = int(args[0]) if args else 50
+    per_client = int(args[1]) if len(args) > 1 else 200
+
+    server = None
+    if ports:
+        port = int(ports[0])
+    else:
+        server = subprocess.Popen([sys.executable, "status_server.py", "--port", "0"], cwd=ROOT,
+                                  stdout=subprocess.PIPE, text=True)
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+    try:
+        asyncio.run(load_test("127.0.0.1", port, clients, per_client))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
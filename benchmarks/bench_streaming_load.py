@@ -0,0 +1,35 @@
+# bench_streaming_load.py
+# Streams a large manifest into a callback that only counts packages, and reports throughput and the
+# peak memory traced during the load for several chunk sizes. Peak memory depends on the chunk size,
+# not on the number of rows in the file.
+#
+# Usage: python benchmarks/bench_streaming_load.py [packages]
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from package_loader import stream_packages  # noqa: E402
+from bench_package_load import write_manifest  # noqa: E402
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "Packages.csv")
+        write_manifest(filename, count)
+        print(f"packages: {count}")
+        for chunk_size in (1_000, 10_000, 100_000):
+            delivered = []
+            tracemalloc.start()
+            stats = stream_packages(filename, lambda chunk: delivered.append(len(chunk)), chunk_size)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"chunk {chunk_size:>7}: {stats.rows_per_second:>10,.0f} rows/s (traced), "
+                  f"peak {peak / 2**20:7.1f} MiB, {sum(delivered)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# bench_suite.py
+# Benchmark suite for the whole pipeline on synthetic depots (see synthetic_data.py) from 40 addresses and 100
+# packages up to 10,000 addresses and 100,000 packages. Each stage is timed on its own:
+#   load_packages, load_distances, load_addresses   reading the three CSVs with the loaders in main.py
+#   hashtable_insert, hashtable_bulk                 building the package HashTable one 'set' at a time / in bulk
+#   route                                            'calculate_route' for every truckload of 16 packages
+#   route_long                                       'calculate_route' for one truck with up to 1,000 stops
+#   return_trip                                      'calculate_return_trip' after every truckload
+#   status_board, status_lookup                      every package's status at 10:00 / 1,000 single lookups
+# A timing is the best of 'repeats' runs, in seconds. The results are written as JSON together with the commit,
+# Python and NumPy versions, so runs of different commits can be compared: with --compare, every timing that got
+# slower by more than the threshold is reported as a regression (and the exit status is 1). Between sizes, the
+# growth exponent of each stage (log of the time ratio over log of the size ratio) shows complexity changes.
+# The large size writes about 270 MB of distances and takes about a minute; generated data is kept in benchmarks/data.
+#
+# Usage: python benchmarks/bench_suite.py [--sizes small,medium,large] [--repeats 3] [--out FILE]
+#                                         [--compare OLD.json] [--threshold 1.25]
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import DEPOT_ADDRESS, write_instance  # noqa: E402
+
+from address_registry import AddressRegistry  # noqa: E402
+from HashTable import HashTable  # noqa: E402
+from main import (calculate_return_trip, calculate_route, check_package_status, load_address_data,  # noqa: E402
+                  load_distance_data, load_packages_into_hash)
+from status_board import StatusBoard  # noqa: E402
+from vehicle import Vehicle  # noqa: E402
+
+SUITE_VERSION = 1
+SIZES = {"small": (40, 100), "medium": (1_000, 10_000), "large": (10_000, 100_000)}
+DEFAULT_SIZES = ("small", "medium")
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+DATA_DIRECTORY = os.path.join(BENCHMARKS, "data")
+RESULTS_DIRECTORY = os.path.join(BENCHMARKS, "results")
+TRUCK_LOAD = 16
+LONG_ROUTE = 1_000
+LOOKUPS = 1_000
+DEPARTURE = datetime.timedelta(hours=8)
+QUERY_TIME = datetime.datetime(1900, 1, 1, 10, 0)
+NOISE_FLOOR = 1e-3  # timings below a millisecond are too noisy to flag
+
+
+# The 'best_of' function runs 'setup' and then times 'run' with its result, 'repeats' times, and returns the
+# fastest time in seconds with the last result. Setup time is not counted.
+def best_of(repeats, run, setup=None):
+    best, result = math.inf, None
+    for _ in range(repeats):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        result = run(argument) if setup is not None else run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _fleet(keys, load):
+    return [Vehicle(number + 1, load, 18, None, list(keys[offset:offset + load]), 0.0, DEPARTURE, DEPOT_ADDRESS)
+            for number, offset in enumerate(range(0, len(keys), load))]
+
+
+def _drive(vehicles, hashtable, registry, distances):
+    for vehicle in vehicles:
+        calculate_route(vehicle, hashtable, registry, distances)
+    return vehicles
+
+
+def _return_trips(vehicles, registry, distances):
+    for vehicle in vehicles:
+        calculate_return_trip(vehicle, vehicle.current_address, DEPOT_ADDRESS, distances, registry)
+
+
+# The 'run_size' function generates (or reuses) the instance for 'name' and times every stage on it. It returns
+# the size's result record. The time complexity is that of the stages: O(A^2) for the distances, O(n) for loading
+# and building, and O(n * 16) routing work plus O(L^2) for the long route.
+def run_size(name, address_count, package_count, repeats=3, seed=7, data_directory=DATA_DIRECTORY):
+    paths = write_instance(os.path.join(data_directory, f"{name}-{seed}"), address_count, package_count, seed)
+    timings = {}
+
+    timings["load_packages"], hashtable = best_of(repeats, lambda: _loaded(paths["packages"]))
+    timings["load_distances"], distances = best_of(repeats, lambda: load_distance_data(paths["distances"]))
+    timings["load_addresses"], addresses = best_of(repeats, lambda: load_address_data(paths["addresses"]))
+    registry = AddressRegistry.wrap(addresses)
+
+    items = list(hashtable.items())
+    timings["hashtable_insert"], _ = best_of(repeats, lambda: _inserted(items))
+    timings["hashtable_bulk"], _ = best_of(repeats, lambda: HashTable.from_iterable(items, len(items)))
+
+    keys = sorted(hashtable)
+
+    def drive(vehicles):
+        return _drive(vehicles, hashtable, registry, distances)
+
+    timings["route"], _ = best_of(repeats, drive, lambda: _fleet(keys, TRUCK_LOAD))
+    timings["route_long"], _ = best_of(repeats, drive, lambda: _fleet(keys[:LONG_ROUTE], LONG_ROUTE))
+    timings["return_trip"], _ = best_of(repeats, lambda vehicles: _return_trips(vehicles, registry, distances),
+                                        lambda: drive(_fleet(keys, TRUCK_LOAD)))
+
+    timings["status_board"], _ = best_of(repeats, lambda: StatusBoard.from_packages(hashtable).statuses(QUERY_TIME))
+    lookups = random.Random(seed).choices(keys, k=LOOKUPS)
+    timings["status_lookup"], _ = best_of(
+        repeats, lambda: [check_package_status(hashtable, package_id, QUERY_TIME) for package_id in lookups])
+
+    return {"name": name, "addresses": address_count, "packages": package_count,
+            "trucks": -(-len(keys) // TRUCK_LOAD),
+            "timings": {stage: round(seconds, 6) for stage, seconds in timings.items()}}
+
+
+def _loaded(filename):
+    hashtable = HashTable()
+    load_packages_into_hash(hashtable, filename)
+    return hashtable
+
+
+def _inserted(items):
+    hashtable = HashTable()
+    for key, package in items:
+        hashtable.set(key, package)
+    return hashtable
+
+
+def _commit():
+    try:
+        root = os.path.dirname(BENCHMARKS)
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+# The 'run_suite' function runs the sizes named in 'sizes' and returns the results document.
+def run_suite(sizes=DEFAULT_SIZES, repeats=3, seed=7, data_directory=DATA_DIRECTORY):
+    commit, dirty = _commit()
+    results = {"suite_version": SUITE_VERSION, "commit": commit, "dirty": dirty,
+               "created": datetime.datetime.now().isoformat(timespec='seconds'),
+               "python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+               "cpus": os.cpu_count(), "repeats": repeats, "seed": seed, "sizes": []}
+    for name in sizes:
+        address_count, package_count = SIZES[name]
+        print(f"{name}: {address_count:,} addresses, {package_count:,} packages", flush=True)
+        results["sizes"].append(run_size(name, address_count, package_count, repeats, seed, data_directory))
+        for stage, seconds in results["sizes"][-1]["timings"].items():
+            print(f"  {stage:<17}{seconds * 1e3:12.2f} ms", flush=True)
+    return results
+
+
+# The 'growth_exponents' function returns, for each pair of consecutive sizes, the exponent k of every stage's
+# time ~ size^k, measured against the number of packages (addresses for the distance and address loads).
+def growth_exponents(results):
+    exponents = []
+    for smaller, larger in zip(results["sizes"], results["sizes"][1:]):
+        pair = {}
+        for stage, seconds in larger["timings"].items():
+            before = smaller["timings"].get(stage)
+            measure = "addresses" if stage in ("load_distances", "load_addresses") else "packages"
+            if stage == "route_long":
+                scale = min(larger["packages"], LONG_ROUTE) / min(smaller["packages"], LONG_ROUTE)
+            else:
+                scale = larger[measure] / smaller[measure]
+            if before and seconds and scale > 1:
+                pair[stage] = round(math.log(seconds / before) / math.log(scale), 2)
+        exponents.append({"from": smaller["name"], "to": larger["name"], "exponents": pair})
+    return exponents
+
+
+# The 'compare' function matches the timings of 'results' with those of 'baseline' by size and stage and returns
+# the rows (size, stage, before, after, ratio, regression). A stage is a regression when it got slower by more
+# than 'threshold' times and took at least NOISE_FLOOR seconds.
+def compare(baseline, results, threshold=1.25):
+    before = {(size["name"], stage): seconds
+              for size in baseline["sizes"] for stage, seconds in size["timings"].items()}
+    rows = []
+    for size in results["sizes"]:
+        for stage, seconds in size["timings"].items():
+            old = before.get((size["name"], stage))
+            if not old:
+                continue
+            ratio = seconds / old
+            rows.append((size["name"], stage, old, seconds, ratio,
+                         ratio > threshold and max(old, seconds) >= NOISE_FLOOR))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every stage of the planner on synthetic depots.")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help=f"comma-separated sizes from {', '.join(SIZES)} (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--data", default=DATA_DIRECTORY, help="directory for the generated CSVs")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="results file of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [name.strip() for name in args.sizes.split(",") if name.strip()]
+    unknown = [name for name in sizes if name not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    results = run_suite(sizes, args.repeats, args.seed, args.data)
+    results["growth"] = growth_exponents(results)
+    for pair in results["growth"]:
+        print(f"growth {pair['from']} -> {pair['to']}: " +
+              ", ".join(f"{stage} {exponent}" for stage, exponent in pair["exponents"].items()))
+
+    out = args.out
+    if out is None:
+        os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+        label = (results["commit"] or "unknown")[:12] + ("-dirty" if results["dirty"] else "")
+        out = os.path.join(RESULTS_DIRECTORY, f"{label}.json")
+    with open(out, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"results written to {out}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        rows = compare(baseline, results, args.threshold)
+        print(f"compared with {baseline.get('commit') or args.compare}:")
+        for name, stage, old, new, ratio, regression in rows:
+            print(f"  {name:<7}{stage:<17}{old * 1e3:11.2f} ms {new * 1e3:11.2f} ms {ratio:7.2f}x"
+                  + ("  REGRESSION" if regression else ""))
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# bench_trip_scheduler.py
+# Scaling benchmark for the TripScheduler on synthetic depots (see synthetic_data.py): the packages are cut into
+# trips of at most 32 (the synthetic "delivered with" groups reach about 20 packages) and scheduled on a fleet of
+# one truck per 128 packages with two drivers for every three trucks, so every truck drives several trips.
+# Cutting the trips and scheduling them (routing included) are timed separately; the time per trip should stay
+# about flat as the fleet grows. The finish time (hours after the start) is set by truck 2, which alone carries
+# the synthetic "Can only be on truck 2" packages.
+#
+# Usage: python benchmarks/bench_trip_scheduler.py [addresses] [largest package count]
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import DEPOT_ADDRESS, write_instance  # noqa: E402
+
+from HashTable import HashTable  # noqa: E402
+from main import load_address_data, load_distance_data, load_packages_into_hash  # noqa: E402
+from trip_scheduler import TripScheduler  # noqa: E402
+from vehicle import Vehicle  # noqa: E402
+
+TRUCK_LOAD = 32
+
+
+def main():
+    address_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    largest = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    counts = [largest // 4, largest // 2, largest]
+    start = datetime.timedelta(hours=8)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"addresses: {address_count}")
+        print(f"{'packages':>9}{'trucks':>8}{'drivers':>9}{'trips':>7}{'cut ms':>10}{'schedule ms':>13}"
+              f"{'us/trip':>9}{'finish h':>10}")
+        for package_count in counts:
+            paths = write_instance(os.path.join(directory, str(package_count)), address_count, package_count)
+            hashtable = HashTable()
+            load_packages_into_hash(hashtable, paths["packages"])
+            distances = load_distance_data(paths["distances"])
+            addresses = load_address_data(paths["addresses"])
+
+            truck_count = max(package_count // (4 * TRUCK_LOAD), 2)
+            trucks = [Vehicle(truck_id, TRUCK_LOAD, 18, None, [], 0.0, start, DEPOT_ADDRESS)
+                      for truck_id in range(1, truck_count + 1)]
+            scheduler = TripScheduler(hashtable, addresses, distances, trucks, max(truck_count * 2 // 3, 1), start,
+                                      DEPOT_ADDRESS)
+
+            began = time.perf_counter()
+            trips = scheduler.plan_trips()
+            cut = time.perf_counter() - began
+            began = time.perf_counter()
+            schedule = scheduler.schedule(trips)
+            scheduling = time.perf_counter() - began
+
+            hours = (schedule.finish_time - start) / datetime.timedelta(hours=1)
+            print(f"{package_count:>9}{truck_count:>8}{scheduler.drivers:>9}{len(trips):>7}{cut * 1e3:>10.1f}"
+                  f"{scheduling * 1e3:>13.1f}{scheduling / len(trips) * 1e6:>9.0f}{hours:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# synthetic_data.py
+# Seeded generator of synthetic depots in the project's CSV formats, for benchmarks at sizes the real data does not
+# reach. Addresses are random points in a 20 x 20 mile area (the depot is address 0); a distance is the straight
+# line times a road factor, rounded to tenths of a mile, and Distances.csv holds the lower triangle like the
+# project's file. Packages get deadlines and notes in roughly the project's mix: most are EOD, about a third
+# 10:30 AM and a few 9:00 AM; some can only be on truck 2, are delayed until 9:05 am, must be delivered with other
+# packages or have a wrong address. The same seed and sizes always give the same files.
+#
+# Usage: python benchmarks/synthetic_data.py directory addresses packages [seed]
+import csv
+import os
+import sys
+
+import numpy as np
+
+DEPOT_ADDRESS = "4001 South 700 East"
+AREA_MILES = 20.0
+ROAD_FACTOR = 1.3
+DEADLINES = (("EOD", 0.60), ("10:30 AM", 0.33), ("9:00 AM", 0.05), ("12:00 PM", 0.02))
+TRUCK_NOTE = "Can only be on truck 2"
+DELAYED_NOTE = "Delayed on flight---will not arrive to depot until 9:05 am"
+WRONG_ADDRESS_NOTE = "Wrong address listed"
+NOTE_RATES = {"truck": 0.10, "delayed": 0.10, "with": 0.05, "wrong": 0.01}
+STREETS = ("S State St", "E 2100 S", "W North Temple", "S 900 E", "W 3500 S", "S Main St", "E 400 S", "S 700 E")
+
+
+# The 'instance_paths' function returns the three CSV paths of an instance in 'directory'.
+def instance_paths(directory):
+    return {"addresses": os.path.join(directory, "Addresses.csv"),
+            "distances": os.path.join(directory, "Distances.csv"),
+            "packages": os.path.join(directory, "Packages.csv")}
+
+
+# The 'address_names' function returns 'count' distinct street addresses, the depot first.
+def address_names(count):
+    return [DEPOT_ADDRESS] + [f"{100 + index} {STREETS[index % len(STREETS)]} Unit {index}"
+                              for index in range(1, count)]
+
+
+# The 'write_distances' function writes the lower triangle of the distance table, one row per address with the
+# cells above the diagonal left empty. Distances are whole tenths, so every cell is formatted through a lookup
+# table and a row is joined in one call. The time complexity is O(A^2).
+def write_distances(filename, points):
+    count = len(points)
+    with open(filename, "w", newline='') as file:
+        for row in range(count):
+            tenths = np.rint(np.hypot(*(points[:row + 1] - points[row]).T) * ROAD_FACTOR * 10).astype(np.int64)
+            tenths[:row] = np.maximum(tenths[:row], 1)  # different addresses are never at distance zero
+            labels = np.array([f"{value / 10:g}" for value in range(int(tenths.max()) + 1)], dtype=object)
+            file.write(",".join(labels[tenths]) + "," * (count - row - 1) + "\n")
+
+
+# The 'write_packages' function writes a manifest of 'count' packages to random non-depot addresses with the
+# deadline and notes mix described above.
+def write_packages(filename, names, count, rng):
+    deadlines = rng.choice([deadline for deadline, _ in DEADLINES], size=count, p=[rate for _, rate in DEADLINES])
+    destinations = rng.integers(1, len(names), size=count) if len(names) > 1 else np.zeros(count, dtype=np.int64)
+    draws = rng.random(count)
+    bounds = np.cumsum(list(NOTE_RATES.values()))
+    with open(filename, "w", newline='') as file:
+        writer = csv.writer(file, lineterminator="\n")
+        writer.writerow(["Package ID", "Address", "City", "State", "Zip", "Deadline", "Weight", "Notes"])
+        for index in range(count):
+            package_id = index + 1
+            note = ""
+            kind = int(np.searchsorted(bounds, draws[index], side='right'))
+            if kind == 0:
+                note = TRUCK_NOTE
+            elif kind == 1:
+                note = DELAYED_NOTE
+            elif kind == 2 and count > 2:
+                partners = sorted({int(rng.integers(1, count + 1)) for _ in range(2)} - {package_id})
+                note = "Must be delivered with " + ", ".join(str(partner) for partner in partners) if partners else ""
+            elif kind == 3:
+                note = WRONG_ADDRESS_NOTE
+            writer.writerow([package_id, names[destinations[index]], "Salt Lake City", "UT",
+                             f"841{int(destinations[index]) % 100:02d}", deadlines[index],
+                             int(rng.integers(1, 90)), note])
+
+
+# The 'write_instance' function writes Addresses.csv, Distances.csv and Packages.csv for 'address_count' addresses
+# and 'package_count' packages into 'directory' and returns their paths. Files already written for the same sizes
+# and seed are reused. The time complexity is O(A^2 + n).
+def write_instance(directory, address_count, package_count, seed=7):
+    os.makedirs(directory, exist_ok=True)
+    paths = instance_paths(directory)
+    stamp = os.path.join(directory, "instance.txt")
+    description = f"{address_count} {package_count} {seed}\n"
+    if os.path.exists(stamp) and all(os.path.exists(path) for path in paths.values()):
+        with open(stamp) as file:
+            if file.read() == description:
+                return paths
+
+    rng = np.random.default_rng(seed)
+    points = rng.random((address_count, 2)) * AREA_MILES
+    names = address_names(address_count)
+    with open(paths["addresses"], "w", newline='') as file:
+        writer = csv.writer(file, lineterminator="\n")
+        for index, name in enumerate(names):
+            writer.writerow([index, f"Stop {index}" if index else "Western Governors University", name])
+    write_distances(paths["distances"], points)
+    write_packages(paths["packages"], names, package_count, rng)
+    with open(stamp, "w") as file:
+        file.write(description)
+    return paths
+
+
+def main():
+    if len(sys.argv) < 4:
+        print("Usage: python benchmarks/synthetic_data.py directory addresses packages [seed]")
+        sys.exit(2)
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 7
+    paths = write_instance(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), seed)
+    for name, path in paths.items():
+        print(f"{name}: {path} ({os.path.getsize(path):,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# The 'CandidateIndex' class lists, for every address, its k nearest addresses in the distance matrix (nearest first).
+# It is built once per matrix in O(A^2) vectorized work and cached by 'candidate_index', and is then shared by route
+# construction and local search, which look at the candidates of a stop before (or instead of) every other stop.
+# The greedy nearest-stop search checks the current address's candidates first and only scans all remaining stops
+# once every candidate has been served (or a tie reaches past the last candidate), so it picks exactly the stop the
+# full scan would pick: a route of N stops takes O(N * k) work instead of O(N^2) while the candidates last.
+# Local search (RouteOptimizer with 'candidates') only scores moves that create an edge to a candidate, which is
+# faster but may miss some improvements; benchmarks/bench_candidates.py reports the difference.
+import weakref
+
+import numpy as np
+
+from distance_matrix import DistanceMatrix
+
+DEFAULT_NEIGHBORS = 16
+
+# Rows of the matrix partitioned in one NumPy call are limited to about this many cells, to bound the memory used.
+CHUNK_CELLS = 1 << 22
+
+# Indexes built so far, per matrix and number of neighbours; an entry goes away with its matrix.
+_indexes = weakref.WeakKeyDictionary()
+
+
+class CandidateIndex:
+    # The __init__ method finds the 'k' nearest addresses of every address (itself included, at distance zero).
+    # 'neighbors[i]' holds them in order of distance (ties by index) and 'neighbor_distances[i]' their distances;
+    # every address closer to i than the last candidate is a candidate. The time complexity is O(A^2 + A k log k).
+    def __init__(self, distances, k=DEFAULT_NEIGHBORS):
+        if k < 1:
+            raise ValueError(f"A candidate index needs at least one neighbour, got {k}.")
+        values = DistanceMatrix.wrap(distances).values
+        size = len(values)
+        self.k = min(k, size)
+        self.neighbors = np.empty((size, self.k), dtype=np.intp)
+        self.neighbor_distances = np.empty((size, self.k), dtype=values.dtype)
+        self.full_scans = 0
+
+        rows = max(1, CHUNK_CELLS // max(size, 1))
+        for low in range(0, size, rows):
+            block = np.asarray(values[low:low + rows])
+            if self.k < size:
+                nearest = np.argpartition(block, self.k - 1, axis=1)[:, :self.k]
+            else:
+                nearest = np.broadcast_to(np.arange(size), block.shape)
+            near = np.take_along_axis(block, nearest, axis=1)
+            order = np.lexsort((nearest, near))
+            self.neighbors[low:low + rows] = np.take_along_axis(nearest, order, axis=1)
+            self.neighbor_distances[low:low + rows] = np.take_along_axis(near, order, axis=1)
+
+    # The 'complete' property tells whether every address is a candidate of every other.
+    @property
+    def complete(self):
+        return self.k >= len(self.neighbors)
+
+    # The 'nearest_order' method orders 'stop_indexes' by nearest neighbour from 'start_index', exactly as a full
+    # scan would: the nearest remaining stop comes next, ties going to the stop latest in the list. It returns the
+    # positions of the stops in visiting order and the address of the last stop. Full scans of the remaining stops
+    # are counted in 'full_scans'. The time complexity is O(N * k) plus O(N) for every full scan.
+    def nearest_order(self, distances, start_index, stop_indexes):
+        values = DistanceMatrix.wrap(distances).values
+        positions = {}  # remaining positions of the stops at each address, in list order
+        for position, index in enumerate(np.asarray(stop_indexes, dtype=np.intp).tolist()):
+            positions.setdefault(index, []).append(position)
+        stops = np.array(sorted(positions), dtype=np.intp)
+        remaining = np.zeros(len(self.neighbors), dtype=np.intp)
+        remaining[stops] = [len(positions[index]) for index in stops.tolist()]
+
+        order = []
+        current = start_index
+        for _ in range(len(stop_indexes)):
+            near, near_distances = self.neighbors[current], self.neighbor_distances[current]
+            served = remaining[near] > 0
+            tied = None
+            if served.any():
+                best = near_distances[int(served.argmax())]
+                # A tie with the last candidate may continue past it, so only a closer stop is certain
+                if best < near_distances[-1] or self.complete:
+                    tied = near[served & (near_distances == best)]
+            if tied is None:
+                self.full_scans += 1
+                live = stops[remaining[stops] > 0]
+                gaps = values[current, live]
+                tied = live[gaps == gaps.min()]
+
+            current = max(tied.tolist(), key=lambda index: positions[index][-1])
+            order.append(positions[current].pop())
+            remaining[current] -= 1
+        return order, current
+
+
+# The 'candidate_index' function returns the CandidateIndex of a DistanceMatrix for 'k' neighbours, building it on
+# first use and reusing it for as long as the matrix exists.
+def candidate_index(distances, k=DEFAULT_NEIGHBORS):
+    distances = DistanceMatrix.wrap(distances)
+    built = _indexes.setdefault(distances, {})
+    if k not in built:
+        built[k] = CandidateIndex(distances, k)
+    return built[k]
@@ -0,0 +1,226 @@
+# The 'cli' module is a non-interactive command line for the delivery planner, for scripts and pipelines.
+# It has three subcommands that print JSON (or NDJSON, one record per line):
+#   plan    makes a plan current: it is taken from the plan cache (see plan_cache.py) or computed and stored there
+#   status  reports the status of one package or of every package at a time
+#   report  reports each truck's shipments, times and mileage and the late packages
+# The plan file only names the current plan (its options and cache key). 'status' and 'report' look the plan up
+# in the cache for the data as it is now; the routing modules are imported only when a plan has to be computed,
+# which happens only when the data, the fleet or the options changed since it was planned.
+#
+# Usage: python cli.py plan [--optimize] [--deadline-aware] [--assign] [--candidates] [--workers N] [--replan]
+#        python cli.py status --at HH:MM:SS [--id N] [--format json|ndjson]
+#        python cli.py report [--at HH:MM:SS]
+# Before the subcommand, --instrument prints where the time went (see instrumentation.py) to stderr and
+# --profile FILE writes a cProfile dump of the run.
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+
+from plan_cache import DEFAULT_DIRECTORY, DEFAULT_OPTIONS, PlanCache, plan_key, plan_record, record_event_log
+from vehicle import PROJECT_FLEET
+
+DEFAULT_PLAN = "Data/project.plan.json"
+DATA_FILES = {"distances": "Data/Distances.csv", "addresses": "Data/Addresses.csv",
+              "packages": "Data/Packages.csv"}
+DEFAULT_SNAPSHOT = "Data/project.snapshot"
+
+
+# The 'parse_time' function converts "HH:MM[:SS]" to a timedelta since midnight for argparse; anything else is
+# an argparse error.
+def parse_time(text):
+    try:
+        parsed = datetime.datetime.strptime(text, '%H:%M:%S' if text.count(":") == 2 else '%H:%M')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time '{text}', expected HH:MM:SS") from None
+    return datetime.timedelta(hours=parsed.hour, minutes=parsed.minute, seconds=parsed.second)
+
+
+# The 'compute_plan' function loads the data, plans the deliveries like 'main' does with the given options
+# ("optimize", "deadline_aware", "assign", "candidates") and returns the plan as a plan_cache record. With
+# "candidates" the candidate index of the distance matrix is built once and given to the route construction and
+# the local search. The time complexity is that of 'plan_deliveries'.
+def compute_plan(options, data_files=None, snapshot_path=DEFAULT_SNAPSHOT, workers=1):
+    from HashTable import HashTable
+    from candidates import candidate_index
+    from event_log import EventLog
+    from main import plan_deliveries
+    from route_optimizer import RouteOptimizer
+    from snapshot import load_data
+    from time_windows import late_packages
+
+    data_files = dict(DATA_FILES, **(data_files or {}))
+    hashtable = HashTable()
+    distances, addresses = load_data(hashtable, data_files["distances"], data_files["addresses"],
+                                     data_files["packages"], snapshot_path)
+    event_log = EventLog()
+    candidates = candidate_index(distances) if options.get("candidates") else None
+    vehicles, total_distance = plan_deliveries(hashtable, addresses, distances, event_log,
+                                               RouteOptimizer(candidates=candidates) if options["optimize"] else None,
+                                               workers, options["assign"], options["deadline_aware"], candidates)
+    return plan_record(vehicles, total_distance, hashtable, event_log, options,
+                       [package.package_id for package in late_packages(hashtable)])
+
+
+# The 'cached_plan' function returns (key, plan) for 'options', from the plan cache when the same data, fleet and
+# options were planned before, otherwise computed and stored. 'replan' skips the lookup.
+def cached_plan(options, cache, data_files=None, snapshot_path=DEFAULT_SNAPSHOT, replan=False, workers=1):
+    data_files = dict(DATA_FILES, **(data_files or {}))
+    key = plan_key(data_files, PROJECT_FLEET, options)
+    plan = None if replan else cache.get(key)
+    if plan is None:
+        plan = compute_plan(options, data_files, snapshot_path, workers)
+        cache.put(key, plan)
+    return key, plan
+
+
+# The 'save_plan' function records which plan is current: its options and cache key. The file is written next to
+# its final name and moved into place, so a status query never reads half of it.
+def save_plan(plan_path, key, options):
+    temporary = f"{plan_path}.tmp{os.getpid()}"
+    with open(temporary, "w") as file:
+        json.dump({"key": key, "options": options}, file)
+    os.replace(temporary, plan_path)
+
+
+# The 'load_plan' function returns (key, options) of the current plan, or None when there is none.
+def load_plan(plan_path):
+    try:
+        with open(plan_path) as file:
+            current = json.load(file)
+        return current["key"], dict(DEFAULT_OPTIONS, **current["options"])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logging.warning(f"Could not read plan '{plan_path}': {e}")
+        return None
+
+
+# The 'current_plan' function returns the current plan: the one last made with 'plan' (default options when there
+# is none), looked up for the data as it is now. Changed data gives a new key, so the plan is then computed again.
+def current_plan(plan_path, cache, data_files=None, snapshot_path=DEFAULT_SNAPSHOT):
+    current = load_plan(plan_path)
+    options = current[1] if current else dict(DEFAULT_OPTIONS)
+    key, plan = cached_plan(options, cache, data_files, snapshot_path)
+    if current is None or current[0] != key:
+        save_plan(plan_path, key, options)
+    return plan
+
+
+# The 'package_statuses' function returns the status records of the plan's packages at 'at' (a timedelta), or
+# only of 'package_id'. Like the menu in 'main', the statuses come from a StatusBoard over the plan's events: a
+# package departs at its first load and is delivered at its last delivery. The time complexity is O(n + e log e).
+def package_statuses(plan, at, package_id=None):
+    from status_board import StatusBoard
+
+    packages = plan["packages"]
+    if package_id is not None:
+        packages = [record for record in packages if record["package_id"] == package_id]
+    board = StatusBoard.from_event_log(record_event_log(plan), [record["package_id"] for record in packages])
+    statuses = dict(zip(board.package_ids.tolist(), board.statuses(at)))
+    return [dict(record, status=str(statuses[record["package_id"]]), at=str(at)) for record in packages]
+
+
+# The 'plan_report' function summarizes the plan: each truck's shipments, times and mileage, the total distance
+# and the late packages. With 'at', the mileage every truck had driven by then is added.
+def plan_report(plan, at=None):
+    report = {"total_distance": plan["total_distance"], "options": plan["options"],
+              "vehicles": plan["vehicles"], "late_packages": plan["late_packages"]}
+    if at is not None:
+        event_log = record_event_log(plan)
+        report["at"] = str(at)
+        report["mileage_at"] = {str(vehicle_id): round(event_log.mileage_at(vehicle_id, at), 1)
+                                for vehicle_id in event_log.vehicle_ids()}
+        report["total_mileage_at"] = round(event_log.total_mileage_at(at), 1)
+    return report
+
+
+# The _write function prints 'records' as one JSON document, or with 'ndjson' as one JSON object per line.
+def _write(records, output_format, out=None):
+    out = out or sys.stdout
+    if output_format == "ndjson":
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+    else:
+        json.dump(records, out, indent=2)
+        out.write("\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Plan deliveries and query the plan.")
+    parser.add_argument("--plan", default=DEFAULT_PLAN, help="file naming the current plan (default: %(default)s)")
+    parser.add_argument("--cache", default=DEFAULT_DIRECTORY, help="plan cache directory (default: %(default)s)")
+    parser.add_argument("--instrument", action="store_true",
+                        help="print call counts and times of the pipeline stages and hot functions to stderr")
+    parser.add_argument("--profile", metavar="FILE", help="write a cProfile (pstats) dump of the run to FILE")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    plan = subcommands.add_parser("plan", help="compute the routes and save the plan")
+    plan.add_argument("--optimize", action="store_true", help="improve routes with local search")
+    plan.add_argument("--deadline-aware", action="store_true", help="order stops by deadline feasibility")
+    plan.add_argument("--assign", action="store_true", help="assign packages to trucks automatically")
+    plan.add_argument("--candidates", action="store_true",
+                      help="search only the nearest addresses first when routing (see candidates.py)")
+    plan.add_argument("--workers", type=int, default=1, help="processes for independent routes")
+    plan.add_argument("--replan", action="store_true", help="compute the plan even if it is cached")
+    plan.add_argument("--format", choices=("json", "ndjson"), default="json",
+                      help="json prints the report, ndjson prints every event")
+
+    status = subcommands.add_parser("status", help="package status at a time")
+    status.add_argument("--at", type=parse_time, required=True, help="time as HH:MM:SS")
+    status.add_argument("--id", type=int, help="one package ID (default: every package)")
+    status.add_argument("--format", choices=("json", "ndjson"), default="json")
+
+    report = subcommands.add_parser("report", help="mileage, times and late packages of the plan")
+    report.add_argument("--at", type=parse_time, help="also report the mileage at this time")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not (args.instrument or args.profile):
+        return run(args)
+
+    import instrumentation
+
+    metrics = instrumentation.enable() if args.instrument else None
+    try:
+        with instrumentation.profiled(args.profile):
+            return run(args)
+    finally:
+        if metrics is not None:
+            instrumentation.disable()
+            print(metrics.summary_table(), file=sys.stderr)
+
+
+# The 'run' function carries out the parsed command and returns the exit status.
+def run(args):
+    cache = PlanCache(args.cache)
+
+    if args.command == "plan":
+        options = {"optimize": args.optimize, "deadline_aware": args.deadline_aware, "assign": args.assign,
+                   "candidates": args.candidates}
+        key, plan = cached_plan(options, cache, replan=args.replan, workers=args.workers)
+        save_plan(args.plan, key, options)
+        if args.format == "ndjson":
+            _write(plan["events"], "ndjson")
+        else:
+            _write(plan_report(plan), "json")
+        return 0
+
+    plan = current_plan(args.plan, cache)
+    if args.command == "status":
+        records = package_statuses(plan, args.at, args.id)
+        if args.id is not None and not records:
+            print(json.dumps({"error": f"Package {args.id} not found."}), file=sys.stderr)
+            return 1
+        _write(records[0] if args.id is not None and args.format == "json" else records, args.format)
+    else:
+        _write(plan_report(plan, args.at), "json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# The 'depots' module plans deliveries from several hubs in the same metro area over one shared distance matrix.
+# Every vehicle has a home depot (Vehicle.depot_address) where its route starts and ends. Packages are first given
+# to a depot: the nearest one that is feasible, that is one whose trucks may carry the package (a "Can only be on
+# truck N" note must name a truck of that depot), still have room for it, and can reach its deadline driving
+# straight from the depot at their earliest departure. Packages that must be delivered together go to the same
+# depot. Each depot's packages are then split across its own trucks by the AssignmentSolver, and all routes are
+# computed by one FleetPlanner, so the routes of different depots run in parallel worker processes that share the
+# distance matrix. The plan reports the route distance of every depot next to the overall total.
+#
+# Usage: python depots.py --depot "4001 South 700 East" --depot "ADDRESS" [--trucks 3] [--workers N] [--candidates]
+import argparse
+import datetime
+import logging
+from collections import namedtuple
+
+import numpy as np
+
+from address_registry import AddressRegistry
+from assignment import AssignmentSolver, package_groups
+from distance_matrix import DistanceMatrix
+from fleet_planner import DEFAULT_DEPOT, FleetPlanner
+
+DepotPlan = namedtuple("DepotPlan", ["vehicles", "total_distance", "depot_distances", "assignment"])
+
+
+# The 'assign_depots' function gives every package to a depot. 'depot_vehicles' maps each depot address to the
+# vehicles based there. Groups restricted to a truck are placed first, then the others by earliest deadline; each
+# goes to the nearest feasible depot (the least total distance from the depot to its stops). When no depot with
+# room can reach a deadline, the nearest depot with room is used and a warning is logged. It returns
+# {depot address: [package IDs]} and raises ValueError when a group needs a truck no depot has or does not fit
+# anywhere. The time complexity is O(g * d) for g groups and d depots after O(n * d) distance lookups.
+def assign_depots(hashtable, addresses, distances, depot_vehicles, package_ids=None):
+    addresses = AddressRegistry.wrap(addresses)
+    distances = DistanceMatrix.wrap(distances)
+    if package_ids is None:
+        package_ids = list(hashtable)
+    depots = list(depot_vehicles)
+    depot_indexes = np.array([addresses.index_of(depot) for depot in depots], dtype=np.intp)
+    room = {depot: sum(vehicle.max_load for vehicle in vehicles) for depot, vehicles in depot_vehicles.items()}
+    truck_depot = {vehicle.id: depot for depot, vehicles in depot_vehicles.items() for vehicle in vehicles}
+    earliest = {depot: min(vehicle.departure_time for vehicle in vehicles)
+                for depot, vehicles in depot_vehicles.items()}
+    velocity = {depot: min(vehicle.velocity for vehicle in vehicles) for depot, vehicles in depot_vehicles.items()}
+
+    groups, constraints = package_groups(hashtable, package_ids)
+    latest = datetime.timedelta(days=1)
+
+    def order(members):
+        return (all(constraints[key].truck is None for key in members),
+                min(constraints[key].deadline or latest for key in members), min(members))
+
+    assignment = {depot: [] for depot in depots}
+    for members in sorted(groups, key=order):
+        trucks = {constraints[key].truck for key in members if constraints[key].truck is not None}
+        if len(trucks) > 1:
+            raise ValueError(f"Packages {members} must travel together but are restricted to trucks {trucks}.")
+        truck = trucks.pop() if trucks else None
+        if truck is not None and truck not in truck_depot:
+            raise ValueError(f"Packages {members} need truck {truck}, which is not in the fleet.")
+        allowed = depots if truck is None else [truck_depot[truck]]
+
+        stops = np.array([addresses.index_of(hashtable.get(key).address) for key in members], dtype=np.intp)
+        legs = distances.values[np.ix_(depot_indexes, stops)]
+        candidates = sorted((float(legs[position].sum()), position) for position, depot in enumerate(depots)
+                            if depot in allowed and room[depot] >= len(members))
+        if not candidates:
+            raise ValueError(f"Packages {members} do not fit in the trucks of any depot.")
+
+        chosen = None
+        for _, position in candidates:
+            depot = depots[position]
+            start = max([earliest[depot]] + [constraints[key].available_at or earliest[depot] for key in members])
+            if all(constraints[key].deadline is None
+                   or start + datetime.timedelta(hours=float(leg) / velocity[depot]) <= constraints[key].deadline
+                   for key, leg in zip(members, legs[position])):
+                chosen = depot
+                break
+        if chosen is None:
+            chosen = depots[candidates[0][1]]
+            logging.warning(f"No depot can reach the deadlines of packages {members}; using {chosen}.")
+        assignment[chosen].extend(members)
+        room[chosen] -= len(members)
+    return assignment
+
+
+class MultiDepotPlanner:
+    # The __init__ method stores the shared routing data. 'workers', 'optimizer', 'deadline_aware' and 'candidates'
+    # are passed to the FleetPlanner; 'address_correction_time' to each depot's AssignmentSolver.
+    def __init__(self, hashtable, addresses, distances, workers=1, optimizer=None, deadline_aware=False,
+                 address_correction_time=None, candidates=None):
+        self.hashtable = hashtable
+        self.addresses = AddressRegistry.wrap(addresses)
+        self.distances = DistanceMatrix.wrap(distances)
+        self.workers = workers
+        self.optimizer = optimizer
+        self.deadline_aware = deadline_aware
+        self.address_correction_time = address_correction_time
+        self.candidates = candidates
+        self.depot_vehicles = {}
+
+    # The 'add_vehicle' method adds a vehicle to the fleet of its home depot. A ValueError is raised when the
+    # vehicle has no depot or the depot is not a known address.
+    def add_vehicle(self, vehicle):
+        if vehicle.depot_address is None or self.addresses.index_of(vehicle.depot_address) is None:
+            raise ValueError(f"Vehicle {vehicle.id} has no known home depot ({vehicle.depot_address}).")
+        self.depot_vehicles.setdefault(vehicle.depot_address, []).append(vehicle)
+        return vehicle
+
+    # The 'plan' method assigns the packages to depots, splits each depot's packages across its trucks and routes
+    # every truck from and back to its depot. It returns a DepotPlan: the vehicles, the total route distance, the
+    # route distance of each depot and the {depot: [package IDs]} assignment.
+    def plan(self, event_log=None, package_ids=None):
+        assignment = assign_depots(self.hashtable, self.addresses, self.distances, self.depot_vehicles, package_ids)
+        planner = FleetPlanner(self.hashtable, self.addresses, self.distances, workers=self.workers,
+                               optimizer=self.optimizer, deadline_aware=self.deadline_aware,
+                               candidates=self.candidates)
+        for depot, vehicles in self.depot_vehicles.items():
+            if assignment[depot]:
+                AssignmentSolver(self.hashtable, self.addresses, self.distances, depot,
+                                 address_correction_time=self.address_correction_time).solve(vehicles,
+                                                                                             assignment[depot])
+            else:
+                for vehicle in vehicles:
+                    vehicle.shipments = []
+            for vehicle in vehicles:
+                if vehicle.shipments:
+                    planner.add_vehicle(vehicle)
+
+        vehicles, total_distance = planner.plan(event_log)
+        depot_distances = {depot: sum(planner.route_distances.get(vehicle.id, 0.0) for vehicle in depot_vehicles)
+                           for depot, depot_vehicles in self.depot_vehicles.items()}
+        return DepotPlan(vehicles, total_distance, depot_distances, assignment)
+
+
+def main(argv=None):
+    from candidates import candidate_index
+    from event_log import EventLog
+    from HashTable import HashTable
+    from main import mileage_summary
+    from snapshot import load_data
+    from vehicle import Vehicle
+
+    parser = argparse.ArgumentParser(description="Plan deliveries from several depots.")
+    parser.add_argument("--depot", action="append", help="depot address (repeat for every depot)")
+    parser.add_argument("--trucks", type=int, default=3, help="trucks per depot (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1, help="processes for the routes")
+    parser.add_argument("--candidates", action="store_true",
+                        help="search only the nearest addresses first when routing (see candidates.py)")
+    args = parser.parse_args(argv)
+
+    hashtable = HashTable()
+    distances, addresses = load_data(hashtable, 'Data/Distances.csv', 'Data/Addresses.csv', 'Data/Packages.csv',
+                                     'Data/project.snapshot')
+    planner = MultiDepotPlanner(hashtable, addresses, distances, args.workers,
+                                address_correction_time=datetime.timedelta(hours=10, minutes=20),
+                                candidates=candidate_index(distances) if args.candidates else None)
+    event_log = EventLog()
+    try:
+        for number, depot in enumerate(args.depot or [DEFAULT_DEPOT]):
+            for truck in range(args.trucks):
+                planner.add_vehicle(Vehicle(number * args.trucks + truck + 1, 16, 18, None, [], 0.0,
+                                            datetime.timedelta(hours=8), depot))
+        plan = planner.plan(event_log)
+    except ValueError as e:
+        parser.error(str(e))
+    for line in mileage_summary(plan.vehicles, plan.total_distance, event_log, plan.depot_distances):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# The 'DistanceMatrix' class stores the distance table as one dense, symmetric NumPy array.
+# Distances.csv only fills the lower triangle, so the old list of lists had to try [i][j] and then
+# fall back to [j][i] on every lookup. Here both halves are filled in once when the table is loaded,
+# which makes every lookup a single O(1) array access and lets a whole row be read as a vector.
+# Pairs that are not defined in either half are stored as infinity.
+import csv
+
+import numpy as np
+
+
+class DistanceMatrix:
+    # The __init__ method wraps a square 2-D array of distances. 'source' is an optional (filename, offset) pair
+    # naming the file the array is mapped from, so other processes can map the same pages. O(1).
+    def __init__(self, values, source=None):
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape[0] != values.shape[1]:
+            raise ValueError(f"A distance matrix must be square, got shape {values.shape}.")
+        self.values = values
+        self.source = source
+
+    # The 'from_rows' class method builds the matrix from a (possibly triangular) list of lists in which
+    # missing cells are None. Each missing cell is filled from its mirror cell, and cells missing in both
+    # halves become infinity. The time complexity is O(A^2), where A is the number of addresses.
+    @classmethod
+    def from_rows(cls, rows, dtype=np.float64):
+        size = max(len(rows), max((len(row) for row in rows), default=0))
+        values = np.full((size, size), np.nan, dtype=dtype)
+        for i, row in enumerate(rows):
+            for j, distance in enumerate(row):
+                if distance is not None:
+                    values[i, j] = distance
+
+        values = np.where(np.isnan(values), values.T, values)
+        values[np.isnan(values)] = np.inf
+        return cls(values)
+
+    # The 'from_csv' class method reads Distances.csv straight into a matrix.
+    # The time complexity is O(A^2).
+    @classmethod
+    def from_csv(cls, filename, dtype=np.float64):
+        with open(filename, newline='') as csvfile:
+            rows = [[float(distance) if distance else None for distance in row] for row in csv.reader(csvfile)]
+        return cls.from_rows(rows, dtype)
+
+    # The 'wrap' class method returns the matrix unchanged, or builds one from a list of lists.
+    @classmethod
+    def wrap(cls, distances, dtype=np.float64):
+        if isinstance(distances, cls):
+            return distances
+        return cls.from_rows(distances, dtype)
+
+    # The 'distance' method returns the distance between two address indexes as a Python float.
+    # The time complexity is O(1).
+    def distance(self, i, j):
+        return float(self.values[i, j])
+
+    # The 'row' method returns every distance from address i as a read-only array view.
+    # The time complexity is O(1) because no data is copied.
+    def row(self, i):
+        return self.values[i]
+
+    # The 'nbytes' property reports the memory used by the distance values.
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    # '__getitem__' keeps the distances[i][j] indexing used by the list of lists working.
+    def __getitem__(self, i):
+        return self.values[i]
+
+    def __len__(self):
+        return self.values.shape[0]
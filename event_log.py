@@ -0,0 +1,105 @@
+# The 'EventLog' class records what happened during route simulation as an ordered list of events
+# (load, depart, deliver, return), each with the vehicle ID, package ID, address index, timestamp and the
+# vehicle's cumulative mileage. Timestamps are kept in sorted lists next to the events, so "what happened
+# by time T", "where was truck k at T" and "mileage at T" are answered with binary search in O(log n).
+from bisect import bisect_right
+from collections import namedtuple
+
+LOAD = "load"
+DEPART = "depart"
+DELIVER = "deliver"
+RETURN = "return"
+
+DeliveryEvent = namedtuple("DeliveryEvent", ["time", "kind", "vehicle_id", "package_id", "address_index", "mileage"])
+
+
+class EventLog:
+    # The __init__ method creates an empty log with a global timeline and one timeline per vehicle.
+    def __init__(self):
+        self.events = []
+        self._times = []
+        self._vehicle_events = {}
+        self._vehicle_times = {}
+
+    # The 'record' method adds an event in time order. Events with equal timestamps keep the order in
+    # which they were recorded. The time complexity is O(log n) to find the position (plus the list
+    # insertion, which is O(1) when events arrive in time order, as they do from a single vehicle).
+    def record(self, kind, vehicle_id, package_id, address_index, time, mileage):
+        event = DeliveryEvent(time, kind, vehicle_id, package_id, address_index, mileage)
+
+        position = bisect_right(self._times, time)
+        self._times.insert(position, time)
+        self.events.insert(position, event)
+
+        vehicle_times = self._vehicle_times.setdefault(vehicle_id, [])
+        position = bisect_right(vehicle_times, time)
+        vehicle_times.insert(position, time)
+        self._vehicle_events.setdefault(vehicle_id, []).insert(position, event)
+        return event
+
+    # The 'discard_after' method removes the events of one vehicle that are later than 'time', for when its
+    # remaining route is re-planned. Earlier events (its history) are kept. The time complexity is O(n).
+    def discard_after(self, vehicle_id, time):
+        kept = [(event_time, event) for event_time, event in zip(self._times, self.events)
+                if event.vehicle_id != vehicle_id or event_time <= time]
+        self._times = [event_time for event_time, _ in kept]
+        self.events = [event for _, event in kept]
+        if vehicle_id in self._vehicle_times:
+            position = bisect_right(self._vehicle_times[vehicle_id], time)
+            del self._vehicle_times[vehicle_id][position:]
+            del self._vehicle_events[vehicle_id][position:]
+
+    # The 'events_until' method returns every event with a timestamp at or before 'time'. O(log n + k).
+    def events_until(self, time):
+        return self.events[:bisect_right(self._times, time)]
+
+    # The 'vehicle_events' method returns the events of one vehicle in time order.
+    def vehicle_events(self, vehicle_id):
+        return list(self._vehicle_events.get(vehicle_id, []))
+
+    # The 'last_event' method returns the latest event of a vehicle at or before 'time', or None if the
+    # vehicle had not started yet. The time complexity is O(log n).
+    def last_event(self, vehicle_id, time):
+        position = bisect_right(self._vehicle_times.get(vehicle_id, []), time)
+        if position == 0:
+            return None
+        return self._vehicle_events[vehicle_id][position - 1]
+
+    # The 'position_at' method returns the address index of the last stop a vehicle reached by 'time'.
+    # The time complexity is O(log n).
+    def position_at(self, vehicle_id, time):
+        event = self.last_event(vehicle_id, time)
+        return None if event is None else event.address_index
+
+    # The 'mileage_at' method returns the miles a vehicle had driven by 'time'. Between two events the
+    # mileage is interpolated, because vehicles drive at constant speed. The time complexity is O(log n).
+    def mileage_at(self, vehicle_id, time):
+        times = self._vehicle_times.get(vehicle_id, [])
+        position = bisect_right(times, time)
+        if position == 0:
+            return 0.0
+
+        events = self._vehicle_events[vehicle_id]
+        previous = events[position - 1]
+        if position == len(events):
+            return previous.mileage
+
+        following = events[position]
+        span = following.time - previous.time
+        if not span:
+            return previous.mileage
+        return previous.mileage + (following.mileage - previous.mileage) * ((time - previous.time) / span)
+
+    # The 'total_mileage_at' method adds up 'mileage_at' over every vehicle in the log. O(V log n).
+    def total_mileage_at(self, time):
+        return sum(self.mileage_at(vehicle_id, time) for vehicle_id in self._vehicle_times)
+
+    # The 'vehicle_ids' method returns the IDs of the vehicles that have events, in recording order.
+    def vehicle_ids(self):
+        return list(self._vehicle_times)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
@@ -0,0 +1,201 @@
+# The 'FleetPlanner' class computes the routes of a whole fleet, running independent vehicles concurrently in a
+# ProcessPoolExecutor. The distance matrix is copied once into shared memory (or, when it comes from a snapshot
+# file, the file itself is mapped) and every worker maps the same pages read-only, so it is never pickled per
+# task; a task only carries its own vehicle and packages.
+# A vehicle can be set to start after other vehicles: it departs when the first of them is back at the depot
+# (and never before its own departure time), and it is only submitted once those routes are known.
+# Results are applied to the shared package table and event log in the order the vehicles were added, so the
+# outcome is the same as computing the routes one after another.
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from address_registry import AddressRegistry
+from distance_matrix import DistanceMatrix
+from event_log import EventLog
+from package import Package
+
+DEFAULT_DEPOT = "4001 South 700 East"
+
+RouteResult = namedtuple("RouteResult", ["vehicle_id", "shipments", "current_address", "current_time",
+                                         "total_distance", "route_distance", "return_time", "package_times",
+                                         "events"])
+
+# Per-process routing data: the address registry and distance matrix (backed by shared memory in workers)
+_worker_state = {}
+
+
+# The _init_worker function runs once in every worker process. It attaches to the shared-memory block that holds
+# the distance matrix, or maps the snapshot file named by 'source', and wraps it without copying.
+# The time complexity is O(A) for the address registry.
+def _init_worker(memory_name, shape, dtype, address_rows, optimizer, source=None, deadline_aware=False,
+                 candidates=None):
+    if source is not None:
+        memory = None
+        values = np.memmap(source[0], dtype=dtype, mode='r', offset=source[1], shape=shape)
+    else:
+        memory = shared_memory.SharedMemory(name=memory_name)
+        values = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+        values.flags.writeable = False
+    _worker_state.update(memory=memory, distances=DistanceMatrix(values), addresses=AddressRegistry(address_rows),
+                         optimizer=optimizer, deadline_aware=deadline_aware, candidates=candidates)
+
+
+# The _route_task function computes one vehicle's route (and its return trip) with 'calculate_route', using the
+# routing data of the current process. It returns a RouteResult with everything the parent needs to apply.
+def _route_task(task):
+    from main import calculate_route, calculate_return_trip
+
+    vehicle, packages, start_time, depot_address, return_to_depot = task
+    distances, addresses = _worker_state["distances"], _worker_state["addresses"]
+    vehicle.current_time = start_time
+    vehicle.start_time = start_time
+    event_log = EventLog()
+
+    vehicle, route_distance = calculate_route(vehicle, packages, addresses, distances, event_log,
+                                              _worker_state["optimizer"], _worker_state["deadline_aware"],
+                                              _worker_state["candidates"])
+    return_time = None
+    if return_to_depot:
+        vehicle, return_time = calculate_return_trip(vehicle, vehicle.current_address, depot_address, distances,
+                                                     addresses, event_log)
+
+    package_times = {key: (package.departure_time, package.delivery_time) for key, package in packages.items()}
+    return RouteResult(vehicle.id, vehicle.shipments, vehicle.current_address, vehicle.current_time,
+                       vehicle.total_distance, route_distance, return_time, package_times, list(event_log))
+
+
+class FleetPlanner:
+    # The __init__ method stores the read-only routing data. 'workers' is the number of processes; with one
+    # worker (the default) the routes are computed in this process without a pool. 'optimizer', 'deadline_aware'
+    # and 'candidates' (a CandidateIndex of the matrix, sent once to each worker) are passed on to 'calculate_route'.
+    def __init__(self, hashtable, addresses, distances, depot_address=DEFAULT_DEPOT, workers=1, optimizer=None,
+                 deadline_aware=False, candidates=None):
+        self.hashtable = hashtable
+        self.addresses = AddressRegistry.wrap(addresses)
+        self.distances = DistanceMatrix.wrap(distances)
+        self.depot_address = depot_address
+        self.workers = workers
+        self.optimizer = optimizer
+        self.deadline_aware = deadline_aware
+        self.candidates = candidates
+        self.vehicles = []
+        self._start_after = {}
+        self._return_to_depot = {}
+        self.route_distances = {}
+
+    # The 'add_vehicle' method adds a vehicle to the plan. 'start_after' lists vehicle IDs that must return to
+    # the depot first; the vehicle leaves when the first of them is back. 'return_to_depot' adds the return trip.
+    # The vehicle returns to its own home depot ('depot_address'), or to the planner's depot when it has none.
+    def add_vehicle(self, vehicle, start_after=(), return_to_depot=True):
+        unknown = [vehicle_id for vehicle_id in start_after if vehicle_id not in self._start_after]
+        if unknown:
+            raise ValueError(f"Vehicle {vehicle.id} starts after unknown vehicles {unknown}.")
+        if start_after and not all(self._return_to_depot[vehicle_id] for vehicle_id in start_after):
+            raise ValueError(f"Vehicle {vehicle.id} can only start after vehicles that return to the depot.")
+        depot_address = self.depot_of(vehicle)
+        if any(self.depot_of(other) != depot_address for other in self.vehicles if other.id in start_after):
+            raise ValueError(f"Vehicle {vehicle.id} can only start after vehicles of its own depot.")
+        self.vehicles.append(vehicle)
+        self._start_after[vehicle.id] = tuple(start_after)
+        self._return_to_depot[vehicle.id] = return_to_depot
+        return vehicle
+
+    # The 'plan' method computes every route and returns (vehicles, total route distance). Vehicles are
+    # submitted as soon as the vehicles they wait for have returned, so independent routes run concurrently.
+    # Results are applied to the packages, vehicles and 'event_log' in the order the vehicles were added, and
+    # each vehicle's route distance is kept in 'route_distances'.
+    def plan(self, event_log=None):
+        results = {}
+        if self.workers <= 1:
+            _worker_state.update(distances=self.distances, addresses=self.addresses, optimizer=self.optimizer,
+                                 deadline_aware=self.deadline_aware, candidates=self.candidates)
+            try:
+                for vehicle in self.vehicles:
+                    results[vehicle.id] = _route_task(self._task(vehicle, results))
+            finally:
+                _worker_state.clear()
+        else:
+            self._plan_in_pool(results)
+
+        total_distance = 0.0
+        for vehicle in self.vehicles:
+            self.route_distances[vehicle.id] = self._apply(vehicle, results[vehicle.id], event_log)
+            total_distance += self.route_distances[vehicle.id]
+        return self.vehicles, total_distance
+
+    # The 'depot_of' method returns the depot a vehicle starts from and returns to.
+    def depot_of(self, vehicle):
+        return vehicle.depot_address or self.depot_address
+
+    # The _plan_in_pool method runs the routes in worker processes. A matrix mapped from a snapshot file is
+    # mapped again by each worker; any other matrix is copied once into a shared-memory block.
+    def _plan_in_pool(self, results):
+        values = self.distances.values
+        source = self.distances.source
+        memory = None
+        if source is None:
+            values = np.ascontiguousarray(values)
+            memory = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, dtype=values.dtype, buffer=memory.buf)[...] = values
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(memory and memory.name, values.shape, values.dtype.str,
+                                               self.addresses.rows, self.optimizer, source,
+                                               self.deadline_aware, self.candidates)) as pool:
+                pending = {}
+                waiting = list(self.vehicles)
+                while waiting or pending:
+                    for vehicle in [vehicle for vehicle in waiting
+                                    if all(vehicle_id in results for vehicle_id in self._start_after[vehicle.id])]:
+                        waiting.remove(vehicle)
+                        pending[pool.submit(_route_task, self._task(vehicle, results))] = vehicle.id
+                    if not pending:
+                        raise ValueError(f"Vehicles {[vehicle.id for vehicle in waiting]} wait on each other.")
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[pending.pop(future)] = future.result()
+        finally:
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+
+    # The _task method packs one vehicle with copies of its packages and its start time. O(n) in its shipments.
+    def _task(self, vehicle, results):
+        start_time = vehicle.current_time
+        start_after = self._start_after[vehicle.id]
+        if start_after:
+            start_time = max(start_time, min(results[vehicle_id].return_time for vehicle_id in start_after))
+
+        packages = {}
+        for package_id in vehicle.shipments:
+            package = self.hashtable.get(package_id)
+            packages[package_id] = Package(package.package_id, package.address, package.city, package.state,
+                                           package.zip_code, package.deadline, package.weight, package.notes)
+        return vehicle, packages, start_time, self.depot_of(vehicle), self._return_to_depot[vehicle.id]
+
+    # The _apply method copies a RouteResult onto the real vehicle, its packages and the event log, and returns
+    # the route distance. A package keeps the departure time of the first route that carried it.
+    def _apply(self, vehicle, result, event_log):
+        vehicle.shipments = result.shipments
+        vehicle.current_address = result.current_address
+        vehicle.current_time = result.current_time
+        vehicle.start_time = result.events[0].time if result.events else vehicle.current_time
+        vehicle.total_distance = result.total_distance
+
+        for package_id, (departure_time, delivery_time) in result.package_times.items():
+            package = self.hashtable.get(package_id)
+            if package.departure_time is None:
+                package.departure_time = departure_time
+            package.delivery_time = delivery_time
+            package.status = "Delivered"
+            package.delivered = True
+
+        if event_log is not None:
+            for event in result.events:
+                event_log.record(event.kind, event.vehicle_id, event.package_id, event.address_index, event.time,
+                                 event.mileage)
+        return result.route_distance
+
@@ -0,0 +1,197 @@
+# The 'IncrementalRoute' class changes a vehicle's route while it is being driven. It keeps the stops in driving
+# order together with their cumulative mileage; because a vehicle drives at constant speed and never waits, the
+# arrival time at every stop follows from its mileage. A change (insert, remove or update the address of a
+# package) is applied at a time 'at': the stops already reached, plus the stop the vehicle is driving to, are
+# fixed, and only the rest of the route is repaired. A new stop goes to its cheapest insertion position and a
+# RouteOptimizer then runs 2-opt / Or-opt on a small window around the change, so the cost of a change grows
+# with the window rather than with the route. Delivered stops and their times never change.
+import datetime
+import time
+from bisect import bisect_right
+from collections import namedtuple
+
+import numpy as np
+
+from distance_matrix import DistanceMatrix
+from event_log import LOAD, DEPART, DELIVER, RETURN
+from route_optimizer import RouteOptimizer
+
+DEFAULT_WINDOW = 8
+
+RepairResult = namedtuple("RepairResult", ["position", "added_distance", "elapsed"])
+
+
+class IncrementalRoute:
+    # The __init__ method takes the route's start (address index and time), the vehicle's speed in miles per
+    # hour, the stops as (package_id, address_index) pairs in driving order and, when the route goes back to
+    # the depot, its 'end_index'. 'window' is the number of stops on each side of a change that local search
+    # may reorder. The time complexity is O(n).
+    def __init__(self, vehicle_id, start_index, start_time, velocity, stops, distances, end_index=None,
+                 window=DEFAULT_WINDOW, optimizer=None):
+        self.vehicle_id = vehicle_id
+        self.start_index = start_index
+        self.start_time = start_time
+        self.velocity = velocity
+        self.distances = DistanceMatrix.wrap(distances)
+        self.end_index = end_index
+        self.window = window
+        self.optimizer = optimizer if optimizer is not None else RouteOptimizer(time_budget=0.01, max_iterations=5)
+        self.package_ids = [package_id for package_id, _ in stops]
+        self.indexes = [address_index for _, address_index in stops]
+        self.mileage = np.zeros(len(stops))
+        self._update_mileage(0)
+
+    # The 'from_event_log' class method rebuilds a vehicle's route from its depart, deliver and return events.
+    @classmethod
+    def from_event_log(cls, event_log, vehicle_id, velocity, distances, **kwargs):
+        events = event_log.vehicle_events(vehicle_id)
+        depart = next(event for event in events if event.kind == DEPART)
+        stops = [(event.package_id, event.address_index) for event in events if event.kind == DELIVER]
+        end = [event.address_index for event in events if event.kind == RETURN]
+        return cls(vehicle_id, depart.address_index, depart.time, velocity, stops, distances,
+                   end[-1] if end else None, **kwargs)
+
+    # The _update_mileage method recomputes the cumulative mileage from stop 'position' to the end with one
+    # vectorized gather and cumulative sum. The time complexity is O(n - position).
+    def _update_mileage(self, position):
+        count = len(self.indexes)
+        if position >= count:
+            self.mileage = self.mileage[:count]
+            return
+        path = np.array([self.start_index] + self.indexes, dtype=np.intp)
+        legs = self.distances.values[path[position:-1], path[position + 1:]]
+        base = self.mileage[position - 1] if position > 0 else 0.0
+        mileage = np.empty(count)
+        mileage[:position] = self.mileage[:position]
+        mileage[position:] = base + np.cumsum(legs)
+        self.mileage = mileage
+
+    # The 'arrival' method returns the time the vehicle reaches the stop at 'position'. O(1).
+    def arrival(self, position):
+        return self.start_time + datetime.timedelta(hours=float(self.mileage[position]) / self.velocity)
+
+    # The 'fixed_count' method returns how many leading stops can no longer change at time 'at': the stops
+    # already reached and the one the vehicle is driving to. The time complexity is O(log n).
+    def fixed_count(self, at):
+        driven = max(0.0, (at - self.start_time) / datetime.timedelta(hours=1) * self.velocity)
+        reached = int(np.searchsorted(self.mileage, driven, side='right'))
+        # A leg in progress is completed before the route can change
+        if reached < len(self.indexes) and driven > (self.mileage[reached - 1] if reached else 0.0):
+            reached += 1
+        return reached
+
+    # The 'insert' method adds a package at 'address_index' at its cheapest position after the fixed stops,
+    # then runs local search around it. The time complexity is O(n) plus O(window^2) for the local search.
+    def insert(self, package_id, address_index, at):
+        started = time.perf_counter()
+        if package_id in self.package_ids:
+            raise ValueError(f"Package {package_id} is already on vehicle {self.vehicle_id}'s route.")
+        fixed = self.fixed_count(at)
+        before = self.total_distance()
+
+        # Position p puts the stop between previous[p - fixed] and following[p - fixed]; after the last stop the
+        # route either ends (no following stop, marked -1) or returns to the depot
+        values = self.distances.values
+        previous = np.array(([self.start_index] + self.indexes)[fixed:], dtype=np.intp)
+        following = np.array(self.indexes[fixed:] + [-1 if self.end_index is None else self.end_index],
+                             dtype=np.intp)
+        has_next = following >= 0
+        following = np.where(has_next, following, 0)
+        costs = values[previous, address_index] + np.where(
+            has_next, values[address_index, following] - values[previous, following], 0.0)
+        position = fixed + int(np.argmin(costs))
+
+        self.package_ids.insert(position, package_id)
+        self.indexes.insert(position, address_index)
+        self._repair(position, fixed)
+        return RepairResult(position, self.total_distance() - before, time.perf_counter() - started)
+
+    # The 'remove' method takes an undelivered package off the route and runs local search around the gap.
+    # A ValueError is raised for a package that is not on the route or can no longer be changed. O(n).
+    def remove(self, package_id, at):
+        started = time.perf_counter()
+        position = self._position(package_id, at)
+        fixed = self.fixed_count(at)
+        before = self.total_distance()
+        del self.package_ids[position]
+        del self.indexes[position]
+        self._repair(position, fixed)
+        return RepairResult(position, self.total_distance() - before, time.perf_counter() - started)
+
+    # The 'update_address' method moves an undelivered package to a new address, such as a corrected one.
+    def update_address(self, package_id, address_index, at):
+        started = time.perf_counter()
+        before = self.total_distance()
+        self.remove(package_id, at)
+        position = self.insert(package_id, address_index, at).position
+        return RepairResult(position, self.total_distance() - before, time.perf_counter() - started)
+
+    def _position(self, package_id, at):
+        try:
+            position = self.package_ids.index(package_id)
+        except ValueError:
+            raise ValueError(f"Package {package_id} is not on vehicle {self.vehicle_id}'s route.") from None
+        if position < self.fixed_count(at):
+            raise ValueError(f"Package {package_id} has already been delivered or is being delivered.")
+        return position
+
+    # The _repair method runs local search on the stops within 'window' of 'position' (never before 'fixed'),
+    # with the stops on either side of the window held in place, then updates the mileage from the window on.
+    def _repair(self, position, fixed):
+        low = max(fixed, position - self.window)
+        high = min(len(self.indexes), position + self.window + 1)
+        if high - low > 2:
+            start = self.indexes[low - 1] if low > 0 else self.start_index
+            end = self.indexes[high] if high < len(self.indexes) else self.end_index
+            result = self.optimizer.improve(start, self.indexes[low:high], self.distances, end_index=end)
+            self.indexes[low:high] = [self.indexes[low + k] for k in result.order]
+            self.package_ids[low:high] = [self.package_ids[low + k] for k in result.order]
+        self._update_mileage(low)
+
+    # The 'total_distance' method returns the route's length, including the return to the depot if it has one.
+    def total_distance(self):
+        if not self.indexes:
+            return 0.0 if self.end_index is None else self.distances.distance(self.start_index, self.end_index)
+        total = float(self.mileage[-1])
+        if self.end_index is not None:
+            total += self.distances.distance(self.indexes[-1], self.end_index)
+        return total
+
+    # The 'stops' method lists (package_id, address_index, arrival time, mileage) in driving order. O(n).
+    def stops(self):
+        return [(package_id, address_index, self.arrival(position), float(self.mileage[position]))
+                for position, (package_id, address_index) in enumerate(zip(self.package_ids, self.indexes))]
+
+    # The 'apply' method writes the re-planned part of the route (everything after 'at') to the packages in
+    # 'hashtable' and, when given, replaces the vehicle's future events in 'event_log'. O(n).
+    def apply(self, hashtable, at, event_log=None):
+        first = bisect_right([self.arrival(position) for position in range(len(self.indexes))], at)
+        if event_log is not None:
+            event_log.discard_after(self.vehicle_id, at)
+            loaded = {event.package_id for event in event_log.vehicle_events(self.vehicle_id) if event.kind == LOAD}
+            here = self.start_index if not first else self.indexes[first - 1]
+            for package_id in self.package_ids[first:]:
+                if package_id not in loaded:
+                    event_log.record(LOAD, self.vehicle_id, package_id, here, at, self._mileage_at(at))
+
+        for position in range(first, len(self.indexes)):
+            package = hashtable.get(self.package_ids[position])
+            if package is not None:
+                if package.departure_time is None:
+                    package.departure_time = at
+                package.delivery_time = self.arrival(position)
+            if event_log is not None:
+                event_log.record(DELIVER, self.vehicle_id, self.package_ids[position], self.indexes[position],
+                                 self.arrival(position), float(self.mileage[position]))
+
+        if self.end_index is not None and event_log is not None:
+            total = self.total_distance()
+            event_log.record(RETURN, self.vehicle_id, None, self.end_index,
+                             self.start_time + datetime.timedelta(hours=total / self.velocity), total)
+
+    def _mileage_at(self, at):
+        return max(0.0, min((at - self.start_time) / datetime.timedelta(hours=1) * self.velocity,
+                            self.total_distance()))
+
+    def __len__(self):
+        return len(self.indexes)
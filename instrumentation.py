@@ -0,0 +1,200 @@
+# The 'instrumentation' module measures where the time of a plan goes. It is opt-in: 'enable' replaces the stages
+# of the pipeline (loading, planning, routing, return trips) and its hot functions (address lookups, distance
+# fetches, hash table gets, sets and resizes) with wrappers that count the calls and add up their time, and
+# 'disable' puts the original functions back. While it is disabled nothing is wrapped, so it costs nothing.
+# Hash table gets and sets also count their probes (the bucket entries compared with the key), their misses (the key
+# is not in the table: a get that returns None or a set that inserts) and their collisions (the key was found after
+# other entries of its bucket). The times are inclusive: a route's time contains the lookups it made. Only the calling
+# process is measured, so routes planned in FleetPlanner worker processes are counted as one 'plan' each.
+# 'profiled' runs code under cProfile and writes the pstats file, for the functions this module does not wrap.
+#
+# Usage: with instrumented() as metrics: ...; print(metrics.summary_table())
+import cProfile
+import functools
+import importlib
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# (module, attribute) of the pipeline stages and of the hot functions. A dotted attribute is a method.
+STAGES = [("snapshot", "load_data"), ("main", "load_packages_into_hash"), ("main", "load_distance_data"),
+          ("main", "plan_deliveries"), ("fleet_planner", "FleetPlanner.plan"), ("assignment", "AssignmentSolver.solve"),
+          ("main", "calculate_route"), ("main", "calculate_return_trip"), ("time_windows", "late_packages"),
+          ("status_board", "StatusBoard.from_event_log")]
+HOT_FUNCTIONS = [("main", "extract_address"), ("main", "distance_between_addresses"),
+                 ("address_registry", "AddressRegistry.index_of"), ("distance_matrix", "DistanceMatrix.distance"),
+                 ("distance_matrix", "DistanceMatrix.row"), ("HashTable", "HashTable.get"),
+                 ("HashTable", "HashTable.set"), ("HashTable", "HashTable._resize")]
+PROBED = {"HashTable.get", "HashTable.set"}
+
+_active = None
+
+
+class Instrumentation:
+    # The __init__ method starts with empty counters and timers. A timer is [calls, seconds] under its name.
+    def __init__(self):
+        self.counters = Counter()
+        self.timers = {}
+        self.kinds = {}
+        self._patches = []
+
+    # The 'count' method adds 'amount' to the counter 'name'. O(1).
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    # The 'stage' context manager times a block of code as the stage 'name'. O(1) overhead.
+    @contextmanager
+    def stage(self, name):
+        timer = self._timer(name, "stage")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timer[0] += 1
+            timer[1] += time.perf_counter() - start
+
+    def _timer(self, name, kind):
+        self.kinds.setdefault(name, kind)
+        return self.timers.setdefault(name, [0, 0.0])
+
+    # The _wrap method returns a wrapper of 'function' that counts its calls and adds up its time under 'name'.
+    # Hash table gets and sets also count the bucket entries they compare, and whether they missed or collided.
+    def _wrap(self, function, name, kind):
+        timer = self._timer(name, kind)
+        counters = self.counters
+        probed = name in PROBED
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if probed:
+                table, key = args[0], args[1]
+                bucket = table.table[table._hash(key)]
+                probes = next((position + 1 for position, (current_key, _) in enumerate(bucket) if current_key == key),
+                              None)
+                if probes is None:
+                    counters["HashTable.probes"] += len(bucket)
+                    counters["HashTable.misses"] += 1
+                else:
+                    counters["HashTable.probes"] += probes
+                    counters["HashTable.collisions"] += probes > 1
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timer[0] += 1
+                timer[1] += time.perf_counter() - start
+
+        return wrapper
+
+    # The 'install' method wraps every target. A function is replaced in every loaded module that imported it, so
+    # 'from main import calculate_route' callers are measured too; a method is replaced on its class.
+    def install(self, stages=STAGES, hot_functions=HOT_FUNCTIONS):
+        for targets, kind in ((stages, "stage"), (hot_functions, "function")):
+            for module_name, attribute in targets:
+                owner = importlib.import_module(module_name)
+                *path, name = attribute.split(".")
+                for part in path:
+                    owner = getattr(owner, part)
+                original = owner.__dict__[name] if path else getattr(owner, name)
+                if isinstance(original, (classmethod, staticmethod)):
+                    wrapper = type(original)(self._wrap(original.__func__, attribute, kind))
+                else:
+                    wrapper = self._wrap(original, attribute, kind)
+                if path:
+                    self._patch(owner, name, original, wrapper)
+                    continue
+                for module in list(sys.modules.values()):
+                    if getattr(module, "__dict__", {}).get(name) is original:
+                        self._patch(module, name, original, wrapper)
+
+    def _patch(self, owner, name, original, wrapper):
+        setattr(owner, name, wrapper)
+        self._patches.append((owner, name, original))
+
+    # The 'uninstall' method puts every original function back, in reverse order.
+    def uninstall(self):
+        while self._patches:
+            owner, name, original = self._patches.pop()
+            setattr(owner, name, original)
+
+    # The 'summary' method returns one row per timer that was called, slowest first:
+    # (name, kind, calls, total seconds, mean seconds), followed by the counters as a dict.
+    def summary(self):
+        rows = [(name, self.kinds[name], calls, seconds, seconds / calls)
+                for name, (calls, seconds) in self.timers.items() if calls]
+        rows.sort(key=lambda row: (row[1] != "stage", -row[3]))
+        return rows, dict(self.counters)
+
+    # The 'summary_table' method formats the summary as a text table.
+    def summary_table(self):
+        rows, counters = self.summary()
+        lines = [f"{'name':<30}{'kind':<10}{'calls':>10}{'total ms':>12}{'mean us':>12}"]
+        for name, kind, calls, seconds, mean in rows:
+            lines.append(f"{name:<30}{kind:<10}{calls:>10}{seconds * 1e3:>12.2f}{mean * 1e6:>12.2f}")
+        for name, value in sorted(counters.items()):
+            lines.append(f"{name:<40}{value:>10}")
+        return "\n".join(lines)
+
+    # The 'as_dict' method returns the summary as JSON-ready data.
+    def as_dict(self):
+        rows, counters = self.summary()
+        return {"timers": [{"name": name, "kind": kind, "calls": calls, "seconds": round(seconds, 6)}
+                           for name, kind, calls, seconds, _ in rows],
+                "counters": counters}
+
+
+# The 'enable' function starts measuring with a new Instrumentation and returns it. It raises ValueError when
+# instrumentation is already enabled.
+def enable():
+    global _active
+    if _active is not None:
+        raise ValueError("Instrumentation is already enabled.")
+    _active = Instrumentation()
+    try:
+        _active.install()
+    except Exception:
+        _active.uninstall()
+        _active = None
+        raise
+    return _active
+
+
+# The 'disable' function stops measuring and returns the Instrumentation with what was measured (None if it was
+# not enabled).
+def disable():
+    global _active
+    metrics, _active = _active, None
+    if metrics is not None:
+        metrics.uninstall()
+    return metrics
+
+
+def active():
+    return _active
+
+
+# The 'instrumented' context manager enables instrumentation for a block and disables it afterwards.
+@contextmanager
+def instrumented():
+    metrics = enable()
+    try:
+        yield metrics
+    finally:
+        disable()
+
+
+# The 'profiled' context manager runs a block under cProfile and writes the pstats dump to 'path' (readable with
+# 'python -m pstats path'). With 'path' None it does nothing.
+@contextmanager
+def profiled(path):
+    if path is None:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
@@ -6,60 +6,65 @@
 import csv
 import datetime
 from HashTable import HashTable
-from vehicle import Vehicle
-from package import Package
+from vehicle import Vehicle, PROJECT_FLEET
+from package_loader import stream_packages, LoadStats, DEFAULT_CHUNK_SIZE
+from address_registry import AddressRegistry
+from status_board import StatusBoard
+from event_log import EventLog, LOAD, DEPART, DELIVER, RETURN
+from fleet_planner import FleetPlanner
+from assignment import AssignmentSolver
+from snapshot import load_data
+from shortest_paths import cached_closure
+from time_windows import TimeWindowRouter, deadline_minutes, late_packages
+from plan_cache import PlanCache, DEFAULT_OPTIONS, plan_key, plan_record, restore_plan
+from distance_matrix import DistanceMatrix
 import logging
+import math
+import numpy as np
 
 
 # The 'load_packages_into_hash' function reads data from a CSV file and stores it into a hash table.
 # The hash table is an optimal data structure in this scenario due to its ability to perform
 # lookup, insert and delete operations in O(1) average time complexity. This allows for the
-# rapid retrieval of package data using the package ID.
-def load_packages_into_hash(hashtable: HashTable, filename: str) -> None:
+# rapid retrieval of package data using the package ID. When the hashtable supports 'reserve', it is sized once
+# from 'size_hint' (by default the number of lines in the file) so loading triggers no repeated resizes.
+# Rows are streamed in chunks by 'package_loader.stream_packages', which returns the load statistics
+# (rows loaded, rows skipped, rows per second). None is returned if the file could not be loaded.
+def load_packages_into_hash(hashtable: HashTable, filename: str, size_hint: int = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> LoadStats:
     try:
-        with open(filename, newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            next(reader, None)
+        if hasattr(hashtable, 'reserve'):
+            if size_hint is None:
+                size_hint = count_data_rows(filename)
+            hashtable.reserve(len(hashtable) + size_hint)
 
-            for row in reader:
-                # Skip any empty rows
-                if not row:
-                    continue
-
-                # Ensure the row has the expected number of fields
-                if len(row) != 8:
-                    logging.warning(f"Skipping row {row}: does not have the expected number of values.")
-                    continue
-
-                package_id, address, city, state, zip_code, deadline, weight, notes = row
-
-                # Validate and convert package_id to integer
-                try:
-                    key = int(package_id)
-                except ValueError:
-                    print(f"Invalid package ID '{package_id}' encountered; skipping row.")
-                    continue
-
-                # Create a Package instance and store it in the hash table
-                package = Package(package_id, address, city, state, zip_code, deadline, weight, notes)
-                hashtable.set(key, package)
+        return stream_packages(filename, hashtable, chunk_size)
 
     except FileNotFoundError:
         logging.error(f"Error: The file '{filename}' was not found.")
     except Exception as e:
-        print(f"An error occurred while loading packages: {e}")
+        logging.error(f"An error occurred while loading packages: {e}")
+
 
+# The 'count_data_rows' function counts the lines after the header of a CSV file without parsing them.
+# It is a cheap upper bound on the number of rows, used to size hash tables before a bulk load.
+# The time complexity is O(n) in the file size, with constant memory.
+def count_data_rows(filename):
+    with open(filename, 'rb') as csvfile:
+        return max(sum(1 for _ in csvfile) - 1, 0)
 
-# The 'load_distance_data' function reads the distances from a CSV file and stores it into a list of lists.
-# This data structure is chosen because it can represent a 2D matrix well, allowing to store distances
-# between any two points in an easily accessible format. The time complexity for accessing an element
-# is O(1), which is very efficient.
+
+# The 'load_distance_data' function reads the distances from a CSV file and stores it into a DistanceMatrix.
+# The matrix is a dense, symmetric NumPy array, so both [i][j] and [j][i] are defined without a fallback,
+# and a whole row of distances can be read as a vector. The time complexity for accessing an element
+# is O(1), which is very efficient. Pairs the file does not define are filled with their shortest-path
+# distance over the defined legs, cached next to the file, so routing always gets a finite distance.
 def load_distance_data(filename):
-    distances = []
-    with open(filename, newline='') as csvfile:
-        reader = csv.reader(csvfile)
-        for row in reader:
-            distances.append([float(distance) if distance else None for distance in row])
+    distances = DistanceMatrix.from_csv(filename)
+    if not np.isfinite(distances.values).all():
+        distances = cached_closure(filename, distances).filled()
+        if not np.isfinite(distances.values).all():
+            logging.warning(f"Some addresses in '{filename}' cannot be reached from each other.")
     return distances
 
 
@@ -90,12 +95,13 @@ def check_package_status(hashtable, package_id, time):
 
 
 # The 'distance_between_addresses' function calculates the distance between two addresses given their IDs.
-# It uses list of tuples for address data and list of lists for distance data, both providing O(1) time
-# complexity for accessing elements. This function first finds the two addresses in the address data and
-# then uses their IDs to find the distance between them in the distance data.
+# It uses an AddressRegistry for address data and a DistanceMatrix (or list of lists) for distance data,
+# both providing O(1) time complexity for accessing elements. This function first finds the two addresses in
+# the address data and then uses their IDs to find the distance between them in the distance data.
 def distance_between_addresses(address_id_1, address_id_2, distance_data, address_data):
-    address_1 = next((address for address in address_data if address[0] == address_id_1), None)
-    address_2 = next((address for address in address_data if address[0] == address_id_2), None)
+    registry = AddressRegistry.wrap(address_data)
+    address_1 = registry.get(address_id_1)
+    address_2 = registry.get(address_id_2)
 
     if address_1 is None or address_2 is None:
         return None
@@ -105,55 +111,59 @@ def distance_between_addresses(address_id_1, address_id_2, distance_data, addres
     if distance is None:  # If the distance is None, try the reverse
         distance = distance_data[address_id_2][address_id_1]
 
-    if distance is None:  # if the distance is still None, warn and return None
+    if distance is None or math.isinf(distance):  # if the distance is still undefined, warn and return None
         print(f"Warning: Distance between {address_id_1} and {address_id_2} is not defined.")
         return address_1, address_2, None  # or you can return an error/exception here
 
-    return address_1, address_2, distance
+    return address_1, address_2, float(distance)
 
 
 # The 'calculate_return_trip' function calculates the return trip of a vehicle from its last delivery
-# address back to the depot. It uses lists for the addresses and distances, which allow for quick and
-# easy access to individual elements. This function first finds the indexes of the depot and last delivery
-# address, then uses these indexes to calculate the return distance. If a valid distance is found,
-# the function calculates the return time and updates the vehicle's current time and total distance.
-def calculate_return_trip(vehicle, last_package_address, depot_address, distances, addresses):
-    depot_address_index = None
-    last_package_address_index = None
-
-    # Find the address indexes
-    for address in addresses:
-        if address[2] == depot_address:
-            depot_address_index = address[0]
-        if address[2] == last_package_address:
-            last_package_address_index = address[0]
-        if depot_address_index is not None and last_package_address_index is not None:
-            break
+# address back to the depot. It uses the address registry and distance matrix, which allow for quick and
+# easy access to individual elements. This function first looks up the indexes of the depot and last delivery
+# address in the AddressRegistry, then uses these indexes to calculate the return distance. If a valid distance
+# is found, the function calculates the return time and updates the vehicle's current time and total distance.
+# When an EventLog is passed, the arrival back at the depot is recorded as a 'return' event.
+def calculate_return_trip(vehicle, last_package_address, depot_address, distances, addresses, event_log=None):
+    registry = AddressRegistry.wrap(addresses)
+    depot_address_index = registry.index_of(depot_address)
+    last_package_address_index = registry.index_of(last_package_address)
 
     _, _, return_distance = distance_between_addresses(last_package_address_index, depot_address_index, distances,
-                                                       addresses)
+                                                       registry)
 
     if return_distance is not None:  # if there is a valid distance
         return_time = datetime.timedelta(hours=return_distance / vehicle.velocity)
         vehicle.current_time += return_time
         vehicle.total_distance += return_distance
 
+    if event_log is not None:
+        event_log.record(RETURN, vehicle.id, None, depot_address_index, vehicle.current_time, vehicle.total_distance)
+
     return vehicle, vehicle.current_time
 
 
 # The 'extract_address' function extracts the address index of a given address from a list of addresses.
-# This function uses a list for the addresses, which allows for quick and easy access to individual elements.
-# The time complexity of this function is O(n) as it needs to traverse through the list to find the desired address.
+# When 'addresses' is an AddressRegistry the lookup is O(1) on average. A plain list of rows is indexed
+# first, which is O(n), so callers in a loop should build the registry once and pass it in.
 def extract_address(address, addresses):
-    for row in addresses:
-        if address in row[2]:
-            return int(row[0])
+    return AddressRegistry.wrap(addresses).index_of(address)
 
 
 # This is the core calculation function for the program. It takes in a vehicle, hashtable, addresses, and distances.
-# It first separates the packages into two lists based on their delivery deadlines. Then it delivers the packages.
-# This function is explained more throughout due to its complexity.
-def calculate_route(vehicle, hashtable, addresses, distances):
+# It first separates the packages into two lists based on their delivery deadlines, orders them and then delivers them.
+# This function is explained more throughout due to its complexity. When an EventLog is passed, the route is also
+# recorded as events: one 'load' per package and one 'depart' at the start time, then one 'deliver' per package.
+# When a route optimizer (see route_optimizer.RouteOptimizer) is passed, it improves the greedy order before driving.
+# With 'deadline_aware' the stops are instead ordered by time_windows.TimeWindowRouter, which checks every deadline.
+# A candidates.CandidateIndex of the distance matrix ('candidates') lets the nearest-stop search of long routes look
+# at the nearest addresses first; the route is the same as without it.
+def calculate_route(vehicle, hashtable, addresses, distances, event_log=None, optimizer=None, deadline_aware=False,
+                    candidates=None):
+    # The address registry is built once per route (or reused if the caller already has one) so that
+    # every lookup in the inner loop is O(1) instead of a scan over the address list.
+    addresses = AddressRegistry.wrap(addresses)
+
     # We use two lists to separate the packages with a deadline before EOD and those with a deadline of EOD
     # Time Complexity: O(N) for iterating over each package in vehicle.shipments
     not_delivered = []  # packages with a deadline before EOD
@@ -170,63 +180,119 @@ def calculate_route(vehicle, hashtable, addresses, distances):
     # Clearing list: O(1) time complexity
     vehicle.shipments.clear()
     total_distance = 0.0
+    route_start_time = vehicle.current_time
+    distances = DistanceMatrix.wrap(distances)
+    start_index = extract_address(vehicle.current_address, addresses)
+
+    # Define a helper function that orders one group of packages by nearest neighbour, starting at 'current_index'.
+    # Each step reads the row of distances from the current position and picks the nearest remaining
+    # parcel with a single vectorized argmin, so the function as a whole is O(N^2) array work with only
+    # O(N) Python-level steps. With a candidate index, groups larger than its neighbour lists are ordered by
+    # 'CandidateIndex.nearest_order' in O(N * k) instead. It returns the ordered packages and the last stop's index.
+    def order_packages(package_list, current_index):
+        # Registry lookups: O(1) average time complexity, done once per package instead of once per step
+        stop_indexes = np.array([extract_address(parcel.address, addresses) for parcel in package_list], dtype=np.intp)
+        if candidates is not None and len(package_list) > candidates.k:
+            order, current_index = candidates.nearest_order(distances, current_index, stop_indexes)
+            return [package_list[position] for position in order], current_index
+        ordered = []
 
-    # Define a helper function to deliver packages. It updates the total_distance as a side effect.
-    # Time complexity for the function as a whole is O(N^2) due to the nested loop
-    def deliver_packages(package_list):
-        nonlocal total_distance
         while len(package_list) > 0:  # O(N)
-            next_address = float('inf')
-            next_package = None
-
-            for parcel in package_list:  # O(N)
-                # Assuming both extract_address and distance_between_addresses functions have O(1) time complexity
-                vehicle_address = extract_address(vehicle.current_address, addresses)
-                package_address = extract_address(parcel.address, addresses)
-                distance = distance_between_addresses(vehicle_address, package_address, distances, addresses)[2]
-
-                if next_package:
-                    if next_package.departure_time is None:  # This is the first time the package is loaded
-                        next_package.departure_time = vehicle.current_time
-                    next_package.delivery_time = vehicle.current_time  # Updating the delivery time
-
-                if distance <= next_address:
-                    next_address = distance
-                    next_package = parcel
-
-            # Update the package status to "Enroute"
-            next_package.status = "Enroute"
-
-            # Appending and removing from list: O(1) time complexity
-            vehicle.shipments.append(next_package.package_id)
-            package_list.remove(next_package)  # Note: Removing an element from a list can be O(N) in worst case
-
-            distance_travelled = next_address if vehicle.current_address != next_package.address else 0
-
-            if distance_travelled > 0:
-                # Assuming timedelta operation has O(1) time complexity
-                delivery_time = datetime.timedelta(hours=distance_travelled / vehicle.velocity)
-                vehicle.current_time += delivery_time
-                total_distance += distance_travelled
+            candidate_distances = distances.row(current_index)[stop_indexes]  # O(N) vectorized gather
+
+            # Ties go to the last parcel in the list, as they did with the old '<=' comparison
+            nearest = len(candidate_distances) - 1 - int(np.argmin(candidate_distances[::-1]))
+            ordered.append(package_list.pop(nearest))  # O(N) in the worst case
+            current_index = int(stop_indexes[nearest])
+            stop_indexes = np.delete(stop_indexes, nearest)
+
+        return ordered, current_index
+
+    if deadline_aware:
+        # Deadline-aware mode: every stop is placed by cheapest insertion that keeps the deadlines (checked in O(1)
+        # per candidate with forward slack), and local search is only kept when it makes no package later
+        route = not_delivered + eod_delivered
+        stop_indexes = [extract_address(package.address, addresses) for package in route]
+        deadlines = [deadline_minutes(package.deadline) for package in route]
+        start_minutes = route_start_time.total_seconds() / 60
+        router = TimeWindowRouter(distances, vehicle.velocity)
+        order = router.build(start_index, start_minutes, stop_indexes, deadlines).order
+
+        def lateness(visiting_order):
+            return router.lateness(start_index, start_minutes, [stop_indexes[position] for position in visiting_order],
+                                   [deadlines[position] for position in visiting_order])
+
+        if optimizer is not None and len(route) > 2:
+            result = optimizer.improve(start_index, [stop_indexes[position] for position in order], distances)
+            improved = [order[position] for position in result.order]
+            if lateness(improved) <= lateness(order):
+                order = improved
+        route = [route[position] for position in order]
+    else:
+        # Build the route: the packages with a deadline go first, then the EOD packages continue from the last
+        # stop. Function calls: O(N^2) each due to the time complexity of order_packages
+        priority_route, last_index = order_packages(not_delivered, start_index)
+        eod_route, _ = order_packages(eod_delivered, last_index)
+        route = priority_route + eod_route
+
+        # An optional optimizer improves the greedy route with local search. It may reorder packages within
+        # each group but never moves an EOD package ahead of a package with a deadline.
+        if optimizer is not None and len(route) > 2:
+            stop_indexes = [extract_address(package.address, addresses) for package in route]
+            result = optimizer.improve(start_index, stop_indexes, distances, [len(priority_route), len(eod_route)])
+            route = [route[position] for position in result.order]
+
+    if event_log is not None:
+        for package in route:
+            event_log.record(LOAD, vehicle.id, int(package.package_id), start_index, route_start_time, 0.0)
+        event_log.record(DEPART, vehicle.id, None, start_index, route_start_time, 0.0)
+
+    # Drive the route: O(N). Each leg updates the vehicle's time and mileage and the package's timestamps.
+    current_index = start_index
+    for next_package in route:
+        stop_index = extract_address(next_package.address, addresses)
+
+        # Update the package status to "Enroute"
+        next_package.status = "Enroute"
+        vehicle.shipments.append(next_package.package_id)
+        if next_package.departure_time is None:  # This is the first time the package is loaded
+            next_package.departure_time = route_start_time
+
+        if vehicle.current_address != next_package.address:
+            distance_travelled = distances.distance(current_index, stop_index)
+        else:
+            distance_travelled = 0
 
-                # Update the package status to "Delivered"
-                next_package.status = "Delivered"
-                next_package.delivered = True
+        if distance_travelled > 0:
+            # Assuming timedelta operation has O(1) time complexity
+            delivery_time = datetime.timedelta(hours=distance_travelled / vehicle.velocity)
+            vehicle.current_time += delivery_time
+            total_distance += distance_travelled
 
-            # print("Vehicle {} delivered package {} to {} at {}. Distance traveled: {}".format(
-            #     vehicle.id, next_package.package_id, next_package.address, vehicle.current_time, distance_travelled))
+        # Update the package status to "Delivered"
+        next_package.status = "Delivered"
+        next_package.delivered = True
+        next_package.delivery_time = vehicle.current_time
+        if event_log is not None:
+            event_log.record(DELIVER, vehicle.id, int(next_package.package_id), stop_index, vehicle.current_time,
+                             total_distance)
 
-            vehicle.current_address = next_package.address
+        # print("Vehicle {} delivered package {} to {} at {}. Distance traveled: {}".format(
+        #     vehicle.id, next_package.package_id, next_package.address, vehicle.current_time, distance_travelled))
 
-    # Function calls: O(N^2) each due to the time complexity of deliver_packages function
-    deliver_packages(not_delivered)
-    deliver_packages(eod_delivered)
+        vehicle.current_address = next_package.address
+        current_index = stop_index
 
     # Assignment: O(1) time complexity
     vehicle.total_distance = total_distance
     return vehicle, total_distance
 
 
+# The 'time_delta' function converts a datetime to the timedelta since midnight used for vehicle times.
+def time_delta(time_obj):
+    return datetime.timedelta(hours=time_obj.hour, minutes=time_obj.minute, seconds=time_obj.second)
+
+
 def get_delivery_details(package):
     # Prints out delivery details for a specific package
     keys = ["Package ID", "Address", "City", "State", "Zip Code", "Deadline",
@@ -244,10 +310,56 @@ def get_delivery_details(package):
     return details
 
 
+# The 'mileage_summary' function returns the lines of the mileage screen: each vehicle's shipments, ending time and
+# distance (from its last event), then the total route distance. With 'depot_distances' ({depot address: route
+# distance}) from a plan over several depots, each depot's total is listed before the overall total.
+def mileage_summary(vehicles, total_distance, event_log, depot_distances=None):
+    lines = []
+    for vehicle in vehicles:
+        last_event = event_log.vehicle_events(vehicle.id)[-1]
+        lines.append(f"Vehicle {vehicle.id} shipments: {vehicle.shipments}")
+        lines.append(f"Vehicle {vehicle.id} ending time: {last_event.time}")
+        lines.append(f"Vehicle {vehicle.id} total distance: {last_event.mileage}")
+    if depot_distances and len(depot_distances) > 1:
+        for depot_address, distance in depot_distances.items():
+            vehicle_ids = [vehicle.id for vehicle in vehicles if vehicle.depot_address == depot_address]
+            lines.append(f"Depot {depot_address} (vehicles {vehicle_ids}) distance: {round(distance, 1)}")
+    lines.append(f"Total distance traveled: {round(total_distance, 1)}")
+    return lines
+
+
+# The 'plan_deliveries' function creates the three vehicles of PROJECT_FLEET (see vehicle.py) with their shipments
+# and computes their routes with a FleetPlanner, returning the vehicles with the total route distance. Vehicles 1
+# and 2 are independent and return to the depot; vehicle 3 leaves when the first of them is back. With 'workers' > 1
+# the independent routes are computed in parallel processes. 'optimizer' and 'deadline_aware' are passed on to
+# 'calculate_route', and so is 'candidates' (see candidates.candidate_index). With 'assign' the shipment lists are
+# not the hand-made ones but are computed from the package notes by the AssignmentSolver (the wrong address of
+# package 9 is corrected at 10:20).
+def plan_deliveries(ht, addresses, distances, event_log=None, optimizer=None, workers=1, assign=False,
+                    deadline_aware=False, candidates=None):
+    depot_address = "4001 South 700 East"
+    planner = FleetPlanner(ht, addresses, distances, depot_address, workers, optimizer, deadline_aware, candidates)
+
+    vehicles = [Vehicle(entry.id, entry.max_load, entry.velocity, None, list(entry.shipments), 0.0,
+                        entry.departure_time, depot_address) for entry in PROJECT_FLEET]
+    if assign:
+        AssignmentSolver(ht, addresses, distances, depot_address,
+                         address_correction_time=datetime.timedelta(hours=10, minutes=20), optimizer=optimizer,
+                         deadline_aware=deadline_aware).solve(vehicles, start_after={entry.id: entry.start_after
+                                                                                    for entry in PROJECT_FLEET})
+
+    for vehicle, entry in zip(vehicles, PROJECT_FLEET):
+        planner.add_vehicle(vehicle, start_after=entry.start_after, return_to_depot=entry.return_to_depot)
+
+    return planner.plan(event_log)
+
+
 # The 'main' function is the entry point of the program. This function orchestrates the whole process
 # of loading the package and distance data, initializing the vehicles, calculating the routes,
-# and printing out the results. It uses a hashtable for storing package data and lists for storing
-# addresses and distances.
+# and printing out the results. It uses a hashtable for storing package data, an AddressRegistry for
+# O(1) address lookups and a DistanceMatrix for the distances. The data is read from a memory-mapped binary
+# snapshot of the CSVs, which is rebuilt whenever a CSV is newer than it, and the routes come from the plan cache
+# when the data and fleet have not changed since they were last planned.
 def main():
     print("Welcome to the delivery routing system.")
     print("Please select an option:")
@@ -255,39 +367,27 @@ def main():
     print("2: Show delivery details including mileage.")
     print("3: Close the program.")
 
+    # The CSVs are only parsed when the binary snapshot is missing or older than them
     ht = HashTable()
-    distances = load_distance_data('Data/Distances.csv')
-    load_packages_into_hash(ht, 'Data/Packages.csv')
-    addresses = load_address_data('Data/Addresses.csv')
-
-    vehicle1 = Vehicle(1, 16, 18, None, [15, 37, 31, 16, 29, 34, 40, 14, 1, 13, 20, 30], 0.0,
-                       datetime.timedelta(hours=8), "4001 South 700 East")
-
-    vehicle2 = Vehicle(2, 16, 18, None, [6, 18, 22, 21, 35, 36, 26, 19, 3, 39, 17, 12, 27, 38, 24, 23], 0.0,
-                       datetime.timedelta(hours=10, minutes=20), "4001 South 700 East")
-
-    vehicle3 = Vehicle(3, 16, 18, None, [10, 11, 5, 33, 4, 32, 25, 9, 8, 7, 28, 6, 2], 0.0,
-                       datetime.timedelta(hours=9, minutes=5), "4001 South 700 East")
-
-    vehicle1, distance1 = calculate_route(vehicle1, ht, addresses, distances)
-    vehicle2, distance2 = calculate_route(vehicle2, ht, addresses, distances)
-
-    depot_address = "4001 South 700 East"
-
-    vehicle1, return_time1 = calculate_return_trip(vehicle1, vehicle1.current_address, depot_address, distances,
-                                                   addresses)
-    vehicle2, return_time2 = calculate_return_trip(vehicle2, vehicle2.current_address, depot_address, distances,
-                                                   addresses)
-
-    if return_time1 <= return_time2:
-        vehicle3.start_time = return_time1
-        vehicle3.current_time = return_time1
+    distances, addresses = load_data(ht, 'Data/Distances.csv', 'Data/Addresses.csv', 'Data/Packages.csv',
+                                     'Data/project.snapshot')
+
+    # Every load, departure, delivery and return is recorded here for the status and mileage screens. A plan made
+    # before from the same data and fleet is loaded from the plan cache instead of routing the trucks again.
+    event_log = EventLog()
+    plans = PlanCache()
+    key = plan_key({"distances": 'Data/Distances.csv', "addresses": 'Data/Addresses.csv',
+                    "packages": 'Data/Packages.csv'}, PROJECT_FLEET, DEFAULT_OPTIONS)
+    record = plans.get(key)
+    if record is None:
+        (vehicle1, vehicle2, vehicle3), total_distance = plan_deliveries(ht, addresses, distances, event_log)
+        plans.put(key, plan_record([vehicle1, vehicle2, vehicle3], total_distance, ht, event_log, DEFAULT_OPTIONS,
+                                   [package.package_id for package in late_packages(ht)]))
     else:
-        vehicle3.start_time = return_time2
-        vehicle3.current_time = return_time2
+        (vehicle1, vehicle2, vehicle3), total_distance = restore_plan(record, ht, event_log)
 
-    vehicle3, distance3 = calculate_route(vehicle3, ht, addresses, distances)
-    total_distance = distance1 + distance2 + distance3
+    # The routes are fixed from here on, so the departure/delivery times are copied once into a status board
+    status_board = StatusBoard.from_event_log(event_log, ht)
 
     while True:
         user_input = (input("Your choice: "))
@@ -301,23 +401,28 @@ def main():
 
                 if package_option == '2':
                     first_package = True  # Flag to track the first package
-                    for bucket in ht.table:
-                        for package_id, package in bucket:
-                            if not first_package:
-                                print()  # Print an empty line between packages
-                            else:
-                                first_package = False
-                            print(get_delivery_details(package))
-                            print("Status at {}: {}".format(time_obj.time(),
-                                                            check_package_status(ht, package_id, time_obj)))
+                    # One vectorized query answers the status of every package: O(n) array work
+                    statuses = status_board.statuses(time_obj)
+                    for package_id, status in zip(status_board.package_ids.tolist(), statuses):
+                        if not first_package:
+                            print()  # Print an empty line between packages
+                        else:
+                            first_package = False
+                        package = ht.get(package_id)
+                        package.status = status
+                        print(get_delivery_details(package))
+                        print("Status at {}: {}".format(time_obj.time(), status))
+                    # Binary search over the event log: O(V log n)
+                    print("Total mileage at {}: {}".format(
+                        time_obj.time(), round(event_log.total_mileage_at(time_delta(time_obj)), 1)))
 
                 elif package_option == '1':
                     package_id = int(input("Please enter a package id: "))
                     package = ht.get(package_id)
                     if package:
+                        package.status = status_board.status_of(package_id, time_obj)
                         print(get_delivery_details(package))
-                        print(
-                            "Status at {}: {}".format(time_obj.time(), check_package_status(ht, package_id, time_obj)))
+                        print("Status at {}: {}".format(time_obj.time(), package.status))
                     else:
                         print("Package not found.")
                 else:
@@ -326,11 +431,11 @@ def main():
                 print("Invalid time format. Please enter a valid time (HH:MM:SS).")
 
         elif user_input == "2":
-            for vehicle in [vehicle1, vehicle2, vehicle3]:
-                print(f"Vehicle {vehicle.id} shipments: {vehicle.shipments}")
-                print(f"Vehicle {vehicle.id} ending time: {vehicle.current_time}")
-                print(f"Vehicle {vehicle.id} total distance: {vehicle.total_distance}")
-            print(f"Total distance traveled: {round(total_distance, 1)}")
+            for line in mileage_summary([vehicle1, vehicle2, vehicle3], total_distance, event_log):
+                print(line)
+            late = late_packages(ht)
+            print("Late packages: " + (", ".join(f"{package.package_id} (delivered {package.delivery_time}, "
+                                                 f"deadline {package.deadline})" for package in late) or "none"))
 
         elif user_input == "3":
             print("Closing the program.")
@@ -0,0 +1,105 @@
+# The 'package_loader' module streams a Packages.csv-format manifest in fixed-size chunks.
+# Rows are read lazily through a generator, validated the same way 'load_packages_into_hash' always has
+# (8 fields and an integer package ID), turned into Package objects one chunk at a time and handed to a
+# sink. Only one chunk is held in memory by the loader, so files larger than RAM can be streamed into a
+# callback, and loading reports its throughput and skipped rows through a LoadStats object and logging.
+import csv
+import logging
+import time
+
+from package import Package
+
+EXPECTED_FIELDS = 8
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+# The 'LoadStats' class collects the counters of one load: rows loaded, rows skipped and elapsed time.
+class LoadStats:
+    def __init__(self):
+        self.rows_loaded = 0
+        self.rows_skipped = 0
+        self.chunks = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows_loaded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return (f"Loaded {self.rows_loaded} rows in {self.chunks} chunks ({self.rows_per_second:,.0f} rows/s), "
+                f"skipped {self.rows_skipped} rows, {self.elapsed:.3f} s")
+
+
+# The 'iter_package_rows' generator yields lists of up to 'chunk_size' validated (package_id, row) pairs.
+# Empty rows are ignored; rows with the wrong number of fields or a non-integer ID are counted in
+# 'stats' and logged at debug level. The time complexity is O(n) and the memory use is O(chunk_size).
+def iter_package_rows(filename, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+    if stats is None:
+        stats = LoadStats()
+
+    with open(filename, newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+
+        chunk = []
+        for row in reader:
+            # Skip any empty rows
+            if not row:
+                continue
+
+            # Ensure the row has the expected number of fields
+            if len(row) != EXPECTED_FIELDS:
+                stats.rows_skipped += 1
+                logging.debug(f"Skipping row {row}: does not have the expected number of values.")
+                continue
+
+            # Validate and convert package_id to integer
+            try:
+                key = int(row[0])
+            except ValueError:
+                stats.rows_skipped += 1
+                logging.debug(f"Invalid package ID '{row[0]}' encountered; skipping row.")
+                continue
+
+            chunk.append((key, row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+# The 'iter_package_chunks' generator turns each chunk of validated rows into (package_id, Package) pairs.
+def iter_package_chunks(filename, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+    for chunk in iter_package_rows(filename, chunk_size, stats):
+        yield [(key, Package(*row)) for key, row in chunk]
+
+
+# The 'stream_packages' function loads a manifest chunk by chunk into a sink and returns its LoadStats.
+# The sink is either a callable, which receives each list of (package_id, Package) pairs, or a hash table,
+# which is filled with 'update' when it has one and with 'set' otherwise.
+# The time complexity is O(n); the loader itself holds at most one chunk in memory.
+def stream_packages(filename, sink, chunk_size=DEFAULT_CHUNK_SIZE):
+    stats = LoadStats()
+    start = time.perf_counter()
+
+    if callable(sink):
+        consume = sink
+    elif hasattr(sink, 'update'):
+        consume = sink.update
+    else:
+        def consume(chunk):
+            for key, package in chunk:
+                sink.set(key, package)
+
+    for chunk in iter_package_chunks(filename, chunk_size, stats):
+        consume(chunk)
+        stats.rows_loaded += len(chunk)
+        stats.chunks += 1
+
+    stats.elapsed = time.perf_counter() - start
+    if stats.rows_skipped:
+        logging.warning(f"Skipped {stats.rows_skipped} invalid rows while loading '{filename}'.")
+    logging.info(str(stats))
+    return stats
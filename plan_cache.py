@@ -0,0 +1,216 @@
+# The 'PlanCache' class keeps computed delivery plans on disk so that a run with the same inputs does not route the
+# trucks again. A plan is stored as a JSON record (each truck's shipments, times and mileage, every package's
+# departure and delivery time, the late packages and every event) under a key that is the SHA-256 of the normalized
+# inputs: the content of the three data files, the fleet description and the planning options. Data files are
+# normalized before hashing (line endings, trailing spaces and blank lines do not count), so only a real change in
+# the data gives a new key. Each record is one file in the cache directory; when the files add up to more than
+# 'max_bytes', the least recently used are deleted. The module only needs the standard library, so looking a plan
+# up costs milliseconds.
+import datetime
+import hashlib
+import json
+import logging
+import os
+
+from event_log import EventLog
+from vehicle import Vehicle
+
+CACHE_VERSION = 3
+DEFAULT_DIRECTORY = "Data/plans"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_OPTIONS = {"optimize": False, "deadline_aware": False, "assign": False, "candidates": False}
+PACKAGE_FIELDS = ["package_id", "address", "city", "state", "zip_code", "deadline", "weight", "notes"]
+
+
+# The 'content_digest' function returns the SHA-256 of a text file's content with line endings, trailing spaces
+# and blank lines normalized away. The time complexity is O(n) in the file size, with constant memory.
+def content_digest(filename):
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for line in file:
+            line = line.rstrip()
+            if line:
+                digest.update(line + b"\n")
+    return digest.hexdigest()
+
+
+def _normalize(value):
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    return value
+
+
+# The 'plan_key' function returns the cache key of a plan: the SHA-256 of the data files' normalized content,
+# the fleet (a sequence of vehicle.FleetEntry) and the planning options, written as canonical JSON. O(n).
+def plan_key(data_files, fleet, options):
+    inputs = {"version": CACHE_VERSION,
+              "data": {name: content_digest(filename) for name, filename in sorted(data_files.items())},
+              "fleet": [_normalize(tuple(entry)) for entry in fleet],
+              "options": _normalize(options)}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def _time_text(value):
+    return None if value is None else str(value)
+
+
+# The 'parse_time' function reads a time written by the cache ("H:MM:SS", possibly with fractional seconds).
+def parse_time(text):
+    if text is None:
+        return None
+    hours, minutes, seconds = text.split(":")
+    return datetime.timedelta(hours=int(hours), minutes=int(minutes), seconds=float(seconds))
+
+
+# The 'plan_record' function turns a computed plan into a JSON-ready record: the options, each vehicle's shipments,
+# start and end time and mileage, every package with its departure and delivery time as set on the package, the
+# 'late' package IDs and every event in 'event_log'. The time complexity is O(n + e).
+def plan_record(vehicles, total_distance, hashtable, event_log, options=None, late=()):
+    vehicle_records = []
+    for vehicle in vehicles:
+        events = event_log.vehicle_events(vehicle.id)
+        vehicle_records.append({"vehicle_id": vehicle.id, "max_load": vehicle.max_load, "velocity": vehicle.velocity,
+                                "address": vehicle.current_address, "depot": vehicle.depot_address,
+                                "shipments": [int(key) for key in vehicle.shipments],
+                                "start_time": _time_text(events[0].time if events else None),
+                                "end_time": _time_text(events[-1].time if events else None),
+                                "total_distance": round(events[-1].mileage, 1) if events else 0.0})
+    packages = []
+    for key, package in sorted(hashtable.items()):
+        record = {field: getattr(package, field) for field in PACKAGE_FIELDS}
+        record.update(package_id=key, departure_time=_time_text(package.departure_time),
+                      delivery_time=_time_text(package.delivery_time))
+        packages.append(record)
+
+    return {"version": CACHE_VERSION, "options": dict(options or {}), "total_distance": round(total_distance, 1),
+            "vehicles": vehicle_records, "packages": packages, "late_packages": list(late),
+            "events": [{"time": _time_text(event.time), "kind": event.kind, "vehicle_id": event.vehicle_id,
+                        "package_id": event.package_id, "address_index": event.address_index,
+                        "mileage": event.mileage} for event in event_log]}
+
+
+# The 'restore_plan' function applies a cached record without routing: it sets the departure and delivery times
+# of the packages in 'hashtable', replays the events into 'event_log' when one is given and returns
+# (vehicles, total distance) like 'plan_deliveries'. The time complexity is O(n + e log e).
+def restore_plan(record, hashtable, event_log=None):
+    for package_record in record["packages"]:
+        package = hashtable.get(package_record["package_id"])
+        if package is None:
+            continue
+        package.departure_time = parse_time(package_record["departure_time"])
+        package.delivery_time = parse_time(package_record["delivery_time"])
+        if package.delivery_time is not None:
+            package.status = "Delivered"
+            package.delivered = True
+
+    if event_log is not None:
+        record_event_log(record, event_log)
+
+    vehicles = []
+    for vehicle_record in record["vehicles"]:
+        # Like a planned vehicle, the shipments are the packages' own (string) IDs
+        shipments = [hashtable.get(key).package_id if key in hashtable else str(key)
+                     for key in vehicle_record["shipments"]]
+        vehicle = Vehicle(vehicle_record["vehicle_id"], vehicle_record["max_load"], vehicle_record["velocity"], None,
+                          shipments, 0.0, parse_time(vehicle_record["start_time"]), vehicle_record["address"],
+                          vehicle_record.get("depot"))
+        vehicle.current_time = parse_time(vehicle_record["end_time"])
+        vehicle.total_distance = vehicle_record["total_distance"]
+        vehicles.append(vehicle)
+    return vehicles, record["total_distance"]
+
+
+# The 'record_event_log' function replays a cached record's events into 'event_log' (a new EventLog by default)
+# and returns it. The time complexity is O(e log e).
+def record_event_log(record, event_log=None):
+    if event_log is None:
+        event_log = EventLog()
+    for event in record["events"]:
+        event_log.record(event["kind"], event["vehicle_id"], event["package_id"], event["address_index"],
+                         parse_time(event["time"]), event["mileage"])
+    return event_log
+
+
+class PlanCache:
+    # The __init__ method opens (and creates if needed) the cache directory. 'max_bytes' bounds the total size of
+    # the stored plans.
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    # The 'get' method returns the record stored under 'key', or None. A hit marks the entry as recently used.
+    # An unreadable entry is deleted and reported as a miss. The time complexity is O(size of the record).
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as file:
+                record = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Discarding unreadable cached plan '{path}': {e}")
+            self._remove(path)
+            return None
+        if record.get("version") != CACHE_VERSION:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return record
+
+    # The 'put' method stores 'record' under 'key' (written next to its final name and moved into place, so a
+    # reader never sees half a plan), then evicts old entries. The time complexity is O(size + entries).
+    def put(self, key, record):
+        path = self._path(key)
+        temporary = f"{path}.tmp{os.getpid()}"
+        with open(temporary, "w") as file:
+            json.dump(record, file)
+        os.replace(temporary, path)
+        self.evict(keep=path)
+
+    # The 'evict' method deletes the least recently used entries until the cache fits in 'max_bytes'. The entry
+    # at 'keep' (the one just written) is never deleted. The time complexity is O(k log k) for k entries.
+    def evict(self, keep=None):
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def keys(self):
+        return [name[:-len(".json")] for name in os.listdir(self.directory) if name.endswith(".json")]
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def __len__(self):
+        return len(self.keys())
@@ -0,0 +1,244 @@
+# The 'RouteOptimizer' class improves a constructed route with 2-opt and Or-opt local search.
+# A route is a path that starts at a fixed address (the depot or the vehicle's position), visits every stop
+# once and either ends at the last stop or, when an end address is given, at that fixed address. The stops are
+# split into consecutive groups (packages with a deadline, then EOD packages) and moves are only applied inside a
+# group, so the deadline group always stays ahead of the EOD group.
+# Every move is evaluated by its change in length (delta evaluation) rather than by re-measuring the route,
+# and the candidate moves for one position are scored together with NumPy. A time budget and an iteration
+# cap bound the search so it fits the dispatch schedule. With a candidates.CandidateIndex only the moves that
+# create an edge to one of a stop's nearest addresses are scored, so a pass costs O(n * k) instead of O(n^2).
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from distance_matrix import DistanceMatrix
+
+# Moves must shorten the route by more than this to be applied; it stops floating-point noise from cycling.
+EPSILON = 1e-9
+
+OptimizationResult = namedtuple("OptimizationResult",
+                                ["order", "initial_distance", "final_distance", "iterations", "elapsed"])
+
+
+# The 'path_length' function returns the length of an open path of address indexes. O(n).
+def path_length(path, distances):
+    path = np.asarray(path, dtype=np.intp)
+    if len(path) < 2:
+        return 0.0
+    return float(distances.values[path[:-1], path[1:]].sum())
+
+
+# The _candidate_links function lists, for every entry of the initial path, the path entries at the addresses of
+# its candidates, in compressed form: those of entry p are links[starts[p]:starts[p + 1]]. Entries keep their
+# number when the path is reordered (it is their value in 'order' plus one). The time complexity is
+# O(n k log n + m) for m links.
+def _candidate_links(path, candidates):
+    by_address = np.argsort(path, kind='stable')
+    ranked = path[by_address]
+    near = candidates.neighbors[path].ravel()
+    left = np.searchsorted(ranked, near, 'left')
+    counts = np.searchsorted(ranked, near, 'right') - left
+    offsets = np.cumsum(counts) - counts
+    links = by_address[np.repeat(left - offsets, counts) + np.arange(counts.sum())]
+    starts = np.concatenate(([0], np.cumsum(counts.reshape(len(path), -1).sum(axis=1))))
+    return starts, links
+
+
+class RouteOptimizer:
+    # The __init__ method stores the search limits: 'time_budget' in seconds, 'max_iterations' full passes
+    # over the route, and the longest segment Or-opt may move. 'candidates' is an optional CandidateIndex of the
+    # distance matrix the routes use.
+    def __init__(self, time_budget=1.0, max_iterations=100, or_opt_segment=3, candidates=None):
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.or_opt_segment = or_opt_segment
+        self.candidates = candidates
+
+    # The 'improve' method returns an OptimizationResult whose 'order' lists the positions of 'stop_indexes'
+    # in their improved visiting order. 'group_sizes' splits the stops into consecutive groups that keep
+    # their relative order (by default all stops form one group). When 'end_index' is given the route is
+    # closed there (for example back at the depot) and that last leg is optimized too.
+    # Each pass is O(n^2) vectorized work, or O(n * k) with a candidate index.
+    def improve(self, start_index, stop_indexes, distances, group_sizes=None, end_index=None):
+        started = time.perf_counter()
+        distances = DistanceMatrix.wrap(distances)
+        values = distances.values
+
+        ends = [] if end_index is None else [end_index]
+        path = np.array([start_index] + list(stop_indexes) + ends, dtype=np.intp)
+        order = np.arange(-1, len(path) - 1, dtype=np.intp)  # order[p] is the stop at path position p
+        if group_sizes is None:
+            group_sizes = [len(stop_indexes)]
+
+        bounds = []
+        low = 1
+        for size in group_sizes:
+            if size > 1:
+                bounds.append((low, low + size))
+            low += size
+
+        initial_distance = path_length(path, distances)
+        deadline = started + self.time_budget
+        iterations = 0
+        improved = True
+        search = None
+        if self.candidates is not None:
+            # The candidate links of every path entry, and where each entry is now (by entry number)
+            search = _candidate_links(path, self.candidates) + (np.arange(len(path)),)
+
+        while improved and iterations < self.max_iterations and time.perf_counter() < deadline:
+            improved = False
+            for low, high in bounds:
+                if search is None:
+                    if self._two_opt(values, path, order, low, high, deadline):
+                        improved = True
+                elif self._two_opt_candidates(values, path, order, low, high, deadline, search):
+                    improved = True
+                if self._or_opt(values, path, order, low, high, deadline, search):
+                    improved = True
+            iterations += 1
+
+        return OptimizationResult(order[1:len(stop_indexes) + 1].tolist(), initial_distance,
+                                  path_length(path, distances), iterations, time.perf_counter() - started)
+
+    # The _two_opt method reverses path[i..j] whenever that shortens the route, for positions inside
+    # [low, high). For each i, every j is scored at once:
+    #   delta = d(a, c) - d(a, b) + d(b, e) - d(c, e)
+    # where a = path[i-1], b = path[i], c = path[j], e = path[j+1] (no e at the open end of the route).
+    # The time complexity of one pass is O(n^2) vectorized work.
+    def _two_opt(self, values, path, order, low, high, deadline):
+        last = len(path) - 1
+        improved = False
+        for i in range(low, high - 1):
+            if time.perf_counter() > deadline:
+                break
+            a, b = path[i - 1], path[i]
+            js = np.arange(i + 1, high)
+            cs = path[js]
+            has_next = js < last
+            es = path[np.minimum(js + 1, last)]
+            delta = values[a, cs] - values[a, b] + np.where(has_next, values[b, es] - values[cs, es], 0.0)
+
+            best = int(np.argmin(delta))
+            if delta[best] < -EPSILON:
+                j = int(js[best])
+                path[i:j + 1] = path[i:j + 1][::-1].copy()
+                order[i:j + 1] = order[i:j + 1][::-1].copy()
+                improved = True
+        return improved
+
+    # The _two_opt_candidates method is _two_opt restricted to the moves whose new edge (a, c) or (b, e) joins a
+    # stop to one of its candidates; every j is scored when no candidate lies ahead of i in the group. 'search'
+    # holds the candidate links and the position of every entry. The time complexity of one pass is O(n * k)
+    # vectorized work plus the length of every reversed segment.
+    def _two_opt_candidates(self, values, path, order, low, high, deadline, search):
+        starts, links, where = search
+        last = len(path) - 1
+        improved = False
+        for i in range(low, high - 1):
+            if time.perf_counter() > deadline:
+                break
+            a, b = path[i - 1], path[i]
+            before, entry = order[i - 1] + 1, order[i] + 1
+            js = np.concatenate((where[links[starts[before]:starts[before + 1]]],
+                                 where[links[starts[entry]:starts[entry + 1]]] - 1))
+            js = js[(js > i) & (js < high)]
+            if len(js) == 0:
+                js = np.arange(i + 1, high)
+            cs = path[js]
+            has_next = js < last
+            es = path[np.minimum(js + 1, last)]
+            delta = values[a, cs] - values[a, b] + np.where(has_next, values[b, es] - values[cs, es], 0.0)
+
+            best = int(np.argmin(delta))
+            if delta[best] < -EPSILON:
+                j = int(js[best])
+                path[i:j + 1] = path[i:j + 1][::-1].copy()
+                order[i:j + 1] = order[i:j + 1][::-1].copy()
+                where[order[i:j + 1] + 1] = np.arange(i, j + 1)
+                improved = True
+        return improved
+
+    # The _or_opt method moves a segment of 1 to 'or_opt_segment' stops, forwards or reversed, to the best
+    # other position inside [low, high). Removing the segment saves
+    #   d(prev, s0) + d(sL, next) - d(prev, next)
+    # and inserting it between u and w costs d(u, s0) + d(sL, w) - d(u, w); every insertion point is scored
+    # at once. With candidate links in 'search' only the points next to a candidate of s0 or sL are scored
+    # (every point when there is none in the group). The time complexity of one pass is O(n^2 * L) vectorized
+    # work, or O(n * k * L) plus O(n) for every applied move with candidates.
+    def _or_opt(self, values, path, order, low, high, deadline, search=None):
+        improved = False
+        for length in range(1, self.or_opt_segment + 1):
+            i = low
+            while i + length <= high:
+                if time.perf_counter() > deadline:
+                    return improved
+                if search is None:
+                    moved = self._move_segment(values, path, order, low, high, i, length)
+                else:
+                    moved = self._move_segment_candidates(values, path, order, low, high, i, length, search)
+                if moved:
+                    improved = True
+                else:
+                    i += 1
+        return improved
+
+    # The _move_segment_candidates method is _move_segment restricted to the slots right before or after a
+    # candidate of either end of the segment (a position after the segment moves back by 'length' once the segment
+    # is taken out), or to every slot when there is none in the group. It keeps the positions in 'search' current.
+    def _move_segment_candidates(self, values, path, order, low, high, i, length, search):
+        starts, links, where = search
+        end = i + length - 1
+        first, final = order[i] + 1, order[end] + 1
+        near = where[np.concatenate((links[starts[first]:starts[first + 1]],
+                                     links[starts[final]:starts[final + 1]]))]
+        near = near[(near < i) | (near > end)]
+        near = np.where(near > end, near - length, near)
+        slots = np.concatenate((near, near + 1))
+        slots = slots[(slots >= low) & (slots <= high - length) & (slots != i)]
+        if not self._move_segment(values, path, order, low, high, i, length, slots if len(slots) else None):
+            return False
+        where[order + 1] = np.arange(len(path))
+        return True
+
+    def _move_segment(self, values, path, order, low, high, i, length, slots=None):
+        last = len(path) - 1
+        end = i + length - 1
+        first, final = path[i], path[end]
+        previous = path[i - 1]
+        removal = values[previous, first]
+        if end < last:
+            following = path[end + 1]
+            removal += values[final, following] - values[previous, following]
+
+        # The route with the segment taken out; the group now spans [low, high - length)
+        rest = np.concatenate((path[:i], path[end + 1:]))
+        if slots is None:
+            slots = np.arange(low, high - length + 1)  # insert between rest[t - 1] and rest[t]
+        slots = slots[slots != i]
+        if len(slots) == 0:
+            return False
+        us = rest[slots - 1]
+        has_next = slots < len(rest)
+        ws = rest[np.minimum(slots, len(rest) - 1)]
+
+        forward = values[us, first] + np.where(has_next, values[final, ws] - values[us, ws], 0.0)
+        backward = values[us, final] + np.where(has_next, values[first, ws] - values[us, ws], 0.0)
+        reverse = backward < forward
+        insertion = np.where(reverse, backward, forward)
+
+        best = int(np.argmin(insertion))
+        if insertion[best] - removal >= -EPSILON:
+            return False
+
+        t = int(slots[best])
+        segment_path = path[i:end + 1].copy()
+        segment_order = order[i:end + 1].copy()
+        if reverse[best]:
+            segment_path, segment_order = segment_path[::-1], segment_order[::-1]
+
+        rest_order = np.concatenate((order[:i], order[end + 1:]))
+        path[:] = np.concatenate((rest[:t], segment_path, rest[t:]))
+        order[:] = np.concatenate((rest_order[:t], segment_order, rest_order[t:]))
+        return True
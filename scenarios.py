@@ -0,0 +1,307 @@
+# The 'scenarios' module runs what-if fleet plans in batch, without the interactive menu. A scenario file (JSON or
+# CSV) lists scenarios such as "add a 4th truck" or "leave at 8:30": the number of trucks and drivers, each
+# truck's speed, departure time and load capacity, and optionally a different package manifest. Every scenario
+# runs the whole pipeline on a fresh copy of the packages: the AssignmentSolver splits the packages across the
+# trucks, then a FleetPlanner drives each route with 'calculate_route' and 'calculate_return_trip'. Each driver is
+# a separate resource: a truck beyond the number of drivers is chained to the truck whose driver is back first
+# (a heap of the drivers' return times) and leaves when that truck is back at the depot, like truck 3 in 'main',
+# so no more trucks are on the road than there are drivers.
+# The distance table, addresses and manifests are loaded once per process and shared by all of its scenarios;
+# with 'workers' > 1 the scenarios run in parallel processes that each map the same binary snapshot.
+# The results (total miles, start and finish times and late packages) are written to CSV or JSON.
+#
+# Usage: python scenarios.py scenarios.json results.csv [--workers N]
+import argparse
+import csv
+import datetime
+import heapq
+import json
+import logging
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from HashTable import HashTable
+from assignment import AssignmentSolver, parse_constraints
+from fleet_planner import FleetPlanner
+from package import Package
+from route_optimizer import RouteOptimizer
+from snapshot import load_data
+from time_windows import late_packages
+from vehicle import Vehicle
+
+DEFAULT_DEPOT = "4001 South 700 East"
+DEFAULT_DATA = {"distances": "Data/Distances.csv", "addresses": "Data/Addresses.csv",
+                "packages": "Data/Packages.csv", "snapshot": "Data/project.snapshot"}
+DEFAULTS = {"trucks": 3, "drivers": None, "velocity": 18, "departure": "08:00:00", "capacity": 16,
+            "packages": None, "address_correction": "10:20:00", "deadline_aware": False, "optimize": False}
+LIST_SEPARATOR = ";"
+DRIVER_PASSES = 3
+RESULT_FIELDS = ["name", "trucks", "drivers", "total_miles", "finish_time", "late_count", "late_packages",
+                 "truck_start_times", "truck_finish_times", "elapsed", "error"]
+
+Scenario = namedtuple("Scenario", ["name", "trucks", "drivers", "velocity", "departure", "capacity", "packages",
+                                   "address_correction", "deadline_aware", "optimize"])
+ScenarioResult = namedtuple("ScenarioResult", ["name", "trucks", "drivers", "total_miles", "finish_time",
+                                               "late_count", "late_packages", "truck_start_times",
+                                               "truck_finish_times", "elapsed", "error"])
+
+# Per-process data shared by every scenario the process runs: the distances, addresses and loaded manifests
+_worker_state = {}
+
+
+# The 'parse_time' function converts "HH:MM[:SS]" to a timedelta since midnight. A ValueError is raised for
+# anything else.
+def parse_time(text):
+    parts = str(text).strip().split(":")
+    if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts):
+        raise ValueError(f"Invalid time '{text}', expected HH:MM:SS.")
+    hours, minutes, seconds = (int(part) for part in parts + ["0"] * (3 - len(parts)))
+    return datetime.timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "y"):
+        return True
+    if text in ("", "0", "false", "no", "n"):
+        return False
+    raise ValueError(f"Invalid boolean '{value}'.")
+
+
+# The _per_truck function expands a scenario field into one value per truck. The field may be a single value
+# for every truck or a list (a JSON array, or values separated by ';' in a CSV cell) with one value per truck.
+def _per_truck(value, trucks, convert, field):
+    if isinstance(value, str) and LIST_SEPARATOR in value:
+        value = [part for part in value.split(LIST_SEPARATOR) if part.strip()]
+    values = value if isinstance(value, (list, tuple)) else [value] * trucks
+    if len(values) != trucks:
+        raise ValueError(f"'{field}' has {len(values)} values for {trucks} trucks.")
+    return tuple(convert(item) for item in values)
+
+
+# The 'parse_scenario' function validates one scenario record (a dict from JSON, or a CSV row) and fills in the
+# defaults. 'number' names scenarios without a name. A ValueError is raised for an invalid record.
+def parse_scenario(record, number=0):
+    unknown = set(record) - set(DEFAULTS) - {"name"}
+    if unknown:
+        raise ValueError(f"Unknown scenario fields {sorted(unknown)}.")
+    values = dict(DEFAULTS)
+    values.update({key: value for key, value in record.items() if value not in (None, "")})
+
+    trucks = int(values["trucks"])
+    drivers = trucks if values["drivers"] is None else int(values["drivers"])
+    if trucks < 1 or not 1 <= drivers <= trucks:
+        raise ValueError(f"A scenario needs at least one truck and between 1 and {trucks} drivers.")
+    address_correction = values["address_correction"]
+    return Scenario(str(values.get("name") or f"scenario-{number}"), trucks, drivers,
+                    _per_truck(values["velocity"], trucks, float, "velocity"),
+                    _per_truck(values["departure"], trucks, parse_time, "departure"),
+                    _per_truck(values["capacity"], trucks, int, "capacity"),
+                    values["packages"],
+                    None if str(address_correction).lower() == "none" else parse_time(address_correction),
+                    _parse_bool(values["deadline_aware"]), _parse_bool(values["optimize"]))
+
+
+# The 'read_scenarios' function reads a scenario file: a JSON list of records (or an object with a "scenarios"
+# list) or a CSV file with one record per row and the field names as header. The time complexity is O(n).
+def read_scenarios(filename):
+    with open(filename, newline='') as file:
+        if filename.lower().endswith(".json"):
+            records = json.load(file)
+            if isinstance(records, dict):
+                records = records.get("scenarios", [])
+        else:
+            records = list(csv.DictReader(file))
+    return [parse_scenario(record, number) for number, record in enumerate(records, start=1)]
+
+
+# The _init_worker function loads the shared data once per process: the distance table and addresses (mapped
+# from the snapshot, which the parent has already brought up to date) and the base manifest.
+def _init_worker(data):
+    hashtable = HashTable()
+    distances, addresses = load_data(hashtable, data["distances"], data["addresses"], data["packages"],
+                                     data["snapshot"], rebuild=False)
+    _worker_state.update(data=data, distances=distances, addresses=addresses,
+                         manifests={data["packages"]: hashtable})
+
+
+# The _manifest function returns the package table of a manifest file, loading it on first use in this process.
+def _manifest(filename):
+    manifests = _worker_state["manifests"]
+    if filename not in manifests:
+        from main import load_packages_into_hash
+
+        hashtable = HashTable()
+        if load_packages_into_hash(hashtable, filename) is None:
+            raise ValueError(f"Could not load packages from '{filename}'.")
+        manifests[filename] = hashtable
+    return manifests[filename]
+
+
+# The _fresh_packages function copies a package table so a scenario can change the packages' times and status
+# without affecting the next scenario. The time complexity is O(n).
+def _fresh_packages(hashtable):
+    return HashTable.from_iterable(((key, Package(package.package_id, package.address, package.city, package.state,
+                                                  package.zip_code, package.deadline, package.weight, package.notes))
+                                    for key, package in hashtable.items()), len(hashtable))
+
+
+# The 'run_scenario' function runs one scenario with the data of the current process and returns its
+# ScenarioResult. A truck without a driver can only leave when its driver is back; the AssignmentSolver plans with
+# the driver chains it is given, but which driver is back first depends on the routes, so the packages are assigned
+# again with the departures and driver chains of the previous pass until they no longer change (at most
+# DRIVER_PASSES times). A scenario that cannot be planned (for example,
+# packages that fit on no truck) gets its error message in the result instead of stopping the batch.
+def run_scenario(scenario):
+    started = time.perf_counter()
+    try:
+        manifest = _manifest(scenario.packages or _worker_state["data"]["packages"])
+        estimates = list(scenario.departure)
+        finishes = None
+        for _ in range(DRIVER_PASSES):
+            hashtable = _fresh_packages(manifest)
+            vehicles, total_distance = _plan(scenario, hashtable, estimates, _driver_chains(scenario, estimates,
+                                                                                           finishes))
+            finishes = [vehicle.current_time for vehicle in vehicles]
+            starts = estimates[:scenario.drivers] + [vehicle.start_time for vehicle in vehicles[scenario.drivers:]]
+            if starts == estimates:
+                break
+            estimates = starts
+
+        late = late_packages(hashtable)
+        return ScenarioResult(scenario.name, scenario.trucks, scenario.drivers, round(total_distance, 1),
+                              max(vehicle.current_time for vehicle in vehicles), len(late),
+                              [package.package_id for package in late],
+                              {vehicle.id: vehicle.start_time for vehicle in vehicles},
+                              {vehicle.id: vehicle.current_time for vehicle in vehicles},
+                              time.perf_counter() - started, None)
+    except (ValueError, OSError) as e:
+        return ScenarioResult(scenario.name, scenario.trucks, scenario.drivers, None, None, None, [], {}, {},
+                              time.perf_counter() - started, str(e))
+
+
+# The _driver_chains function hands the trucks beyond the first 'drivers' to the drivers: each goes, in truck
+# order, to the driver who is back first, kept in a heap of (time back, last truck). 'finishes' are the trucks'
+# finish times from the previous pass; without them a truck is taken to be back when it leaves (round robin).
+# It returns {truck: the truck it waits for}. The time complexity is O(T log D).
+def _driver_chains(scenario, estimates, finishes=None):
+    times = finishes or estimates
+    drivers = [(times[truck - 1], truck) for truck in range(1, scenario.drivers + 1)]
+    heapq.heapify(drivers)
+    after = {}
+    for truck in range(scenario.drivers + 1, scenario.trucks + 1):
+        back, previous = heapq.heappop(drivers)
+        after[truck] = previous
+        heapq.heappush(drivers, (times[truck - 1] if finishes else max(back, estimates[truck - 1]), truck))
+    return after
+
+
+# The _ready_time function returns when the packages of 'shipments' are all at the depot with a correct address.
+def _ready_time(hashtable, shipments, address_correction):
+    ready = datetime.timedelta(0)
+    for package_id in shipments:
+        constraints = parse_constraints(hashtable.get(package_id))
+        ready = max(ready, constraints.available_at or ready)
+        if constraints.wrong_address and address_correction is not None:
+            ready = max(ready, address_correction)
+    return ready
+
+
+# The _plan function assigns the packages in 'hashtable' to the scenario's trucks, taking 'estimates' as their
+# departures, and drives the routes. A truck in 'after' waits for that truck (its driver) to be back, but may
+# leave before its estimate, from its own departure once its packages are ready; a truck that another one waits
+# for returns to the depot.
+def _plan(scenario, hashtable, estimates, after):
+    distances, addresses = _worker_state["distances"], _worker_state["addresses"]
+    depot_address = _worker_state["data"].get("depot", DEFAULT_DEPOT)
+    vehicles = [Vehicle(truck, scenario.capacity[truck - 1], scenario.velocity[truck - 1], None, [], 0.0,
+                        estimates[truck - 1], depot_address)
+                for truck in range(1, scenario.trucks + 1)]
+    optimizer = RouteOptimizer() if scenario.optimize else None
+    AssignmentSolver(hashtable, addresses, distances, depot_address,
+                     address_correction_time=scenario.address_correction, optimizer=optimizer,
+                     deadline_aware=scenario.deadline_aware).solve(vehicles, start_after={
+                         truck: (previous,) for truck, previous in after.items()})
+
+    planner = FleetPlanner(hashtable, addresses, distances, depot_address, 1, optimizer, scenario.deadline_aware)
+    waited_for = set(after.values())
+    for vehicle in vehicles:
+        if vehicle.id in after:
+            vehicle.current_time = max(scenario.departure[vehicle.id - 1],
+                                       _ready_time(hashtable, vehicle.shipments, scenario.address_correction))
+            planner.add_vehicle(vehicle, start_after=(after[vehicle.id],), return_to_depot=vehicle.id in waited_for)
+        else:
+            planner.add_vehicle(vehicle)
+    return planner.plan()
+
+
+# The 'run_scenarios' function runs every scenario and returns the results in the same order. The data is
+# loaded once (and the snapshot rebuilt if a CSV changed); with 'workers' > 1 the scenarios are spread over a
+# process pool in chunks. 'data' overrides the file names in DEFAULT_DATA.
+def run_scenarios(scenarios, workers=1, data=None):
+    data = dict(DEFAULT_DATA, **(data or {}))
+    load_data(HashTable(), data["distances"], data["addresses"], data["packages"], data["snapshot"])
+    scenarios = list(scenarios)
+    if workers <= 1 or len(scenarios) <= 1:
+        _init_worker(data)
+        try:
+            return [run_scenario(scenario) for scenario in scenarios]
+        finally:
+            _worker_state.clear()
+
+    chunk_size = max(1, len(scenarios) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+        return list(pool.map(run_scenario, scenarios, chunksize=chunk_size))
+
+
+# The 'result_record' function turns a ScenarioResult into plain values: times as HH:MM:SS strings and, for CSV
+# ('flat'), lists joined with ';'.
+def result_record(result, flat=False):
+    record = result._asdict()
+    record["finish_time"] = None if result.finish_time is None else str(result.finish_time)
+    for field in ("truck_start_times", "truck_finish_times"):
+        record[field] = {str(truck): str(moment) for truck, moment in getattr(result, field).items()}
+    record["elapsed"] = round(result.elapsed, 4)
+    if flat:
+        record["late_packages"] = LIST_SEPARATOR.join(str(package_id) for package_id in result.late_packages)
+        for field in ("truck_start_times", "truck_finish_times"):
+            record[field] = LIST_SEPARATOR.join(f"{truck}={moment}" for truck, moment in record[field].items())
+    return record
+
+
+# The 'write_results' function writes the results to 'filename' as JSON when it ends in .json, else as CSV.
+def write_results(results, filename):
+    with open(filename, "w", newline='') as file:
+        if filename.lower().endswith(".json"):
+            json.dump([result_record(result) for result in results], file, indent=2)
+            file.write("\n")
+        else:
+            writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(result_record(result, flat=True) for result in results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run what-if fleet scenarios in batch.")
+    parser.add_argument("scenarios", help="scenario file (.json or .csv)")
+    parser.add_argument("results", help="results file (.json or .csv)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of processes")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = run_scenarios(read_scenarios(args.scenarios), args.workers)
+    write_results(results, args.results)
+    failed = sum(result.error is not None for result in results)
+    for result in results:
+        if result.error is not None:
+            logging.warning(f"Scenario '{result.name}' failed: {result.error}")
+    print(f"Ran {len(results)} scenarios ({failed} failed) in {time.perf_counter() - started:.2f} s; "
+          f"results written to '{args.results}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# The 'ShortestPaths' class turns a partial distance table into all-pairs shortest paths. Pairs that the table
+# does not define (infinity in the DistanceMatrix) get the length of the shortest chain of defined legs, and the
+# via-path of any pair can be listed stop by stop. Two algorithms are available:
+#   Floyd-Warshall, vectorized with NumPy one intermediate address at a time, O(A^3) work, for moderate sizes;
+#   Dijkstra from one source at a time over the defined legs, O(E log A) per source, for large sparse tables.
+#     Sources are computed on demand and kept in an LRU cache.
+# 'cached_closure' stores the full closure next to the distance CSV (as <name>.paths.npz), keyed by the SHA-256
+# of the CSV, so it is only computed once per version of the data.
+import heapq
+import logging
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from distance_matrix import DistanceMatrix
+from snapshot import source_info
+
+FLOYD_WARSHALL_LIMIT = 1000
+DEFAULT_CACHE_SIZE = 1024
+CACHE_VERSION = 1
+UNREACHABLE = -1
+
+# A detour must be shorter than the recorded leg by more than this to replace it; equal routes keep the leg.
+EPSILON = 1e-9
+
+
+# The 'floyd_warshall' function returns (distances, successors) for a square array in which missing legs are
+# infinity. successors[i, j] is the first stop after i on a shortest path to j, or UNREACHABLE.
+# The time complexity is O(A^3), done as A vectorized O(A^2) steps.
+def floyd_warshall(values):
+    distances = np.array(values, dtype=np.float64)
+    size = len(distances)
+    successors = np.where(np.isfinite(distances), np.arange(size)[np.newaxis, :], UNREACHABLE).astype(np.int32)
+    np.fill_diagonal(distances, np.minimum(np.diagonal(distances), 0.0))
+    np.fill_diagonal(successors, np.arange(size))
+
+    for k in range(size):
+        via = distances[:, k, np.newaxis] + distances[np.newaxis, k, :]
+        shorter = via < distances - EPSILON
+        np.copyto(distances, via, where=shorter)
+        np.copyto(successors, np.broadcast_to(successors[:, k, np.newaxis], successors.shape), where=shorter)
+    return distances, successors
+
+
+class ShortestPaths:
+    # The __init__ method indexes the defined legs of a DistanceMatrix (or list of lists). 'method' is
+    # "floyd-warshall", "dijkstra" or "auto", which picks Floyd-Warshall up to FLOYD_WARSHALL_LIMIT addresses.
+    # 'cache_size' is the number of Dijkstra sources kept. The time complexity is O(A^2) to read the table.
+    def __init__(self, distances, method="auto", cache_size=DEFAULT_CACHE_SIZE):
+        self.distances = DistanceMatrix.wrap(distances)
+        size = len(self.distances)
+        if method == "auto":
+            method = "floyd-warshall" if size <= FLOYD_WARSHALL_LIMIT else "dijkstra"
+        if method not in ("floyd-warshall", "dijkstra"):
+            raise ValueError(f"Unknown shortest-path method '{method}'.")
+        self.method = method
+        self._closure = None
+        self._search = lru_cache(maxsize=cache_size)(self._dijkstra)
+
+        values = self.distances.values
+        sources, targets = np.nonzero(np.isfinite(values) & ~np.eye(size, dtype=bool))
+        order = np.argsort(sources, kind='stable')
+        # The defined legs as adjacency lists in compressed form: the legs of node i are edges
+        # _starts[i] to _starts[i + 1] - 1. Plain lists keep the Dijkstra loop fast.
+        self._targets = targets[order].tolist()
+        self._weights = values[sources[order], targets[order]].tolist()
+        self._starts = np.searchsorted(sources[order], np.arange(size + 1)).tolist()
+
+    # The 'from_closure' class method rebuilds the object from a stored (distances, successors) closure.
+    @classmethod
+    def from_closure(cls, distances, closure_distances, successors):
+        paths = cls(distances, method="floyd-warshall")
+        paths._closure = (closure_distances, successors)
+        return paths
+
+    # The 'closure' method returns the full (distances, successors) arrays, computing them on first use with
+    # the chosen method. The time complexity is O(A^3) or O(A * E log A).
+    def closure(self):
+        if self._closure is None:
+            if self.method == "floyd-warshall":
+                self._closure = floyd_warshall(self.distances.values)
+            else:
+                size = len(self.distances)
+                closure_distances = np.empty((size, size), dtype=np.float64)
+                successors = np.empty((size, size), dtype=np.int32)
+                for source in range(size):
+                    closure_distances[source], successors[source] = self._search(source)[::2]
+                self._closure = (closure_distances, successors)
+        return self._closure
+
+    # The _dijkstra method searches from one source over the defined legs and returns (distances, predecessors,
+    # successors) arrays. It is wrapped in an LRU cache per instance. The time complexity is O(E log A).
+    def _dijkstra(self, source):
+        size = len(self.distances)
+        distances = [float('inf')] * size
+        predecessors = [UNREACHABLE] * size
+        successors = [UNREACHABLE] * size
+        settled = [False] * size
+        distances[source] = 0.0
+        successors[source] = source
+        targets, weights, starts = self._targets, self._weights, self._starts
+
+        heap = [(0.0, source)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if settled[node]:
+                continue
+            settled[node] = True
+            if node != source:
+                # The first stop on the way to 'node' is the one on the way to its predecessor
+                parent = predecessors[node]
+                successors[node] = node if parent == source else successors[parent]
+            for edge in range(starts[node], starts[node + 1]):
+                target = targets[edge]
+                candidate = distance + weights[edge]
+                if candidate < distances[target] - EPSILON:
+                    distances[target] = candidate
+                    predecessors[target] = node
+                    heapq.heappush(heap, (candidate, target))
+        return (np.array(distances), np.array(predecessors, dtype=np.int32),
+                np.array(successors, dtype=np.int32))
+
+    # The 'row' method returns the shortest distances from address i to every address. O(A) with a closure,
+    # otherwise one cached Dijkstra search.
+    def row(self, i):
+        if self._closure is not None:
+            return self._closure[0][i]
+        return self._search(i)[0]
+
+    # The 'distance' method returns the shortest distance between two addresses (infinity if unreachable).
+    def distance(self, i, j):
+        return float(self.row(i)[j])
+
+    # The 'path' method returns the addresses visited from i to j, both included, or None if j is unreachable.
+    # The time complexity is O(L) for a path of L legs (plus one Dijkstra search when not yet cached).
+    def path(self, i, j):
+        if self._closure is None:
+            _, predecessors, successors = self._search(i)
+            if successors[j] == UNREACHABLE:
+                return None
+            path = [j]
+            while path[-1] != i:
+                path.append(int(predecessors[path[-1]]))
+            return path[::-1]
+
+        successors = self._closure[1]
+        if successors[i, j] == UNREACHABLE:
+            return None
+        path = [i]
+        while path[-1] != j:
+            path.append(int(successors[path[-1], j]))
+        return path
+
+    # The 'filled' method returns a DistanceMatrix where only the undefined pairs are replaced by their
+    # shortest-path distance; recorded legs are kept as they are. The time complexity is that of 'closure'.
+    def filled(self):
+        values = self.distances.values
+        missing = ~np.isfinite(values)
+        if not missing.any():
+            return self.distances
+        return DistanceMatrix(np.where(missing, self.closure()[0], values).astype(values.dtype))
+
+
+# The 'cached_closure' function returns ShortestPaths for the table in 'distances_csv' with its closure loaded
+# from the cache file next to it, computing and saving the closure when the cache is missing or was built from
+# a different version of the CSV. 'distances' is the already parsed table, if the caller has it.
+def cached_closure(distances_csv, distances=None, cache_path=None, method="auto"):
+    if cache_path is None:
+        cache_path = os.path.splitext(distances_csv)[0] + ".paths.npz"
+    if distances is None:
+        distances = DistanceMatrix.from_csv(distances_csv)
+    digest = source_info(distances_csv)["sha256"]
+
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as cache:
+                if int(cache["version"]) == CACHE_VERSION and str(cache["sha256"]) == digest:
+                    return ShortestPaths.from_closure(distances, cache["distances"], cache["successors"])
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Could not read shortest-path cache '{cache_path}': {e}")
+
+    paths = ShortestPaths(distances, method)
+    closure_distances, successors = paths.closure()
+    try:
+        temporary = f"{cache_path}.tmp{os.getpid()}.npz"
+        np.savez(temporary, version=CACHE_VERSION, sha256=digest, distances=closure_distances,
+                 successors=successors)
+        os.replace(temporary, cache_path)
+    except OSError as e:
+        logging.warning(f"Could not write shortest-path cache '{cache_path}': {e}")
+    return paths
@@ -0,0 +1,222 @@
+# The 'snapshot' module compiles the three input CSVs into one versioned binary file and loads it back with
+# mmap. The file holds the distance matrix as raw floats, the address table and a column store of the package
+# rows, each as an aligned section. Opening a snapshot only reads a small JSON header and maps the file, so the
+# distance matrix costs O(1) work to load and is shared through the page cache by every process that maps it;
+# strings are decoded when they are first used.
+# Each snapshot records the size, modification time and SHA-256 of its source files. When a source has changed
+# (judged by mtime or by hash) or the format version differs, 'load_data' falls back to the CSVs and rewrites
+# the snapshot.
+#
+# Layout: MAGIC | header length (uint64, little-endian) | JSON header | sections aligned to ALIGNMENT bytes.
+import hashlib
+import json
+import logging
+import mmap
+import os
+
+import numpy as np
+
+from address_registry import AddressRegistry
+from distance_matrix import DistanceMatrix
+from package import Package
+from package_loader import EXPECTED_FIELDS, iter_package_rows
+
+MAGIC = b"UPSSNAP\0"
+VERSION = 1
+ALIGNMENT = 64
+
+
+# The 'StringTable' class is a read-only sequence of strings stored as one UTF-8 blob plus an offsets array.
+# Item i is decoded on access. The time complexity of an access is O(L) in the length of the string.
+class StringTable:
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    # The 'encode' static method turns a list of strings into (offsets, blob) arrays. O(total length).
+    @staticmethod
+    def encode(strings):
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    # The 'tolist' method decodes every string at once, which is much faster than item access in a loop.
+    # The time complexity is O(total length).
+    def tolist(self):
+        data = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        return [data[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+# The 'source_info' function returns the size, mtime and (optionally) SHA-256 of a source file.
+# The hash reads the whole file, O(file size); the stat alone is O(1).
+def source_info(filename, with_hash=True):
+    stat = os.stat(filename)
+    info = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as source:
+            for block in iter(lambda: source.read(1 << 20), b""):
+                digest.update(block)
+        info["sha256"] = digest.hexdigest()
+    return info
+
+
+# The 'compile_snapshot' function parses the three CSVs once and writes them to 'snapshot_path'. The file is
+# written next to its final name and moved into place, so readers never see a half-written snapshot.
+# The time complexity is O(A^2 + n) for A addresses and n packages.
+def compile_snapshot(snapshot_path, distances_csv, addresses_csv, packages_csv, dtype=np.float64):
+    from main import load_address_data, load_distance_data
+
+    distances = DistanceMatrix(load_distance_data(distances_csv).values.astype(dtype, copy=False))
+    addresses = load_address_data(addresses_csv)
+    package_keys, package_rows = [], []
+    for chunk in iter_package_rows(packages_csv):
+        for key, row in chunk:
+            package_keys.append(key)
+            package_rows.append(row)
+
+    arrays = {"distances": np.ascontiguousarray(distances.values),
+              "address_ids": np.array([row[0] for row in addresses], dtype=np.int64),
+              "package_keys": np.array(package_keys, dtype=np.int64)}
+    for column, strings in (("address_names", [row[1] for row in addresses]),
+                            ("address_streets", [row[2] for row in addresses])):
+        arrays[f"{column}.offsets"], arrays[f"{column}.blob"] = StringTable.encode(strings)
+    for field in range(EXPECTED_FIELDS):
+        arrays[f"package_field{field}.offsets"], arrays[f"package_field{field}.blob"] = StringTable.encode(
+            [row[field] for row in package_rows])
+
+    sources = {"distances": distances_csv, "addresses": addresses_csv, "packages": packages_csv}
+    header = {"version": VERSION, "sources": {name: source_info(path) for name, path in sources.items()},
+              "sections": {}}
+    offset = 0
+    for name, array in arrays.items():
+        header["sections"][name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    encoded = json.dumps(header).encode('utf-8')
+    data_start = -(-(len(MAGIC) + 8 + len(encoded)) // ALIGNMENT) * ALIGNMENT
+    temporary = f"{snapshot_path}.tmp{os.getpid()}"
+    with open(temporary, 'wb') as output:
+        output.write(MAGIC)
+        output.write(len(encoded).to_bytes(8, 'little'))
+        output.write(encoded)
+        for name, array in arrays.items():
+            output.seek(data_start + header["sections"][name]["offset"])
+            output.write(array.tobytes())
+        output.truncate(data_start + offset)
+    os.replace(temporary, snapshot_path)
+    return snapshot_path
+
+
+class Snapshot:
+    # The __init__ method maps a snapshot file read-only and parses its header. Sections are NumPy views of
+    # the mapping, so nothing else is read until it is used. The time complexity is O(header size).
+    def __init__(self, snapshot_path):
+        self.path = snapshot_path
+        with open(snapshot_path, 'rb') as source:
+            if source.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{snapshot_path}' is not a snapshot file.")
+            length = int.from_bytes(source.read(8), 'little')
+            self.header = json.loads(source.read(length).decode('utf-8'))
+            self._data_start = -(-(len(MAGIC) + 8 + length) // ALIGNMENT) * ALIGNMENT
+            self._mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        self.version = self.header.get("version")
+
+    # The 'section' method returns one section as a read-only array view of the mapping. O(1).
+    def section(self, name):
+        spec = self.header["sections"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        return np.frombuffer(self._mapping, dtype=dtype, count=count,
+                             offset=self._data_start + spec["offset"]).reshape(spec["shape"])
+
+    # The 'strings' method returns a StringTable section.
+    def strings(self, name):
+        return StringTable(self.section(f"{name}.offsets"), self.section(f"{name}.blob"))
+
+    # The 'distances' method returns the distance matrix backed by the mapped file, without copying.
+    # Processes that map the same snapshot share its pages. The time complexity is O(1).
+    def distances(self):
+        offset = self._data_start + self.header["sections"]["distances"]["offset"]
+        return DistanceMatrix(self.section("distances"), source=(self.path, offset))
+
+    # The 'addresses' method returns an AddressRegistry of the address table. The time complexity is O(A).
+    def addresses(self):
+        return AddressRegistry(zip(self.section("address_ids").tolist(), self.strings("address_names"),
+                                   self.strings("address_streets")))
+
+    # The 'iter_packages' generator yields (package_id, Package) pairs from the package column store.
+    # Each column is decoded in one pass. The time complexity is O(n).
+    def iter_packages(self):
+        columns = [self.strings(f"package_field{field}").tolist() for field in range(EXPECTED_FIELDS)]
+        for key, row in zip(self.section("package_keys").tolist(), zip(*columns)):
+            yield key, Package(*row)
+
+    # The 'load_packages' method stores every package in a hash table, with one 'update' call when the table
+    # has it and 'set' otherwise. The time complexity is O(n).
+    def load_packages(self, hashtable):
+        if hasattr(hashtable, 'update'):
+            hashtable.update(list(self.iter_packages()))
+        else:
+            for key, package in self.iter_packages():
+                hashtable.set(key, package)
+        return hashtable
+
+    # The 'is_stale' method reports whether any source file differs from the one the snapshot was built from,
+    # or the format version is not the current one. 'check' is "mtime" (size and modification time, O(1)) or
+    # "hash" (size and SHA-256, O(file size)); with "hash" a file that was only touched is still fresh.
+    def is_stale(self, sources, check="mtime"):
+        if self.version != VERSION:
+            return True
+        for name, path in sources.items():
+            recorded = self.header["sources"].get(name)
+            try:
+                current = source_info(path, with_hash=check == "hash")
+            except OSError:
+                return True
+            if recorded is None or recorded["size"] != current["size"]:
+                return True
+            key = "sha256" if check == "hash" else "mtime_ns"
+            if recorded[key] != current[key]:
+                return True
+        return False
+
+
+# The 'load_data' function returns (DistanceMatrix, AddressRegistry) and fills 'hashtable' with the packages,
+# reading 'snapshot_path' when it is fresh and the CSVs otherwise. After a CSV load the snapshot is rebuilt
+# (unless 'rebuild' is False) so the next start is fast again.
+def load_data(hashtable, distances_csv, addresses_csv, packages_csv, snapshot_path, check="mtime", rebuild=True):
+    sources = {"distances": distances_csv, "addresses": addresses_csv, "packages": packages_csv}
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = Snapshot(snapshot_path)
+            if not snapshot.is_stale(sources, check):
+                snapshot.load_packages(hashtable)
+                return snapshot.distances(), snapshot.addresses()
+            logging.info(f"Snapshot '{snapshot_path}' is stale; loading the CSV files.")
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Could not read snapshot '{snapshot_path}': {e}")
+
+    if rebuild:
+        try:
+            compile_snapshot(snapshot_path, distances_csv, addresses_csv, packages_csv)
+            snapshot = Snapshot(snapshot_path)
+            snapshot.load_packages(hashtable)
+            return snapshot.distances(), snapshot.addresses()
+        except OSError as e:
+            logging.warning(f"Could not write snapshot '{snapshot_path}': {e}")
+
+    from main import load_distance_data, load_address_data, load_packages_into_hash
+    load_packages_into_hash(hashtable, packages_csv)
+    return load_distance_data(distances_csv), AddressRegistry(load_address_data(addresses_csv))
@@ -0,0 +1,109 @@
+# The 'StatusBoard' class answers "what is the status of every package at time T" in one vectorized step.
+# The departure and delivery times of all packages are copied once into integer-second NumPy arrays, so
+# a query is two array comparisons instead of one 'update_status' call (with its datetime arithmetic) per
+# package. A list of timestamps is answered with one broadcast comparison, for timeline views.
+# The rules are the same as 'Package.update_status': delivered once the delivery time has passed,
+# en route once the package has departed, at the hub otherwise.
+import datetime
+
+import numpy as np
+
+from event_log import LOAD, DELIVER
+
+AT_HUB = 0
+EN_ROUTE = 1
+DELIVERED = 2
+STATUS_NAMES = np.array(["At Hub", "En route", "Delivered"], dtype=object)
+
+# Sentinel for a departure or delivery that has not been scheduled; it is later than any query time.
+NEVER = np.iinfo(np.int64).max
+
+
+# The 'seconds_since_midnight' function converts a datetime, time, timedelta or number of seconds to whole
+# seconds since midnight. The time complexity is O(1).
+def seconds_since_midnight(value):
+    if isinstance(value, datetime.datetime):
+        value = value.time()
+    if isinstance(value, datetime.time):
+        return value.hour * 3600 + value.minute * 60 + value.second
+    if isinstance(value, datetime.timedelta):
+        return round(value.total_seconds())
+    return round(value)
+
+
+class StatusBoard:
+    # The __init__ method stores the package IDs and their departure/delivery seconds as parallel arrays.
+    # The time complexity is O(n).
+    def __init__(self, package_ids, departure_seconds, delivery_seconds):
+        self.package_ids = np.asarray(package_ids)
+        self.delivery_seconds = np.asarray(delivery_seconds, dtype=np.int64)
+        # A delivered package has always departed, so the status code is simply departed + delivered
+        self.departure_seconds = np.minimum(np.asarray(departure_seconds, dtype=np.int64), self.delivery_seconds)
+        self._positions = None
+
+    # The 'from_packages' class method builds a board from a hash table of packages (anything with
+    # 'items()'). Times that are None become NEVER. The time complexity is O(n).
+    @classmethod
+    def from_packages(cls, hashtable):
+        package_ids, departures, deliveries = [], [], []
+        for package_id, package in hashtable.items():
+            package_ids.append(package_id)
+            departures.append(NEVER if package.departure_time is None
+                              else seconds_since_midnight(package.departure_time))
+            deliveries.append(NEVER if package.delivery_time is None
+                              else seconds_since_midnight(package.delivery_time))
+        return cls(package_ids, departures, deliveries)
+
+    # The 'from_event_log' class method builds a board from an EventLog: a package departs at its first
+    # 'load' event and is delivered at its last 'deliver' event. 'package_ids' (for example the package
+    # hash table) adds packages that have no events yet; they stay at the hub. The time complexity is O(n).
+    @classmethod
+    def from_event_log(cls, event_log, package_ids=()):
+        departures, deliveries = {}, {}
+        for event in event_log:
+            if event.kind == LOAD:
+                departures.setdefault(event.package_id, seconds_since_midnight(event.time))
+            elif event.kind == DELIVER:
+                deliveries[event.package_id] = seconds_since_midnight(event.time)
+
+        package_ids = sorted(set(departures).union(package_ids))
+        return cls(package_ids, [departures.get(key, NEVER) for key in package_ids],
+                   [deliveries.get(key, NEVER) for key in package_ids])
+
+    # The 'status_codes' method returns the status code (AT_HUB, EN_ROUTE or DELIVERED) of every package
+    # at one time. The time complexity is O(n), done as two vectorized comparisons and one addition.
+    def status_codes(self, at):
+        at = seconds_since_midnight(at)
+        codes = (self.departure_seconds <= at).view(np.int8).copy()
+        codes += self.delivery_seconds < at
+        return codes
+
+    # The 'statuses' method returns the status names of every package at one time, in 'package_ids' order.
+    def statuses(self, at):
+        return STATUS_NAMES[self.status_codes(at)]
+
+    # The 'timeline' method returns a (len(times), n) array of status codes, one row per timestamp,
+    # computed with a single broadcast comparison. The time complexity is O(T * n).
+    def timeline(self, times):
+        at = np.array([seconds_since_midnight(time) for time in times], dtype=np.int64)[:, np.newaxis]
+        codes = (self.departure_seconds <= at).view(np.int8).copy()
+        codes += self.delivery_seconds < at
+        return codes
+
+    # The 'status_of' method returns the status name of one package, or None if it is not on the board.
+    # The position index is built on first use; after that the lookup is O(1) average.
+    def status_of(self, package_id, at):
+        if self._positions is None:
+            self._positions = {key: position for position, key in enumerate(self.package_ids.tolist())}
+        position = self._positions.get(package_id)
+        if position is None:
+            return None
+        at = seconds_since_midnight(at)
+        if self.delivery_seconds[position] < at:
+            return STATUS_NAMES[DELIVERED]
+        if self.departure_seconds[position] <= at:
+            return STATUS_NAMES[EN_ROUTE]
+        return STATUS_NAMES[AT_HUB]
+
+    def __len__(self):
+        return len(self.package_ids)
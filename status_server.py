@@ -0,0 +1,248 @@
+# The 'status_server' module answers package status and mileage queries for many clients at once. It is an asyncio
+# server speaking line-delimited JSON over TCP (or a Unix socket): every request is one JSON object on one line and
+# gets one JSON object back on one line, so clients may send many requests without waiting for each answer.
+#   {"op": "status", "id": 6, "at": "10:00:00"}           one package, answered from the in-memory HashTable
+#   {"op": "status", "ids": [1, 2, 3], "at": "10:00:00"}  several packages ("ids" may be omitted for all of them)
+#   {"op": "mileage", "at": "10:00:00"}                   every truck's mileage and the total at a time
+#   {"op": "report"}                                      the plan's trucks, total distance and late packages
+#   {"op": "replan", "options": {"optimize": true}}       plans again in the background, then swaps the plan
+#   {"op": "ping"}
+# A request may carry a "request_id", which is echoed in its response. The plan is loaded once (from the plan cache
+# when possible, see cli.py) into a PlanState: the package table, the event log and a StatusBoard. Queries only read
+# the current PlanState, and replanning builds a complete new PlanState in an executor process and then replaces
+# the reference in one assignment, so a query sees either the old plan or the new one and never a mix of the two.
+# Replans with other options are run one after another; the last one requested is the plan left in place.
+#
+# Usage: python status_server.py [--host 127.0.0.1] [--port 8765] [--unix PATH] [--optimize] [--deadline-aware]
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import cli
+from HashTable import HashTable
+from package import Package
+from plan_cache import DEFAULT_DIRECTORY, DEFAULT_OPTIONS, PlanCache, record_event_log, restore_plan
+from status_board import StatusBoard
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LINE = 1 << 20
+
+PlanState = namedtuple("PlanState", ["key", "options", "record", "hashtable", "event_log", "board", "loaded_at"])
+
+
+# The 'load_state' function returns the PlanState for 'options': the plan from the cache (computed and stored if it
+# is not there), its packages in a HashTable with their planned times, its event log and a StatusBoard over the
+# events. It runs in an executor process when replanning. The time complexity is O(n + e log e) for a cached plan.
+def load_state(options, cache_directory=DEFAULT_DIRECTORY, data_files=None, snapshot_path=cli.DEFAULT_SNAPSHOT):
+    key, record = cli.cached_plan(options, PlanCache(cache_directory), data_files, snapshot_path)
+    hashtable = HashTable.from_iterable(
+        ((package["package_id"], Package(*(str(package[field]) for field in
+                                           ("package_id", "address", "city", "state", "zip_code", "deadline",
+                                            "weight", "notes"))))
+         for package in record["packages"]), len(record["packages"]))
+    restore_plan(record, hashtable)
+    event_log = record_event_log(record)
+    board = StatusBoard.from_event_log(event_log, list(hashtable))
+    return PlanState(key, dict(options), record, hashtable, event_log, board, time.time())
+
+
+# The _parse_at function reads the "at" field of a request as a timedelta since midnight.
+def _parse_at(request):
+    try:
+        return cli.parse_time(str(request["at"]))
+    except argparse.ArgumentTypeError as e:
+        raise ValueError(str(e)) from None
+
+
+class StatusServer:
+    # The __init__ method stores the first PlanState. 'executor' runs replanning; by default one worker process.
+    def __init__(self, state, cache_directory=DEFAULT_DIRECTORY, data_files=None, snapshot_path=cli.DEFAULT_SNAPSHOT,
+                 executor=None):
+        self.state = state
+        self.cache_directory = cache_directory
+        self.data_files = data_files
+        self.snapshot_path = snapshot_path
+        self.executor = executor
+        self.requests = 0
+        self._replanning = None
+        self._servers = []
+        self._connections = set()
+
+    # The 'start' method listens on TCP ('port' 0 picks a free port) and, when 'unix_path' is given, on a Unix
+    # socket. It returns the TCP (host, port) actually bound.
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        server = await asyncio.start_server(self._serve, host, port, limit=MAX_LINE)
+        self._servers.append(server)
+        if unix_path is not None:
+            self._servers.append(await asyncio.start_unix_server(self._serve, unix_path, limit=MAX_LINE))
+        return server.sockets[0].getsockname()[:2]
+
+    # The 'close' method stops listening, closes the open connections and waits for a replan that is still running.
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+        for connection in list(self._connections):
+            connection.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._replanning is not None:
+            await asyncio.gather(self._replanning[1], return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+    # The _serve coroutine handles one connection: one request per line, answered in order. A connection that is
+    # still open when the server closes is cancelled and ends quietly.
+    async def _serve(self, reader, writer):
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # a line longer than MAX_LINE
+                    writer.write(b'{"ok": false, "error": "Request too long."}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+    # The 'handle' coroutine answers one request line and returns the response object. Queries read the PlanState
+    # that is current when they start and do not await, so each is answered from one plan.
+    async def handle(self, line):
+        self.requests += 1
+        request = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object.")
+            op = request.get("op")
+            if op == "replan":
+                response = await self.replan(dict(DEFAULT_OPTIONS, **request.get("options", {})))
+            elif op in self.QUERIES:
+                response = self.QUERIES[op](self, self.state, request)
+            else:
+                raise ValueError(f"Unknown op '{op}'.")
+            response["ok"] = True
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"ok": False, "error": str(e) if not isinstance(e, KeyError) else f"Missing field {e}."}
+        except Exception as e:
+            # Anything else (the cache or data files, a broken executor) still gets an answer on this connection
+            logging.exception(f"Request {line[:200]!r} failed.")
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if "request_id" in request:
+            response["request_id"] = request["request_id"]
+        return response
+
+    def _status(self, state, request):
+        at = _parse_at(request)
+        if "id" in request:
+            package_ids = [int(request["id"])]
+        else:
+            package_ids = [int(package_id) for package_id in request.get("ids", state.board.package_ids.tolist())]
+        packages = []
+        for package_id in package_ids:
+            package = state.hashtable.get(package_id)
+            if package is None:
+                packages.append({"package_id": package_id, "status": None, "error": "Package not found."})
+                continue
+            packages.append({"package_id": package_id, "status": state.board.status_of(package_id, at),
+                             "address": package.address, "deadline": package.deadline,
+                             "delivery_time": None if package.delivery_time is None else str(package.delivery_time)})
+        response = {"at": str(at), "plan": state.key}
+        if "id" in request:
+            response.update(packages[0])
+        else:
+            response["packages"] = packages
+        return response
+
+    def _mileage(self, state, request):
+        at = _parse_at(request)
+        return {"at": str(at), "plan": state.key,
+                "mileage": {str(vehicle_id): round(state.event_log.mileage_at(vehicle_id, at), 1)
+                            for vehicle_id in state.event_log.vehicle_ids()},
+                "total_mileage": round(state.event_log.total_mileage_at(at), 1)}
+
+    def _report(self, state, request):
+        response = cli.plan_report(state.record)
+        response.update(plan=state.key, loaded_at=datetime.datetime.fromtimestamp(state.loaded_at).isoformat())
+        return response
+
+    def _ping(self, state, request):
+        return {"plan": state.key, "requests": self.requests}
+
+    QUERIES = {"status": _status, "mileage": _mileage, "report": _report, "ping": _ping}
+
+    # The 'replan' coroutine builds the PlanState for 'options' in the executor while queries keep being answered
+    # from the current plan, then swaps it in. A replan with the same options as the one running joins it; one with
+    # other options waits for it to finish and then plans with its own options, so the latest request's plan wins.
+    async def replan(self, options):
+        while self._replanning is not None and self._replanning[0] != options:
+            await asyncio.gather(self._replanning[1], return_exceptions=True)
+        if self._replanning is None:
+            loop = asyncio.get_running_loop()
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=1)
+            future = loop.run_in_executor(self.executor, load_state, options, self.cache_directory, self.data_files,
+                                          self.snapshot_path)
+            self._replanning = (options, future)
+            # Cleared before any waiter resumes, as this callback is registered first
+            future.add_done_callback(self._replanned)
+        state = await self._replanning[1]
+        if state.key != self.state.key:
+            self.state = state  # one reference assignment: readers see the old plan or the new one
+            logging.info(f"Swapped in plan {state.key[:12]} with options {state.options}.")
+        return {"plan": self.state.key, "options": self.state.options}
+
+    def _replanned(self, future):
+        if self._replanning is not None and self._replanning[1] is future:
+            self._replanning = None
+
+
+async def serve(host, port, unix_path, options, cache_directory):
+    state = load_state(options, cache_directory)
+    server = StatusServer(state, cache_directory)
+    bound = await server.start(host, port, unix_path)
+    print(f"Serving plan {state.key[:12]} on {bound[0]}:{bound[1]}" + (f" and {unix_path}" if unix_path else ""),
+          flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve package status queries as line-delimited JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="also listen on this Unix socket")
+    parser.add_argument("--cache", default=DEFAULT_DIRECTORY, help="plan cache directory")
+    parser.add_argument("--optimize", action="store_true")
+    parser.add_argument("--deadline-aware", action="store_true")
+    parser.add_argument("--assign", action="store_true")
+    parser.add_argument("--candidates", action="store_true")
+    args = parser.parse_args(argv)
+    options = {"optimize": args.optimize, "deadline_aware": args.deadline_aware, "assign": args.assign,
+               "candidates": args.candidates}
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, options, args.cache))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
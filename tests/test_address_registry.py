@@ -0,0 +1,53 @@
+# test_address_registry.py
+import unittest
+
+from address_registry import AddressRegistry, normalize_address
+from main import extract_address, distance_between_addresses, calculate_return_trip
+from vehicle import Vehicle
+import datetime
+
+
+class TestAddressRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            (0, "Western Governors University", "4001 South 700 East"),
+            (1, "International Peace Gardens", "1060 Dalton Ave S"),
+            (2, "City Center of Rock Springs", "5383 South 900 East #104"),
+        ]
+        self.registry = AddressRegistry(self.rows)
+        self.distances = [[0.0, None, None], [7.2, 0.0, None], [3.8, 7.1, 0.0]]
+
+    def test_exact_lookup(self):
+        """Test that exact address strings resolve to their address ID."""
+        self.assertEqual(self.registry.index_of("1060 Dalton Ave S"), 1)
+        self.assertEqual(self.registry.get(2)[2], "5383 South 900 East #104")
+
+    def test_normalized_lookup(self):
+        """Test that case, spacing and direction spelling differences still resolve."""
+        self.assertEqual(normalize_address("4001  South 700 East"), "4001 s 700 e")
+        self.assertEqual(self.registry.index_of("4001 S 700 e"), 0)
+
+    def test_substring_fallback(self):
+        """Test that the registry keeps the substring matching used by extract_address."""
+        self.assertEqual(self.registry.index_of("5383 South 900"), 2)
+        self.assertIsNone(self.registry.index_of("1 Nowhere Rd"))
+
+    def test_registry_and_list_agree(self):
+        """Test that helpers give the same answers for a registry and a plain list of rows."""
+        self.assertEqual(extract_address("1060 Dalton Ave S", self.rows),
+                         extract_address("1060 Dalton Ave S", self.registry))
+        self.assertEqual(distance_between_addresses(2, 1, self.distances, self.rows),
+                         distance_between_addresses(2, 1, self.distances, self.registry))
+
+    def test_return_trip(self):
+        """Test that the return trip looks up the depot and last stop through the registry."""
+        vehicle = Vehicle(1, 16, 18, None, [], 0.0, datetime.timedelta(hours=8), "1060 Dalton Ave S")
+        vehicle, return_time = calculate_return_trip(vehicle, "1060 Dalton Ave S", "4001 South 700 East",
+                                                     self.distances, self.registry)
+        self.assertEqual(vehicle.total_distance, 7.2)
+        self.assertEqual(return_time, datetime.timedelta(hours=8) + datetime.timedelta(hours=7.2 / 18))
+
+
+if __name__ == '__main__':
+    unittest.main()
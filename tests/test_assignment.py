@@ -0,0 +1,114 @@
+# test_assignment.py
+import datetime
+import unittest
+
+from assignment import AssignmentSolver, package_groups, parse_constraints, parse_clock
+from event_log import EventLog
+from fleet_planner import FleetPlanner
+from main import plan_deliveries
+from package import Package
+from route_optimizer import RouteOptimizer
+from test_fleet_planner import load_project_data
+from time_windows import late_packages
+from vehicle import Vehicle
+
+DEPOT = "4001 South 700 East"
+
+
+def project_fleet():
+    return [Vehicle(1, 16, 18, None, [], 0.0, datetime.timedelta(hours=8), DEPOT),
+            Vehicle(2, 16, 18, None, [], 0.0, datetime.timedelta(hours=8), DEPOT),
+            Vehicle(3, 16, 18, None, [], 0.0, datetime.timedelta(hours=9, minutes=5), DEPOT)]
+
+
+class TestParseConstraints(unittest.TestCase):
+
+    def test_reads_notes_and_deadline(self):
+        package = Package("3", "233 Canyon Rd", "Salt Lake City", "UT", "84103", "10:30 AM", "2",
+                          "Can only be on truck 2")
+        self.assertEqual(parse_constraints(package).truck, 2)
+        self.assertEqual(parse_constraints(package).deadline, datetime.timedelta(hours=10, minutes=30))
+
+        package.notes = "Delayed on flight---will not arrive to depot until 9:05 am"
+        self.assertEqual(parse_constraints(package).available_at, datetime.timedelta(hours=9, minutes=5))
+
+        package.notes = "Must be delivered with 13, 15"
+        self.assertEqual(parse_constraints(package).deliver_with, (13, 15))
+
+        package.notes = "Wrong address listed"
+        self.assertTrue(parse_constraints(package).wrong_address)
+
+    def test_eod_has_no_deadline(self):
+        self.assertIsNone(parse_clock("EOD"))
+
+    def test_groups_joined_through_notes(self):
+        hashtable, _, _ = load_project_data()
+        groups, constraints = package_groups(hashtable, list(range(1, 41)))
+        self.assertIn([13, 14, 15, 16, 19, 20], groups)
+        self.assertEqual(sum(len(group) for group in groups), 40)
+        self.assertEqual(constraints[14].deliver_with, (15, 19))
+
+
+class TestAssignmentSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.hashtable, self.addresses, self.distances = load_project_data()
+        self.correction = datetime.timedelta(hours=10, minutes=20)
+        self.vehicles = project_fleet()
+        self.assignment = AssignmentSolver(self.hashtable, self.addresses, self.distances, DEPOT,
+                                           address_correction_time=self.correction).solve(self.vehicles)
+
+    def truck_of(self, package_id):
+        return next(vehicle_id for vehicle_id, shipments in self.assignment.items() if package_id in shipments)
+
+    def test_every_package_assigned_once_within_capacity(self):
+        assigned = [package_id for shipments in self.assignment.values() for package_id in shipments]
+        self.assertEqual(sorted(assigned), sorted(self.hashtable))
+        for vehicle in self.vehicles:
+            self.assertLessEqual(len(vehicle.shipments), vehicle.max_load)
+
+    def test_note_constraints_respected(self):
+        for package_id in (3, 18, 36, 38):
+            self.assertEqual(self.truck_of(package_id), 2)
+        self.assertEqual(len({self.truck_of(package_id) for package_id in (13, 14, 15, 16, 19, 20)}), 1)
+        for package_id in (6, 25, 28, 32):
+            self.assertGreaterEqual(self.vehicles[self.truck_of(package_id) - 1].departure_time,
+                                    datetime.timedelta(hours=9, minutes=5))
+        self.assertGreaterEqual(self.vehicles[self.truck_of(9) - 1].departure_time, self.correction)
+
+    def test_planned_routes_meet_deadlines(self):
+        planner = FleetPlanner(self.hashtable, self.addresses, self.distances, DEPOT)
+        for vehicle in self.vehicles:
+            planner.add_vehicle(vehicle)
+        planner.plan()
+        for package in self.hashtable.values():
+            deadline = parse_clock(package.deadline)
+            if deadline is not None:
+                self.assertLessEqual(package.delivery_time, deadline, package.package_id)
+
+    def test_project_fleet_meets_deadlines(self):
+        """Test that truck 3, which leaves when truck 1 or 2 is back, still reaches its deadlines."""
+        for optimizer, deadline_aware in ((None, False), (None, True), (RouteOptimizer(), False)):
+            hashtable, addresses, distances = load_project_data()
+            event_log = EventLog()
+            vehicles, _ = plan_deliveries(hashtable, addresses, distances, event_log, optimizer, assign=True,
+                                          deadline_aware=deadline_aware)
+            self.assertEqual(late_packages(hashtable), [])
+            first_back = min(event_log.vehicle_events(vehicle_id)[-1].time for vehicle_id in (1, 2))
+            self.assertEqual(event_log.vehicle_events(3)[0].time, max(vehicles[2].departure_time, first_back))
+
+    def test_start_after_must_come_first(self):
+        vehicles = project_fleet()
+        with self.assertRaises(ValueError):
+            AssignmentSolver(self.hashtable, self.addresses, self.distances, DEPOT).solve(vehicles,
+                                                                                          start_after={1: (3,)})
+
+    def test_conflicting_truck_restrictions_rejected(self):
+        self.hashtable.get(13).notes = "Can only be on truck 1"
+        self.hashtable.get(15).notes = "Can only be on truck 3"
+        with self.assertRaises(ValueError):
+            AssignmentSolver(self.hashtable, self.addresses, self.distances, DEPOT).solve(project_fleet())
+
+
+if __name__ == '__main__':
+    unittest.main()
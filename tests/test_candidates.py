@@ -0,0 +1,119 @@
+# test_candidates.py
+import datetime
+import unittest
+
+import numpy as np
+
+from candidates import CandidateIndex, candidate_index
+from distance_matrix import DistanceMatrix
+from event_log import EventLog
+from fleet_planner import FleetPlanner
+from main import calculate_route
+from route_optimizer import RouteOptimizer, path_length
+from test_fleet_planner import load_project_data, snapshot
+from vehicle import Vehicle
+
+DEPOT = "4001 South 700 East"
+
+
+def grid_matrix(size, seed=3):
+    # Random points on a small integer grid, so many distances tie
+    points = np.random.default_rng(seed).integers(0, 6, size=(size, 2))
+    return DistanceMatrix(np.abs(points[:, None, :] - points[None, :, :]).sum(axis=2).astype(float))
+
+
+def full_scan_order(distances, start_index, stop_indexes):
+    # The nearest-neighbour order of calculate_route without a candidate index
+    remaining, order, current = list(range(len(stop_indexes))), [], start_index
+    while remaining:
+        gaps = distances.values[current, [stop_indexes[position] for position in remaining]]
+        nearest = len(gaps) - 1 - int(np.argmin(gaps[::-1]))
+        order.append(remaining.pop(nearest))
+        current = stop_indexes[order[-1]]
+    return order, current
+
+
+class TestCandidateIndex(unittest.TestCase):
+
+    def test_neighbors_are_the_nearest_addresses(self):
+        distances = grid_matrix(30)
+        index = CandidateIndex(distances, 5)
+        self.assertEqual(index.neighbors.shape, (30, 5))
+        for row in range(30):
+            self.assertEqual(index.neighbor_distances[row, 0], 0.0)
+            self.assertTrue(np.all(np.diff(index.neighbor_distances[row]) >= 0))
+            others = np.setdiff1d(np.arange(30), index.neighbors[row])
+            self.assertTrue(np.all(distances.values[row, others] >= index.neighbor_distances[row, -1]))
+        self.assertTrue(CandidateIndex(distances, 50).complete)
+        with self.assertRaises(ValueError):
+            CandidateIndex(distances, 0)
+
+    def test_index_is_cached_per_matrix(self):
+        distances = grid_matrix(10)
+        self.assertIs(candidate_index(distances, 4), candidate_index(distances, 4))
+        self.assertIsNot(candidate_index(distances, 4), candidate_index(distances, 3))
+        self.assertIsNot(candidate_index(grid_matrix(10), 4), candidate_index(distances, 4))
+
+    def test_nearest_order_matches_the_full_scan(self):
+        """Test that candidates give exactly the full-scan order, ties and repeated addresses included."""
+        distances = grid_matrix(60)
+        stops = np.random.default_rng(5).integers(1, 60, size=80).tolist()
+        expected = full_scan_order(distances, 0, stops)
+        for k in (1, 4, 60):
+            index = CandidateIndex(distances, k)
+            self.assertEqual(index.nearest_order(distances, 0, stops), expected)
+
+    def test_falls_back_to_full_scans(self):
+        distances = grid_matrix(60)
+        stops = list(range(1, 60))
+        sparse, complete = CandidateIndex(distances, 2), CandidateIndex(distances, 60)
+        sparse.nearest_order(distances, 0, stops)
+        complete.nearest_order(distances, 0, stops)
+        self.assertGreater(sparse.full_scans, 0)
+        self.assertEqual(complete.full_scans, 0)
+
+
+class TestRoutingWithCandidates(unittest.TestCase):
+
+    def test_calculate_route_is_unchanged(self):
+        hashtable, addresses, distances = load_project_data()
+        shipments = [6, 18, 22, 21, 35, 36, 26, 19, 3, 39, 17, 12, 27, 38, 24, 23]
+        routes = []
+        for candidates in (None, candidate_index(distances, 3)):
+            vehicle = Vehicle(2, 16, 18, None, list(shipments), 0.0, datetime.timedelta(hours=10), DEPOT)
+            event_log = EventLog()
+            _, distance = calculate_route(vehicle, hashtable, addresses, distances, event_log, candidates=candidates)
+            routes.append((vehicle.shipments, distance, list(event_log)))
+        self.assertEqual(routes[0], routes[1])
+
+    def test_fleet_planner_workers_get_the_index(self):
+        plans = []
+        for workers, candidates in ((1, None), (2, 4)):
+            hashtable, addresses, distances = load_project_data()
+            planner = FleetPlanner(hashtable, addresses, distances, workers=workers,
+                                   candidates=candidates and candidate_index(distances, candidates))
+            for truck_id, shipments in ((1, list(range(1, 17))), (2, list(range(17, 33)))):
+                planner.add_vehicle(Vehicle(truck_id, 16, 18, None, shipments, 0.0, datetime.timedelta(hours=8),
+                                            DEPOT))
+            event_log = EventLog()
+            vehicles, _ = planner.plan(event_log)
+            plans.append(snapshot(vehicles, hashtable, event_log))
+        self.assertEqual(plans[0], plans[1])
+
+    def test_optimizer_with_candidates(self):
+        distances = grid_matrix(80)
+        stops = list(range(1, 80))
+        greedy = [stops[position] for position in full_scan_order(distances, 0, stops)[0]]
+        for k in (3, 80):
+            optimizer = RouteOptimizer(candidates=CandidateIndex(distances, k))
+            result = optimizer.improve(0, greedy, distances, group_sizes=[20, 59], end_index=0)
+            self.assertEqual(sorted(result.order[:20]), list(range(20)))
+            self.assertEqual(sorted(result.order), list(range(79)))
+            self.assertLessEqual(result.final_distance, result.initial_distance)
+            self.assertAlmostEqual(result.final_distance,
+                                   path_length([0] + [greedy[position] for position in result.order] + [0],
+                                               distances))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+# test_cli.py
+import contextlib
+import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import cli
+from candidates import CandidateIndex
+from event_log import EventLog
+from fleet_planner import FleetPlanner
+from main import plan_deliveries
+from status_board import StatusBoard
+from test_fleet_planner import load_project_data
+
+
+def run(*argv):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        code = cli.main(list(argv))
+    return code, out.getvalue()
+
+
+def run_in(directory, *argv):
+    return run('--plan', os.path.join(directory, 'project.plan.json'), '--cache', os.path.join(directory, 'plans'),
+               *argv)
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.plan_path = os.path.join(self.directory, 'project.plan.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_plan_and_report(self):
+        code, output = run_in(self.directory, 'plan')
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.exists(self.plan_path))
+        report = json.loads(output)
+        self.assertEqual(report['total_distance'], 106.7)
+        self.assertEqual([vehicle['vehicle_id'] for vehicle in report['vehicles']], [1, 2, 3])
+        self.assertEqual(report['late_packages'], [])
+
+        _, output = run_in(self.directory, 'report', '--at', '09:00:00')
+        report = json.loads(output)
+        self.assertEqual(report['total_mileage_at'], 18.0)
+
+    def test_plan_ndjson_lists_events(self):
+        _, output = run_in(self.directory, 'plan', '--format', 'ndjson')
+        events = [json.loads(line) for line in output.splitlines()]
+        # Package 6 is on the shipments of both truck 2 and truck 3
+        self.assertEqual(sum(event['kind'] == 'deliver' for event in events), 41)
+
+    def test_status_matches_status_board(self):
+        """Test that the statuses read from the plan file are the ones main computes in memory."""
+        hashtable, addresses, distances = load_project_data()
+        event_log = EventLog()
+        plan_deliveries(hashtable, addresses, distances, event_log)
+        board = StatusBoard.from_event_log(event_log, hashtable)
+
+        run_in(self.directory, 'plan')
+        for at in ('08:30:00', '09:00:00', '10:25:00', '13:00:00'):
+            _, output = run_in(self.directory, 'status', '--at', at, '--format', 'ndjson')
+            records = [json.loads(line) for line in output.splitlines()]
+            self.assertEqual([record['package_id'] for record in records], board.package_ids.tolist())
+            expected = board.statuses(datetime.datetime.strptime(at, '%H:%M:%S')).tolist()
+            self.assertEqual([record['status'] for record in records], expected)
+
+    def test_single_package(self):
+        run_in(self.directory, 'plan')
+        _, output = run_in(self.directory, 'status', '--at', '09:00', '--id', '6')
+        record = json.loads(output)
+        self.assertEqual((record['package_id'], record['status']), (6, 'At Hub'))
+
+        code, output = run_in(self.directory, 'status', '--at', '09:00', '--id', '99')
+        self.assertEqual((code, output), (1, ''))
+
+    def test_status_reads_saved_plan_without_planning(self):
+        run_in(self.directory, 'plan')
+        with mock.patch('cli.compute_plan', side_effect=AssertionError('re-planned')):
+            code, _ = run_in(self.directory, 'status', '--at', '09:00:00')
+        self.assertEqual(code, 0)
+
+    def test_plan_comes_from_cache(self):
+        run_in(self.directory, 'plan')
+        with mock.patch('cli.compute_plan', side_effect=AssertionError('re-planned')):
+            _, output = run_in(self.directory, 'plan')
+        self.assertEqual(json.loads(output)['total_distance'], 106.7)
+
+    def test_plan_with_candidates(self):
+        """Test that the candidate index reaches the fleet planner and leaves the greedy routes as they are."""
+        with mock.patch('main.FleetPlanner', wraps=FleetPlanner) as planner:
+            _, output = run_in(self.directory, 'plan', '--candidates')
+        self.assertIsInstance(planner.call_args.args[7], CandidateIndex)
+        report = json.loads(output)
+        self.assertTrue(report['options']['candidates'])
+        self.assertEqual(report['total_distance'], 106.7)
+
+    def test_options_select_cached_plan(self):
+        _, default_output = run_in(self.directory, 'plan')
+        _, aware_output = run_in(self.directory, 'plan', '--deadline-aware')
+        self.assertTrue(json.loads(aware_output)['options']['deadline_aware'])
+        # Status and report follow the plan made last
+        _, output = run_in(self.directory, 'report')
+        self.assertEqual(output, aware_output)
+
+        with mock.patch('cli.compute_plan', side_effect=AssertionError('re-planned')):
+            _, output = run_in(self.directory, 'plan')
+        self.assertEqual(output, default_output)
+
+    def test_unknown_key_is_looked_up_again(self):
+        run_in(self.directory, 'plan')
+        cli.save_plan(self.plan_path, 'not-a-key', dict(cli.DEFAULT_OPTIONS))
+        _, output = run_in(self.directory, 'report')
+        self.assertEqual(json.loads(output)['total_distance'], 106.7)
+        self.assertNotEqual(cli.load_plan(self.plan_path)[0], 'not-a-key')
+
+    def test_invalid_time(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            run_in(self.directory, 'status', '--at', '9 am')
+
+
+if __name__ == '__main__':
+    unittest.main()
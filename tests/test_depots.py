@@ -0,0 +1,143 @@
+# test_depots.py
+import contextlib
+import datetime
+import io
+import unittest
+
+from assignment import parse_constraints
+from depots import MultiDepotPlanner, assign_depots, main
+from event_log import EventLog
+from fleet_planner import FleetPlanner
+from main import mileage_summary
+from test_fleet_planner import load_project_data
+from time_windows import late_packages
+from vehicle import Vehicle
+
+HUB = "4001 South 700 East"
+WEST = "2010 W 500 S"
+EIGHT = datetime.timedelta(hours=8)
+
+
+def fleet(depots, trucks=2, capacity=16):
+    return {depot: [Vehicle(number * trucks + truck + 1, capacity, 18, None, [], 0.0, EIGHT, depot)
+                    for truck in range(trucks)]
+            for number, depot in enumerate(depots)}
+
+
+def planner_for(depot_vehicles, workers=1):
+    hashtable, addresses, distances = load_project_data()
+    planner = MultiDepotPlanner(hashtable, addresses, distances, workers,
+                                address_correction_time=datetime.timedelta(hours=10, minutes=20))
+    for vehicles in depot_vehicles.values():
+        for vehicle in vehicles:
+            planner.add_vehicle(vehicle)
+    return planner
+
+
+class TestAssignDepots(unittest.TestCase):
+
+    def setUp(self):
+        self.hashtable, self.addresses, self.distances = load_project_data()
+
+    def test_single_depot_takes_everything(self):
+        assignment = assign_depots(self.hashtable, self.addresses, self.distances, fleet([HUB], trucks=3))
+        self.assertEqual(sorted(assignment[HUB]), list(range(1, 41)))
+
+    def test_constraints_and_nearest_depot(self):
+        assignment = assign_depots(self.hashtable, self.addresses, self.distances, fleet([HUB, WEST], trucks=3))
+        depot_of = {package_id: depot for depot, package_ids in assignment.items() for package_id in package_ids}
+        self.assertEqual(sorted(depot_of), list(range(1, 41)))
+        self.assertEqual(sum(len(package_ids) for package_ids in assignment.values()), 40)
+
+        hub, west = self.addresses.index_of(HUB), self.addresses.index_of(WEST)
+        constraints = {package_id: parse_constraints(self.hashtable.get(package_id)) for package_id in depot_of}
+        grouped = {other for value in constraints.values() for other in value.deliver_with}
+        for package_id, depot in depot_of.items():
+            if constraints[package_id].truck is not None:
+                self.assertEqual(depot, HUB)  # trucks 1-3 are based at the hub
+            for other in constraints[package_id].deliver_with:
+                self.assertEqual(depot_of[other], depot)
+            value = constraints[package_id]
+            if (value.truck, value.available_at, value.deliver_with, value.deadline, value.wrong_address) \
+                    == (None, None, (), None, False) and package_id not in grouped:
+                # With room everywhere, a package without constraints goes to its nearest depot
+                stop = self.addresses.index_of(self.hashtable.get(package_id).address)
+                to_hub, to_west = self.distances.distance(hub, stop), self.distances.distance(west, stop)
+                if to_hub != to_west:
+                    self.assertEqual(depot, HUB if to_hub < to_west else WEST)
+        self.assertTrue(assignment[WEST])
+
+    def test_fleet_too_small(self):
+        with self.assertRaises(ValueError):
+            assign_depots(self.hashtable, self.addresses, self.distances, fleet([HUB, WEST], trucks=1, capacity=10))
+
+    def test_restricted_truck_missing(self):
+        depot_vehicles = {HUB: [Vehicle(5, 40, 18, None, [], 0.0, EIGHT, HUB)]}
+        with self.assertRaises(ValueError):
+            assign_depots(self.hashtable, self.addresses, self.distances, depot_vehicles)
+
+
+class TestMultiDepotPlanner(unittest.TestCase):
+
+    def test_routes_start_and_end_at_home_depots(self):
+        planner = planner_for(fleet([HUB, WEST]))
+        event_log = EventLog()
+        plan = planner.plan(event_log)
+
+        self.assertAlmostEqual(sum(plan.depot_distances.values()), plan.total_distance)
+        self.assertEqual(late_packages(planner.hashtable), [])
+        self.assertTrue(all(package.delivery_time is not None for package in planner.hashtable.values()))
+        for vehicle in plan.vehicles:
+            depot_index = planner.addresses.index_of(vehicle.depot_address)
+            events = event_log.vehicle_events(vehicle.id)
+            self.assertEqual(events[0].address_index, depot_index)
+            self.assertEqual(events[-1].kind, 'return')
+            self.assertEqual(events[-1].address_index, depot_index)
+            self.assertTrue(set(int(key) for key in vehicle.shipments) <= set(plan.assignment[vehicle.depot_address]))
+
+    def test_parallel_matches_sequential(self):
+        plans = [planner_for(fleet([HUB, WEST]), workers).plan(EventLog()) for workers in (1, 2)]
+        self.assertEqual(plans[0].depot_distances, plans[1].depot_distances)
+        self.assertEqual([vehicle.shipments for vehicle in plans[0].vehicles],
+                         [vehicle.shipments for vehicle in plans[1].vehicles])
+
+    def test_unknown_depot(self):
+        hashtable, addresses, distances = load_project_data()
+        planner = MultiDepotPlanner(hashtable, addresses, distances)
+        with self.assertRaises(ValueError):
+            planner.add_vehicle(Vehicle(1, 16, 18, None, [], 0.0, EIGHT, "1 Nowhere Road"))
+
+    def test_mileage_summary_lists_depots(self):
+        planner = planner_for(fleet([HUB, WEST]))
+        event_log = EventLog()
+        plan = planner.plan(event_log)
+        lines = mileage_summary(plan.vehicles, plan.total_distance, event_log, plan.depot_distances)
+        self.assertEqual(sum(line.startswith("Depot ") for line in lines), 2)
+        self.assertEqual(lines[-1], f"Total distance traveled: {round(plan.total_distance, 1)}")
+        single = mileage_summary(plan.vehicles, plan.total_distance, event_log)
+        self.assertFalse(any(line.startswith("Depot ") for line in single))
+
+    def test_command_line(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            main([])
+        self.assertTrue(out.getvalue().splitlines()[-1].startswith("Total distance traveled: "))
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors), self.assertRaises(SystemExit) as exit:
+            main(["--trucks", "1"])
+        self.assertEqual(exit.exception.code, 2)
+        self.assertIn("which is not in the fleet", errors.getvalue())
+
+
+class TestFleetPlannerDepots(unittest.TestCase):
+
+    def test_start_after_must_share_the_depot(self):
+        hashtable, addresses, distances = load_project_data()
+        planner = FleetPlanner(hashtable, addresses, distances)
+        planner.add_vehicle(Vehicle(1, 16, 18, None, [1], 0.0, EIGHT, HUB))
+        with self.assertRaises(ValueError):
+            planner.add_vehicle(Vehicle(2, 16, 18, None, [2], 0.0, EIGHT, WEST), start_after=(1,))
+
+
+if __name__ == '__main__':
+    unittest.main()
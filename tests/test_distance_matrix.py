@@ -0,0 +1,65 @@
+# test_distance_matrix.py
+import datetime
+import math
+import unittest
+
+import numpy as np
+
+from distance_matrix import DistanceMatrix
+from HashTable import HashTable
+from main import (load_distance_data, load_address_data, load_packages_into_hash, calculate_route,
+                  distance_between_addresses)
+from address_registry import AddressRegistry
+from vehicle import Vehicle
+
+
+class TestDistanceMatrix(unittest.TestCase):
+
+    def test_mirrors_lower_triangle(self):
+        """Test that a lower-triangular table is filled into both halves."""
+        matrix = DistanceMatrix.from_rows([[0.0, None, None], [7.2, 0.0, None], [3.8, 7.1, 0.0]])
+        self.assertEqual(matrix.distance(0, 1), 7.2)
+        self.assertEqual(matrix.distance(1, 0), 7.2)
+        self.assertEqual(matrix[2][1], matrix[1][2])
+        np.testing.assert_array_equal(matrix.row(0), [0.0, 7.2, 3.8])
+
+    def test_undefined_pairs(self):
+        """Test that pairs missing in both halves are infinite and reported as undefined."""
+        matrix = DistanceMatrix.from_rows([[0.0], [None, 0.0]])
+        self.assertTrue(math.isinf(matrix.distance(0, 1)))
+        rows = [(0, "A", "1 A St"), (1, "B", "2 B St")]
+        self.assertIsNone(distance_between_addresses(0, 1, matrix, rows)[2])
+
+    def test_float32_layout(self):
+        """Test that a float32 matrix uses half the memory of a float64 one."""
+        rows = [[0.0], [1.5, 0.0]]
+        self.assertEqual(DistanceMatrix.from_rows(rows, np.float32).nbytes * 2,
+                         DistanceMatrix.from_rows(rows).nbytes)
+
+    def test_rejects_non_square(self):
+        with self.assertRaises(ValueError):
+            DistanceMatrix(np.zeros((2, 3)))
+
+
+class TestCalculateRoute(unittest.TestCase):
+
+    def test_route_on_project_data(self):
+        """Test that the greedy route over the project data keeps its known mileage."""
+        hashtable = HashTable()
+        load_packages_into_hash(hashtable, 'Data/Packages.csv')
+        distances = load_distance_data('Data/Distances.csv')
+        addresses = AddressRegistry(load_address_data('Data/Addresses.csv'))
+        vehicle = Vehicle(1, 16, 18, None, [15, 37, 31, 16, 29, 34, 40, 14, 1, 13, 20, 30], 0.0,
+                          datetime.timedelta(hours=8), "4001 South 700 East")
+
+        vehicle, distance = calculate_route(vehicle, hashtable, addresses, distances)
+
+        self.assertAlmostEqual(distance, 29.7, places=6)
+        self.assertEqual(vehicle.shipments[:3], ['14', '34', '16'])
+        last = hashtable.get(int(vehicle.shipments[-1]))
+        self.assertEqual(last.delivery_time, vehicle.current_time)
+        self.assertEqual(last.departure_time, datetime.timedelta(hours=8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# test_event_log.py
+import datetime
+import unittest
+
+from address_registry import AddressRegistry
+from event_log import EventLog, LOAD, DEPART, DELIVER, RETURN
+from HashTable import HashTable
+from main import (load_packages_into_hash, load_distance_data, load_address_data, calculate_route,
+                  calculate_return_trip)
+from status_board import StatusBoard
+from vehicle import Vehicle
+
+
+def hours(value):
+    return datetime.timedelta(hours=value)
+
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        self.log = EventLog()
+        # Vehicle 2 is recorded first but starts later, as in main()
+        self.log.record(DEPART, 2, None, 0, hours(10), 0.0)
+        self.log.record(DELIVER, 2, 7, 5, hours(11), 18.0)
+        self.log.record(DEPART, 1, None, 0, hours(8), 0.0)
+        self.log.record(DELIVER, 1, 3, 4, hours(9), 18.0)
+        self.log.record(RETURN, 1, None, 0, hours(9.5), 27.0)
+
+    def test_events_until(self):
+        self.assertEqual([event.kind for event in self.log.events_until(hours(9))], [DEPART, DELIVER])
+        self.assertEqual(len(self.log.events_until(hours(7))), 0)
+        self.assertEqual(len(self.log.events_until(hours(12))), 5)
+
+    def test_position_at(self):
+        self.assertIsNone(self.log.position_at(2, hours(9)))
+        self.assertEqual(self.log.position_at(1, hours(9.25)), 4)
+        self.assertEqual(self.log.position_at(1, hours(12)), 0)
+
+    def test_mileage_at(self):
+        self.assertEqual(self.log.mileage_at(1, hours(7)), 0.0)
+        self.assertAlmostEqual(self.log.mileage_at(1, hours(8.5)), 9.0)
+        self.assertEqual(self.log.mileage_at(1, hours(12)), 27.0)
+        self.assertAlmostEqual(self.log.total_mileage_at(hours(10.5)), 27.0 + 9.0)
+
+
+class TestRouteEvents(unittest.TestCase):
+
+    def test_route_records_events(self):
+        """Test that a simulated route logs loads, a departure, deliveries and the return to the depot."""
+        hashtable = HashTable()
+        load_packages_into_hash(hashtable, 'Data/Packages.csv')
+        addresses = AddressRegistry(load_address_data('Data/Addresses.csv'))
+        distances = load_distance_data('Data/Distances.csv')
+        shipments = [15, 37, 31, 16, 29, 34, 40, 14, 1, 13, 20, 30]
+        vehicle = Vehicle(1, 16, 18, None, list(shipments), 0.0, hours(8), "4001 South 700 East")
+        log = EventLog()
+
+        vehicle, distance = calculate_route(vehicle, hashtable, addresses, distances, log)
+        vehicle, return_time = calculate_return_trip(vehicle, vehicle.current_address, "4001 South 700 East",
+                                                     distances, addresses, log)
+
+        kinds = [event.kind for event in log]
+        self.assertEqual(kinds.count(LOAD), len(shipments))
+        self.assertEqual(kinds.count(DELIVER), len(shipments))
+        self.assertEqual(kinds[-1], RETURN)
+        self.assertEqual(log.mileage_at(1, return_time), vehicle.total_distance)
+        self.assertEqual(log.position_at(1, return_time), 0)
+
+        from_log = StatusBoard.from_event_log(log, hashtable)
+        from_packages = StatusBoard.from_packages(hashtable)
+        at = datetime.time(9, 0)
+        self.assertEqual(list(from_log.statuses(at)), list(from_packages.statuses(at)))
+
+
+if __name__ == '__main__':
+    unittest.main()
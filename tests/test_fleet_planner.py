@@ -0,0 +1,53 @@
+# test_fleet_planner.py
+import datetime
+import unittest
+
+from address_registry import AddressRegistry
+from event_log import EventLog
+from fleet_planner import FleetPlanner
+from HashTable import HashTable
+from main import load_packages_into_hash, load_distance_data, load_address_data, plan_deliveries
+from vehicle import Vehicle
+
+
+def load_project_data():
+    hashtable = HashTable()
+    load_packages_into_hash(hashtable, 'Data/Packages.csv')
+    return (hashtable, AddressRegistry(load_address_data('Data/Addresses.csv')),
+            load_distance_data('Data/Distances.csv'))
+
+
+def snapshot(vehicles, hashtable, event_log):
+    return ([(vehicle.shipments, vehicle.current_time, vehicle.total_distance) for vehicle in vehicles],
+            [(package.departure_time, package.delivery_time) for package in hashtable.values()],
+            list(event_log))
+
+
+class TestFleetPlanner(unittest.TestCase):
+
+    def test_process_pool_matches_sequential(self):
+        """Test that routes computed in worker processes give exactly the sequential plan."""
+        plans = []
+        for workers in (1, 2):
+            hashtable, addresses, distances = load_project_data()
+            event_log = EventLog()
+            vehicles, total_distance = plan_deliveries(hashtable, addresses, distances, event_log, workers=workers)
+            plans.append((round(total_distance, 6), snapshot(vehicles, hashtable, event_log)))
+        self.assertEqual(plans[0], plans[1])
+        self.assertEqual(plans[0][0], 106.7)
+
+    def test_dependent_vehicle_waits_for_first_return(self):
+        hashtable, addresses, distances = load_project_data()
+        vehicles, _ = plan_deliveries(hashtable, addresses, distances)
+        self.assertEqual(vehicles[2].start_time, min(vehicles[0].current_time, vehicles[1].current_time))
+
+    def test_rejects_unknown_dependency(self):
+        hashtable, addresses, distances = load_project_data()
+        planner = FleetPlanner(hashtable, addresses, distances)
+        vehicle = Vehicle(1, 16, 18, None, [1], 0.0, datetime.timedelta(hours=8), "4001 South 700 East")
+        with self.assertRaises(ValueError):
+            planner.add_vehicle(vehicle, start_after=(7,))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# test_hashtable.py
+import unittest
+
+from HashTable import HashTable, OpenAddressingHashTable
+
+
+# The same behaviour is expected from both hash table implementations, so the tests live in a mixin.
+class HashTableBehaviour:
+    table_class = None
+
+    def test_set_get_overwrite(self):
+        table = self.table_class()
+        for key in range(100):
+            table.set(key, f"package {key}")
+        table.set(7, "updated")
+        self.assertEqual(table.size, 100)
+        self.assertEqual(table.get(7), "updated")
+        self.assertEqual(table.get(99), "package 99")
+        self.assertIsNone(table.get(100))
+
+    def test_delete(self):
+        table = self.table_class()
+        table.set(1, "a")
+        table.set(2, "b")
+        self.assertTrue(table.delete(1))
+        self.assertFalse(table.delete(1))
+        self.assertIsNone(table.get(1))
+        self.assertEqual(table.get(2), "b")
+        self.assertEqual(table.size, 1)
+
+    def test_constructor_items(self):
+        table = self.table_class([(1, "a"), (2, "b")])
+        self.assertEqual(len(table), 2)
+
+    def test_iteration_api(self):
+        table = self.table_class.from_iterable(((key, str(key)) for key in range(50)), size_hint=50)
+        self.assertEqual(len(table), 50)
+        self.assertEqual(sorted(table), list(range(50)))
+        self.assertEqual(dict(table.items())[42], "42")
+        self.assertEqual(sorted(table.values(), key=int)[:2], ["0", "1"])
+        table.set(99, None)
+        self.assertIn(99, table)
+        self.assertNotIn(100, table)
+
+    def test_bulk_update_sizes_once(self):
+        """Test that a sized bulk load never needs to grow the table while inserting."""
+        table = self.table_class()
+        table.reserve(10_000)
+        capacity = table.capacity
+        table.update([(key, key) for key in range(10_000)])
+        self.assertEqual(table.capacity, capacity)
+        self.assertEqual(table.get(9_999), 9_999)
+
+    def test_string_keys(self):
+        table = self.table_class()
+        table.set("4001 South 700 East", 0)
+        self.assertEqual(table.get("4001 South 700 East"), 0)
+
+
+class TestHashTable(HashTableBehaviour, unittest.TestCase):
+    table_class = HashTable
+
+
+class TestOpenAddressingHashTable(HashTableBehaviour, unittest.TestCase):
+    table_class = OpenAddressingHashTable
+
+    def test_colliding_keys_survive_delete(self):
+        """Test that a tombstone keeps later keys in the same probe sequence reachable."""
+        table = OpenAddressingHashTable()
+        capacity = table.capacity
+        table.set(1, "a")
+        table.set(1 + capacity, "b")
+        table.set(1 + 2 * capacity, "c")
+        table.delete(1 + capacity)
+        self.assertEqual(table.get(1 + 2 * capacity), "c")
+        self.assertEqual(table.tombstones, 1)
+
+        table.set(1 + 3 * capacity, "d")  # reuses the tombstone
+        self.assertEqual(table.tombstones, 0)
+        self.assertEqual(table.get(1 + 3 * capacity), "d")
+
+    def test_shrinks_after_deletes(self):
+        table = OpenAddressingHashTable()
+        for key in range(1000):
+            table.set(key, key)
+        grown = table.capacity
+        for key in range(990):
+            table.delete(key)
+        self.assertLess(table.capacity, grown)
+        self.assertEqual([table.get(key) for key in range(990, 1000)], list(range(990, 1000)))
+
+    def test_churn_does_not_grow(self):
+        """Test that inserting and deleting the same number of keys reuses slots instead of growing."""
+        table = OpenAddressingHashTable()
+        for key in range(5):
+            table.set(key, key)
+        for key in range(5, 100):
+            table.set(key, key)
+            table.delete(key - 5)
+        capacity = table.capacity
+        for key in range(100, 10_000):
+            table.set(key, key)
+            table.delete(key - 5)
+        self.assertEqual(table.capacity, capacity)
+        self.assertEqual(table.size, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# test_incremental_router.py
+import datetime
+import unittest
+
+import numpy as np
+
+from event_log import EventLog, DELIVER
+from incremental_router import IncrementalRoute
+from main import plan_deliveries
+from route_optimizer import path_length
+from test_fleet_planner import load_project_data
+
+
+def hours(value):
+    return datetime.timedelta(hours=value)
+
+
+class TestIncrementalRoute(unittest.TestCase):
+
+    def setUp(self):
+        # Stops on a line one mile apart, driven at 1 mph from 8:00 and back to address 0
+        self.values = np.abs(np.subtract.outer(np.arange(10.0), np.arange(10.0)))
+        self.route = IncrementalRoute(1, 0, hours(8), 1.0, [(101, 2), (102, 4), (103, 6), (104, 8)], self.values,
+                                      end_index=0)
+
+    def check_mileage(self):
+        path = [self.route.start_index] + self.route.indexes
+        self.assertAlmostEqual(float(self.route.mileage[-1]), path_length(path, self.route.distances))
+
+    def test_fixed_count_includes_leg_in_progress(self):
+        self.assertEqual(self.route.fixed_count(hours(8)), 0)
+        self.assertEqual(self.route.fixed_count(hours(9)), 1)
+        self.assertEqual(self.route.fixed_count(hours(10)), 1)
+        self.assertEqual(self.route.fixed_count(hours(10.5)), 2)
+
+    def test_insert_uses_cheapest_position_after_fixed_stops(self):
+        self.route.insert(105, 5, hours(8))
+        self.assertEqual(self.route.package_ids, [101, 102, 105, 103, 104])
+        self.assertEqual(self.route.total_distance(), 16.0)
+        self.check_mileage()
+
+        # At 8:30 the vehicle is already driving to address 2, so address 1 can only come later
+        self.route.insert(106, 1, hours(8.5))
+        self.assertEqual(self.route.package_ids[0], 101)
+        self.check_mileage()
+
+    def test_history_is_unchanged(self):
+        at = hours(12.5)
+        fixed = self.route.fixed_count(at)
+        history = self.route.stops()[:fixed]
+        self.route.insert(105, 3, at)
+        self.route.update_address(104, 7, at)
+        self.route.remove(105, at)
+        self.assertEqual(self.route.stops()[:fixed], history)
+        self.check_mileage()
+
+    def test_cannot_change_delivered_package(self):
+        with self.assertRaises(ValueError):
+            self.route.remove(101, hours(11))
+        with self.assertRaises(ValueError):
+            self.route.remove(999, hours(8))
+
+
+class TestProjectAddressCorrection(unittest.TestCase):
+
+    def test_package_9_corrected_at_10_20(self):
+        hashtable, addresses, distances = load_project_data()
+        event_log = EventLog()
+        vehicles, _ = plan_deliveries(hashtable, addresses, distances, event_log)
+        vehicle = next(vehicle for vehicle in vehicles if '9' in vehicle.shipments)
+        at = hours(10 + 20 / 60)
+        corrected = addresses.index_of("300 State St")
+        planned_time = hashtable.get(9).delivery_time
+
+        route = IncrementalRoute.from_event_log(event_log, vehicle.id, vehicle.velocity, distances)
+        planned_route = list(zip(route.package_ids, route.indexes))
+        self.assertNotEqual(route.indexes[route.package_ids.index(9)], corrected)
+        before = [event for event in event_log.vehicle_events(vehicle.id) if event.time <= at]
+        route.update_address(9, corrected, at)
+        route.apply(hashtable, at, event_log)
+
+        self.assertNotEqual(list(zip(route.package_ids, route.indexes)), planned_route)
+        self.assertIn((9, corrected), zip(route.package_ids, route.indexes))
+        events = event_log.vehicle_events(vehicle.id)
+        self.assertEqual([event for event in events if event.time <= at], before)
+        deliveries = [event for event in events if event.kind == DELIVER and event.package_id == 9]
+        self.assertEqual(len(deliveries), 1)
+        self.assertEqual(deliveries[0].address_index, corrected)
+        self.assertNotEqual(deliveries[0].time, planned_time)
+        self.assertEqual(hashtable.get(9).delivery_time, deliveries[0].time)
+
+
+if __name__ == '__main__':
+    unittest.main()
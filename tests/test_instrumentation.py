@@ -0,0 +1,149 @@
+# test_instrumentation.py
+import contextlib
+import io
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+import instrumentation
+import main
+from address_registry import AddressRegistry
+from event_log import EventLog
+from HashTable import HashTable, OpenAddressingHashTable
+from main import plan_deliveries
+from status_board import StatusBoard
+from test_cli import run_in
+from test_fleet_planner import load_project_data
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_counts_stages_and_hot_functions(self):
+        hashtable, addresses, distances = load_project_data()
+        with instrumentation.instrumented() as metrics:
+            _, total_distance = plan_deliveries(hashtable, addresses, distances, EventLog())
+        self.assertEqual(round(total_distance, 1), 106.7)
+
+        rows, counters = metrics.summary()
+        calls = {name: count for name, _, count, _, _ in rows}
+        self.assertEqual(calls['plan_deliveries'], 1)
+        self.assertEqual(calls['calculate_route'], 3)
+        self.assertEqual(calls['calculate_return_trip'], 2)  # truck 3 does not come back
+        self.assertGreater(calls['extract_address'], 40)
+        self.assertGreater(calls['DistanceMatrix.row'], 0)
+        self.assertGreaterEqual(counters['HashTable.probes'], calls['HashTable.get'])
+        # Stages are listed before hot functions
+        kinds = [kind for _, kind, _, _, _ in rows]
+        self.assertEqual(kinds, sorted(kinds, key=lambda kind: kind != 'stage'))
+        self.assertIn('calculate_route', metrics.summary_table())
+
+    def test_disable_restores_the_originals(self):
+        originals = (main.calculate_route, main.extract_address, HashTable.get, AddressRegistry.index_of,
+                     StatusBoard.__dict__['from_event_log'])
+        instrumentation.enable()
+        self.assertIsNot(main.calculate_route, originals[0])
+        self.assertIsNot(HashTable.get, originals[2])
+        with self.assertRaises(ValueError):
+            instrumentation.enable()
+        metrics = instrumentation.disable()
+        self.assertEqual((main.calculate_route, main.extract_address, HashTable.get, AddressRegistry.index_of,
+                          StatusBoard.__dict__['from_event_log']), originals)
+        self.assertIsNone(instrumentation.disable())
+        self.assertEqual(metrics.summary()[0], [])
+
+    def test_wrapped_class_method_still_works(self):
+        hashtable, addresses, distances = load_project_data()
+        event_log = EventLog()
+        plan_deliveries(hashtable, addresses, distances, event_log)
+        with instrumentation.instrumented() as metrics:
+            board = StatusBoard.from_event_log(event_log, hashtable)
+        self.assertEqual(len(board), 40)
+        self.assertEqual(metrics.timers['StatusBoard.from_event_log'][0], 1)
+
+    def test_counts_collisions(self):
+        table = HashTable()
+        table.reserve(16)
+        for key in (1, 33, 65):  # one bucket of a 32-bucket table
+            table.set(key, str(key))
+        with instrumentation.instrumented() as metrics:
+            table.get(65)
+            table.get(1)
+        self.assertEqual(metrics.counters['HashTable.probes'], 4)
+        self.assertEqual(metrics.counters['HashTable.collisions'], 1)
+
+    def test_misses_compare_only_the_chain(self):
+        table = HashTable()
+        table.reserve(16)
+        for key in (1, 33, 65):  # a chain of three in bucket 1 of a 32-bucket table
+            table.set(key, str(key))
+        with instrumentation.instrumented() as metrics:
+            table.get(97)  # same bucket, not in the table
+            table.get(2)  # empty bucket
+            table.set(97, '97')  # a new key at the end of the chain
+            table.set(33, 'again')  # an existing key, second in the chain
+        self.assertEqual(metrics.counters['HashTable.probes'], 3 + 0 + 3 + 2)
+        self.assertEqual(metrics.counters['HashTable.misses'], 3)
+        self.assertEqual(metrics.counters['HashTable.collisions'], 1)
+        self.assertEqual(table.get(97), '97')
+
+
+class TestHashTableStats(unittest.TestCase):
+
+    def test_chained_stats(self):
+        table = HashTable()
+        for key in range(100):
+            table.set(key, key)
+        stats = table.stats()
+        self.assertEqual(stats.size, 100)
+        self.assertEqual(stats.capacity, 160)
+        self.assertEqual(stats.resizes, 4)
+        self.assertAlmostEqual(stats.load, 100 / 160)
+        self.assertEqual(stats.max_load, 0.75)
+        self.assertEqual((stats.longest_chain, stats.collisions), (1, 0))
+
+        table.set(160, 'same bucket as 0')
+        self.assertEqual((table.stats().longest_chain, table.stats().collisions), (2, 1))
+
+    def test_reserve_is_one_resize(self):
+        table = HashTable.from_iterable(((key, key) for key in range(1000)), size_hint=1000)
+        self.assertEqual(table.stats().resizes, 1)
+
+    def test_open_addressing_stats(self):
+        table = OpenAddressingHashTable()
+        for key in (0, 8, 16):  # all start probing at slot 0
+            table.set(key, key)
+        stats = table.stats()
+        self.assertEqual((stats.size, stats.capacity, stats.resizes), (3, 8, 0))
+        self.assertEqual((stats.longest_chain, stats.collisions), (3, 2))
+        for key in range(3, 10):
+            table.set(key * 100 + 1, key)
+        self.assertGreater(table.stats().resizes, 0)
+
+
+class TestCommandLineFlags(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_instrument_and_profile(self):
+        profile_path = os.path.join(self.directory, 'plan.pstats')
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            code, _ = run_in(self.directory, '--instrument', '--profile', profile_path, 'plan')
+        self.assertEqual(code, 0)
+        self.assertIn('calculate_route', errors.getvalue())
+        self.assertIn('HashTable.probes', errors.getvalue())
+        self.assertIsNone(instrumentation.active())
+        self.assertGreater(pstats.Stats(profile_path).total_calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+# test_package.py
+import unittest
+
+from package import Package
+
+
+class TestPackage(unittest.TestCase):
+
+    def make_package(self, package_id):
+        # Build the strings at run time so they are distinct objects, as they are when read from a CSV file.
+        return Package(str(package_id), "".join(["410 S ", "State St"]), "".join(["Salt Lake ", "City"]),
+                       "UT", "8411" + "1", "EOD", "2", "")
+
+    def test_repeated_strings_are_shared(self):
+        first, second = self.make_package(1), self.make_package(2)
+        self.assertIs(first.city, second.city)
+        self.assertIs(first.address, second.address)
+        self.assertIs(first.zip_code, second.zip_code)
+
+    def test_slots_keep_attribute_api(self):
+        package = self.make_package(1)
+        self.assertFalse(hasattr(package, '__dict__'))
+        package.status = "Delivered"
+        package.delivered = True
+        self.assertEqual(package.status, "Delivered")
+        with self.assertRaises(AttributeError):
+            package.unknown_attribute = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# test_package_loader.py
+import os
+import tempfile
+import unittest
+
+from HashTable import HashTable
+from package_loader import iter_package_rows, stream_packages
+
+
+class TestStreamPackages(unittest.TestCase):
+
+    def setUp(self):
+        rows = ["Package ID,Address,City,State,Zip,Deadline,Weight,Notes"]
+        rows += [f"{i},195 W Oakland Ave,Salt Lake City,UT,84115,EOD,{i},\n" for i in range(1, 26)]
+        rows += ["abc,195 W Oakland Ave,Salt Lake City,UT,84115,EOD,1,", "26,too,few", ""]
+        tmpfile = tempfile.NamedTemporaryFile("w+", delete=False, newline='')
+        tmpfile.write("\n".join(rows))
+        tmpfile.close()
+        self.filename = tmpfile.name
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_chunks_are_bounded(self):
+        chunks = list(iter_package_rows(self.filename, chunk_size=10))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        self.assertEqual(chunks[0][0][0], 1)
+
+    def test_callback_sink_and_stats(self):
+        """Test that a callback receives every chunk and that skipped rows are counted, not printed."""
+        batches = []
+        stats = stream_packages(self.filename, batches.append, chunk_size=10)
+        self.assertEqual(stats.rows_loaded, 25)
+        self.assertEqual(stats.rows_skipped, 2)
+        self.assertEqual(stats.chunks, 3)
+        self.assertGreater(stats.rows_per_second, 0)
+        self.assertEqual(batches[2][-1][1].package_id, "25")
+
+    def test_hash_table_sink(self):
+        hashtable = HashTable()
+        stream_packages(self.filename, hashtable, chunk_size=7)
+        self.assertEqual(len(hashtable), 25)
+        self.assertEqual(hashtable.get(13).weight, "13")
+
+
+if __name__ == '__main__':
+    unittest.main()
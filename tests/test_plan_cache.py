@@ -0,0 +1,98 @@
+# test_plan_cache.py
+import os
+import shutil
+import tempfile
+import unittest
+
+from event_log import EventLog
+from main import plan_deliveries
+from plan_cache import CACHE_VERSION, PlanCache, content_digest, plan_key, plan_record, restore_plan
+from test_fleet_planner import load_project_data
+from vehicle import PROJECT_FLEET
+
+DATA_FILES = {"distances": "Data/Distances.csv", "addresses": "Data/Addresses.csv", "packages": "Data/Packages.csv"}
+OPTIONS = {"optimize": False, "deadline_aware": False, "assign": False}
+
+
+class TestPlanKey(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def test_digest_ignores_formatting(self):
+        plain = self.write('plain.csv', b"1,a\n2,b\n")
+        formatted = self.write('formatted.csv', b"1,a  \r\n\r\n2,b\r\n\n")
+        changed = self.write('changed.csv', b"1,a\n2,c\n")
+        self.assertEqual(content_digest(plain), content_digest(formatted))
+        self.assertNotEqual(content_digest(plain), content_digest(changed))
+
+    def test_key_covers_data_fleet_and_options(self):
+        key = plan_key(DATA_FILES, PROJECT_FLEET, OPTIONS)
+        self.assertEqual(key, plan_key(dict(reversed(list(DATA_FILES.items()))), PROJECT_FLEET, dict(OPTIONS)))
+        self.assertNotEqual(key, plan_key(DATA_FILES, PROJECT_FLEET, dict(OPTIONS, optimize=True)))
+        self.assertNotEqual(key, plan_key(DATA_FILES, PROJECT_FLEET[:2], OPTIONS))
+        packages = self.write('Packages.csv', open('Data/Packages.csv', 'rb').read().replace(b"EOD", b"5:00 PM", 1))
+        self.assertNotEqual(key, plan_key(dict(DATA_FILES, packages=packages), PROJECT_FLEET, OPTIONS))
+
+
+class TestPlanCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = PlanCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_restore_matches_planned(self):
+        """Test that a cached plan restores the same vehicles, package times and events as planning."""
+        hashtable, addresses, distances = load_project_data()
+        event_log = EventLog()
+        vehicles, total_distance = plan_deliveries(hashtable, addresses, distances, event_log)
+        self.cache.put('plan', plan_record(vehicles, total_distance, hashtable, event_log, OPTIONS))
+
+        restored_table, _, _ = load_project_data()
+        restored_log = EventLog()
+        restored, restored_distance = restore_plan(self.cache.get('plan'), restored_table, restored_log)
+
+        self.assertEqual(restored_distance, round(total_distance, 1))
+        self.assertEqual([(vehicle.id, vehicle.shipments, vehicle.current_time) for vehicle in restored],
+                         [(vehicle.id, vehicle.shipments, vehicle.current_time) for vehicle in vehicles])
+        self.assertEqual([(package.departure_time, package.delivery_time) for package in restored_table.values()],
+                         [(package.departure_time, package.delivery_time) for package in hashtable.values()])
+        self.assertEqual(list(restored_log), list(event_log))
+
+    def test_miss_and_corrupt_entry(self):
+        self.assertIsNone(self.cache.get('missing'))
+        with open(os.path.join(self.directory, 'broken.json'), 'w') as file:
+            file.write('{"version": 1, ')
+        self.assertIsNone(self.cache.get('broken'))
+        self.assertNotIn('broken', self.cache)
+        self.cache.put('old', {"version": CACHE_VERSION - 1})  # an older version of the records
+        self.assertIsNone(self.cache.get('old'))
+
+    def test_least_recently_used_is_evicted(self):
+        record = {"version": CACHE_VERSION, "payload": "x" * 1000}
+        for number, key in enumerate(('a', 'b', 'c')):
+            self.cache.put(key, record)
+            os.utime(os.path.join(self.directory, f'{key}.json'), ns=(number * 10 ** 9, number * 10 ** 9))
+        size = os.path.getsize(os.path.join(self.directory, 'a.json'))
+
+        self.cache.get('a')  # 'a' becomes the most recently used
+        self.cache.max_bytes = 3 * size
+        self.cache.put('d', record)
+        self.assertEqual(sorted(self.cache.keys()), ['a', 'c', 'd'])
+        self.assertEqual(len(self.cache), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# test_route_optimizer.py
+import datetime
+import unittest
+
+import numpy as np
+
+from address_registry import AddressRegistry
+from distance_matrix import DistanceMatrix
+from HashTable import HashTable
+from main import load_packages_into_hash, load_distance_data, load_address_data, calculate_route
+from route_optimizer import RouteOptimizer, path_length
+from vehicle import Vehicle
+
+
+def line_matrix(size):
+    # Addresses on a straight line: the distance between i and j is |i - j|
+    positions = np.arange(size, dtype=float)
+    return DistanceMatrix(np.abs(positions[:, None] - positions[None, :]))
+
+
+class TestRouteOptimizer(unittest.TestCase):
+
+    def test_untangles_route(self):
+        distances = line_matrix(8)
+        stops = [4, 1, 6, 2, 7, 3, 5]
+        result = RouteOptimizer().improve(0, stops, distances)
+        self.assertEqual([stops[position] for position in result.order], [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(result.final_distance, 7.0)
+        self.assertEqual(result.initial_distance, path_length([0] + stops, distances))
+
+    def test_groups_keep_their_order(self):
+        """Test that stops never move from the second group into the first."""
+        distances = line_matrix(8)
+        stops = [7, 5, 6, 1, 3, 2, 4]
+        result = RouteOptimizer().improve(0, stops, distances, group_sizes=[3, 4])
+        self.assertEqual(sorted(result.order[:3]), [0, 1, 2])
+        self.assertEqual([stops[position] for position in result.order][3:], [4, 3, 2, 1])
+        self.assertEqual(result.final_distance, 13.0)
+
+    def test_closed_route_and_limits(self):
+        distances = line_matrix(6)
+        result = RouteOptimizer(max_iterations=0).improve(0, [3, 1, 5, 2, 4], distances, end_index=0)
+        self.assertEqual(result.order, [0, 1, 2, 3, 4])
+        self.assertEqual(result.iterations, 0)
+        result = RouteOptimizer().improve(0, [3, 1, 5, 2, 4], distances, end_index=0)
+        self.assertEqual(result.final_distance, 10.0)
+
+    def test_never_longer_than_greedy(self):
+        hashtable = HashTable()
+        load_packages_into_hash(hashtable, 'Data/Packages.csv')
+        addresses = AddressRegistry(load_address_data('Data/Addresses.csv'))
+        distances = load_distance_data('Data/Distances.csv')
+        shipments = [6, 18, 22, 21, 35, 36, 26, 19, 3, 39, 17, 12, 27, 38, 24, 23]
+
+        greedy = Vehicle(2, 16, 18, None, list(shipments), 0.0, datetime.timedelta(hours=10), "4001 South 700 East")
+        _, greedy_distance = calculate_route(greedy, hashtable, addresses, distances)
+        optimized = Vehicle(2, 16, 18, None, list(shipments), 0.0, datetime.timedelta(hours=10),
+                            "4001 South 700 East")
+        _, optimized_distance = calculate_route(optimized, hashtable, addresses, distances,
+                                                optimizer=RouteOptimizer())
+
+        self.assertLessEqual(optimized_distance, greedy_distance)
+        self.assertEqual(sorted(optimized.shipments, key=int), sorted(greedy.shipments, key=int))
+        self.assertEqual(optimized.shipments[0], '6')  # the only package with a deadline stays first
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+# test_scenarios.py
+import csv
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from scenarios import parse_scenario, read_scenarios, run_scenarios, write_results
+
+
+class TestScenarioFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_defaults_and_per_truck_values(self):
+        scenario = parse_scenario({"name": "slow", "trucks": 2, "velocity": [18, 12], "departure": "8:30"})
+        self.assertEqual(scenario.drivers, 2)
+        self.assertEqual(scenario.velocity, (18.0, 12.0))
+        self.assertEqual(scenario.departure, (datetime.timedelta(hours=8, minutes=30),) * 2)
+        self.assertEqual(scenario.capacity, (16, 16))
+        self.assertEqual(scenario.address_correction, datetime.timedelta(hours=10, minutes=20))
+
+    def test_invalid_records(self):
+        with self.assertRaises(ValueError):
+            parse_scenario({"trucks": 2, "velocity": [18, 18, 18]})
+        with self.assertRaises(ValueError):
+            parse_scenario({"trucks": 2, "drivers": 3})
+        with self.assertRaises(ValueError):
+            parse_scenario({"truck": 2})
+        with self.assertRaises(ValueError):
+            parse_scenario({"departure": "eight"})
+
+    def test_csv_and_json_files(self):
+        csv_path = os.path.join(self.directory, "scenarios.csv")
+        with open(csv_path, "w", newline='') as file:
+            file.write("name,trucks,drivers,departure,deadline_aware\n"
+                       "late start,3,2,08:00:00;09:05:00;08:00:00,yes\n"
+                       ",4,,,\n")
+        json_path = os.path.join(self.directory, "scenarios.json")
+        with open(json_path, "w") as file:
+            json.dump({"scenarios": [{"name": "late start", "trucks": 3, "drivers": 2, "deadline_aware": True,
+                                      "departure": ["08:00:00", "09:05:00", "08:00:00"]}, {"trucks": 4}]}, file)
+
+        from_csv = read_scenarios(csv_path)
+        self.assertEqual(from_csv, read_scenarios(json_path))
+        self.assertEqual(from_csv[1].name, "scenario-2")
+        self.assertTrue(from_csv[0].deadline_aware)
+
+
+class TestRunScenarios(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.data = {}
+        for key, name in (('distances', 'Distances.csv'), ('addresses', 'Addresses.csv'),
+                          ('packages', 'Packages.csv')):
+            shutil.copy(os.path.join('Data', name), cls.directory)
+            cls.data[key] = os.path.join(cls.directory, name)
+        cls.data['snapshot'] = os.path.join(cls.directory, 'project.snapshot')
+        cls.scenarios = [parse_scenario({"name": "fourth truck", "trucks": 4, "drivers": 3}),
+                         parse_scenario({"name": "two trucks", "trucks": 2, "capacity": 24}),
+                         parse_scenario({"name": "leave at 8:30", "trucks": 3, "drivers": 2, "departure": "08:30"}),
+                         parse_scenario({"name": "five trucks", "trucks": 5, "drivers": 2})]
+        cls.results = run_scenarios(cls.scenarios, data=cls.data)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_results_in_scenario_order(self):
+        self.assertEqual([result.name for result in self.results], [scenario.name for scenario in self.scenarios])
+
+    def test_planned_scenario(self):
+        result = self.results[0]
+        self.assertIsNone(result.error)
+        self.assertEqual(sorted(result.truck_finish_times), [1, 2, 3, 4])
+        self.assertEqual(result.finish_time, max(result.truck_finish_times.values()))
+        self.assertGreater(result.total_miles, 0)
+        self.assertEqual(result.late_count, len(result.late_packages))
+
+    def test_truck_without_driver_waits(self):
+        result = self.results[2]
+        self.assertIsNone(result.error)
+        self.assertEqual(result.late_count, 0)
+
+    def test_no_more_trucks_out_than_drivers(self):
+        for scenario, result in zip(self.scenarios, self.results):
+            if result.error is not None:
+                continue
+            # A truck coming back frees its driver for a truck leaving at the same moment
+            changes = sorted([(start, 1) for start in result.truck_start_times.values()]
+                             + [(finish, -1) for finish in result.truck_finish_times.values()])
+            out, most = 0, 0
+            for _, change in changes:
+                out += change
+                most = max(most, out)
+            self.assertLessEqual(most, scenario.drivers, scenario.name)
+
+    def test_sample_scenarios_can_be_planned(self):
+        results = run_scenarios(read_scenarios(os.path.join('Data', 'Scenarios.json')), data=self.data)
+        self.assertEqual([result.error for result in results], [None] * len(results))
+        self.assertEqual({result.name: result.late_count for result in results},
+                         {result.name: 0 for result in results})
+
+    def test_infeasible_scenario_reports_error(self):
+        # Two single-trip trucks cannot both leave early enough for the 9:00 packages and wait for package 9
+        result = self.results[1]
+        self.assertIsNotNone(result.error)
+        self.assertIsNone(result.total_miles)
+
+    def test_parallel_matches_serial(self):
+        parallel = run_scenarios(self.scenarios, workers=2, data=self.data)
+        self.assertEqual([result._replace(elapsed=0) for result in parallel],
+                         [result._replace(elapsed=0) for result in self.results])
+
+    def test_write_results(self):
+        csv_path = os.path.join(self.directory, "results.csv")
+        json_path = os.path.join(self.directory, "results.json")
+        write_results(self.results, csv_path)
+        write_results(self.results, json_path)
+
+        with open(csv_path, newline='') as file:
+            rows = list(csv.DictReader(file))
+        with open(json_path) as file:
+            records = json.load(file)
+        self.assertEqual([row["name"] for row in rows], [record["name"] for record in records])
+        self.assertEqual(rows[0]["finish_time"], records[0]["finish_time"])
+        self.assertEqual(float(rows[0]["total_miles"]), records[0]["total_miles"])
+        self.assertEqual(records[1]["truck_finish_times"], {})
+        self.assertEqual(rows[1]["error"], records[1]["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# test_shortest_paths.py
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from main import load_distance_data
+from shortest_paths import ShortestPaths, cached_closure, floyd_warshall
+from route_optimizer import path_length
+
+
+def sparse_table(size, neighbours, seed=5):
+    rng = np.random.default_rng(seed)
+    points = rng.random((size, 2)) * 10
+    full = np.round(np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1)), 1)
+    values = np.full((size, size), np.inf)
+    np.fill_diagonal(values, 0.0)
+    for i in range(size):
+        # A chain keeps the graph connected; the rest are the nearest few neighbours
+        for j in list(np.argsort(full[i])[1:neighbours + 1]) + ([i + 1] if i + 1 < size else []):
+            values[i, j] = values[j, i] = full[i, j]
+    return values
+
+
+class TestShortestPaths(unittest.TestCase):
+
+    def test_methods_agree_and_paths_match_distances(self):
+        values = sparse_table(60, 3)
+        floyd = ShortestPaths(values, method="floyd-warshall")
+        dijkstra = ShortestPaths(values, method="dijkstra")
+        np.testing.assert_allclose(floyd.closure()[0], dijkstra.closure()[0])
+
+        lazy = ShortestPaths(values, method="dijkstra")
+        for i, j in ((0, 59), (17, 3), (42, 42)):
+            for paths in (floyd, lazy):
+                path = paths.path(i, j)
+                self.assertEqual((path[0], path[-1]), (i, j))
+                self.assertTrue(np.isfinite(values[path[:-1], path[1:]]).all())
+                self.assertAlmostEqual(path_length(path, paths.distances), paths.distance(i, j))
+
+    def test_filled_only_replaces_missing_pairs(self):
+        inf = np.inf
+        values = np.array([[0, 1, inf, 10], [1, 0, 2, inf], [inf, 2, 0, 3], [10, inf, 3, 0]])
+        filled = ShortestPaths(values).filled().values
+        self.assertEqual(filled[0, 2], 3.0)
+        self.assertEqual(filled[1, 3], 5.0)
+        self.assertEqual(filled[0, 3], 10.0)
+        self.assertEqual(floyd_warshall(values)[0][0, 3], 6.0)
+
+    def test_unreachable_pair(self):
+        values = np.array([[0.0, np.inf], [np.inf, 0.0]])
+        paths = ShortestPaths(values, method="dijkstra")
+        self.assertEqual(paths.distance(0, 1), np.inf)
+        self.assertIsNone(paths.path(0, 1))
+
+
+class TestClosureCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.csv = os.path.join(self.directory, 'Distances.csv')
+        self.values = sparse_table(30, 2)
+        self.write_csv()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_csv(self):
+        with open(self.csv, 'w', newline='') as output:
+            writer = csv.writer(output)
+            for i, row in enumerate(self.values):
+                writer.writerow(["" if np.isinf(value) else f"{value:.1f}" for value in row[:i + 1]])
+
+    def test_cache_written_next_to_data_and_reused(self):
+        distances = load_distance_data(self.csv)
+        self.assertTrue(np.isfinite(distances.values).all())
+        cache_path = os.path.join(self.directory, 'Distances.paths.npz')
+        self.assertTrue(os.path.exists(cache_path))
+
+        written = os.stat(cache_path).st_mtime_ns
+        cached = cached_closure(self.csv)
+        self.assertEqual(os.stat(cache_path).st_mtime_ns, written)
+        np.testing.assert_allclose(cached.closure()[0], floyd_warshall(self.values)[0])
+
+    def test_cache_rebuilt_when_data_changes(self):
+        cached_closure(self.csv)
+        self.values[0, 1] = self.values[1, 0] = 0.1
+        self.write_csv()
+        self.assertEqual(cached_closure(self.csv).distance(0, 1), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# test_snapshot.py
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from HashTable import HashTable
+from snapshot import Snapshot, compile_snapshot, load_data
+from test_fleet_planner import load_project_data
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.sources = []
+        for name in ('Distances.csv', 'Addresses.csv', 'Packages.csv'):
+            shutil.copy(os.path.join('Data', name), self.directory)
+            self.sources.append(os.path.join(self.directory, name))
+        self.snapshot_path = os.path.join(self.directory, 'project.snapshot')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def sources_by_name(self):
+        return dict(zip(("distances", "addresses", "packages"), self.sources))
+
+    def test_round_trip_matches_csv(self):
+        """Test that a snapshot gives back exactly what the CSV loaders produce."""
+        compile_snapshot(self.snapshot_path, *self.sources)
+        snapshot = Snapshot(self.snapshot_path)
+        hashtable, addresses, distances = load_project_data()
+
+        np.testing.assert_array_equal(snapshot.distances().values, distances.values)
+        self.assertFalse(snapshot.distances().values.flags.writeable)
+        self.assertEqual(snapshot.addresses().rows, addresses.rows)
+
+        loaded = snapshot.load_packages(HashTable())
+        self.assertEqual(sorted(loaded), sorted(hashtable))
+        for key, package in hashtable.items():
+            copy = loaded.get(key)
+            self.assertEqual((copy.package_id, copy.address, copy.deadline, copy.notes),
+                             (package.package_id, package.address, package.deadline, package.notes))
+
+    def test_stale_by_mtime_and_hash(self):
+        compile_snapshot(self.snapshot_path, *self.sources)
+        snapshot = Snapshot(self.snapshot_path)
+        self.assertFalse(snapshot.is_stale(self.sources_by_name()))
+
+        stat = os.stat(self.sources[2])
+        os.utime(self.sources[2], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertTrue(snapshot.is_stale(self.sources_by_name(), check="mtime"))
+        self.assertFalse(snapshot.is_stale(self.sources_by_name(), check="hash"))
+
+        with open(self.sources[2], 'a') as packages:
+            packages.write("\n41,410 S State St,Salt Lake City,UT,84111,EOD,5,\n")
+        self.assertTrue(snapshot.is_stale(self.sources_by_name(), check="hash"))
+
+    def test_load_data_rebuilds_stale_snapshot(self):
+        first = HashTable()
+        load_data(first, *self.sources, self.snapshot_path)
+        self.assertTrue(os.path.exists(self.snapshot_path))
+        self.assertEqual(len(first), 40)
+
+        with open(self.sources[2], 'a') as packages:
+            packages.write("\n41,410 S State St,Salt Lake City,UT,84111,EOD,5,\n")
+        second = HashTable()
+        distances, addresses = load_data(second, *self.sources, self.snapshot_path)
+        self.assertEqual(len(second), 41)
+        self.assertEqual(distances.distance(0, 1), 7.2)
+        self.assertEqual(addresses.index_of("4001 South 700 East"), 0)
+
+    def test_corrupt_snapshot_falls_back_to_csv(self):
+        with open(self.snapshot_path, 'wb') as snapshot:
+            snapshot.write(b"not a snapshot")
+        hashtable = HashTable()
+        distances, _ = load_data(hashtable, *self.sources, self.snapshot_path, rebuild=False)
+        self.assertEqual(len(hashtable), 40)
+        self.assertEqual(len(distances), 27)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# test_status_board.py
+import datetime
+import unittest
+
+from address_registry import AddressRegistry
+from HashTable import HashTable
+from main import load_packages_into_hash, load_distance_data, load_address_data, calculate_route
+from status_board import StatusBoard, DELIVERED, EN_ROUTE, AT_HUB
+from vehicle import Vehicle
+
+
+class TestStatusBoard(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hashtable = HashTable()
+        load_packages_into_hash(cls.hashtable, 'Data/Packages.csv')
+        addresses = AddressRegistry(load_address_data('Data/Addresses.csv'))
+        distances = load_distance_data('Data/Distances.csv')
+        vehicle = Vehicle(1, 16, 18, None, [15, 37, 31, 16, 29, 34, 40, 14, 1, 13, 20, 30], 0.0,
+                          datetime.timedelta(hours=8), "4001 South 700 East")
+        calculate_route(vehicle, cls.hashtable, addresses, distances)
+        cls.board = StatusBoard.from_packages(cls.hashtable)
+
+    def test_matches_update_status(self):
+        """Test that the vectorized query agrees with Package.update_status for every package."""
+        for hour, minute in ((7, 59), (8, 0), (8, 30), (9, 0), (9, 30), (12, 0)):
+            at = datetime.datetime(1900, 1, 1, hour, minute)
+            for package_id, status in zip(self.board.package_ids.tolist(), self.board.statuses(at)):
+                package = self.hashtable.get(package_id)
+                package.update_status(at)
+                self.assertEqual(package.status, status, (package_id, at))
+
+    def test_timeline(self):
+        times = [datetime.time(7, 0), datetime.timedelta(hours=9), 12 * 3600]
+        codes = self.board.timeline(times)
+        self.assertEqual(codes.shape, (3, len(self.board)))
+        self.assertEqual(set(codes[0].tolist()), {AT_HUB})
+        self.assertIn(EN_ROUTE, codes[1].tolist())
+        self.assertEqual(int((codes[2] == DELIVERED).sum()), 12)
+
+    def test_status_of(self):
+        self.assertEqual(self.board.status_of(15, datetime.time(12, 0)), "Delivered")
+        self.assertEqual(self.board.status_of(2, datetime.time(12, 0)), "At Hub")
+        self.assertIsNone(self.board.status_of(999, datetime.time(12, 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
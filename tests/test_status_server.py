@@ -0,0 +1,160 @@
+# test_status_server.py
+import asyncio
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import status_server
+from event_log import EventLog
+from main import plan_deliveries
+from plan_cache import DEFAULT_OPTIONS
+from status_board import StatusBoard
+from status_server import StatusServer, load_state
+from test_fleet_planner import load_project_data
+
+
+class TestStatusServer(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.state = load_state(DEFAULT_OPTIONS, cls.directory)
+        hashtable, addresses, distances = load_project_data()
+        event_log = EventLog()
+        plan_deliveries(hashtable, addresses, distances, event_log)
+        cls.board = StatusBoard.from_event_log(event_log, hashtable)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    async def asyncSetUp(self):
+        self.server = StatusServer(self.state, self.directory, executor=ThreadPoolExecutor(max_workers=1))
+        self.host, self.port = await self.server.start(port=0)
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.close()
+
+    async def ask(self, request, reader=None, writer=None):
+        (writer or self.writer).write((json.dumps(request) + "\n").encode())
+        await (writer or self.writer).drain()
+        return json.loads(await (reader or self.reader).readline())
+
+    async def test_single_and_batch_status_match_main(self):
+        at = datetime.datetime(1900, 1, 1, 10, 0)
+        expected = dict(zip(self.board.package_ids.tolist(), self.board.statuses(at)))
+
+        response = await self.ask({"op": "status", "id": 6, "at": "10:00:00", "request_id": "a"})
+        self.assertEqual((response["ok"], response["status"], response["request_id"]), (True, expected[6], "a"))
+
+        response = await self.ask({"op": "status", "at": "10:00:00"})
+        self.assertEqual({package["package_id"]: package["status"] for package in response["packages"]}, expected)
+
+        response = await self.ask({"op": "status", "ids": [1, 99], "at": "10:00"})
+        self.assertEqual([package["status"] for package in response["packages"]], [expected[1], None])
+
+    async def test_mileage_and_report(self):
+        response = await self.ask({"op": "mileage", "at": "09:00:00"})
+        self.assertEqual(response["total_mileage"], 18.0)
+        response = await self.ask({"op": "report"})
+        self.assertEqual(response["total_distance"], 106.7)
+
+    async def test_bad_requests(self):
+        for line in (b"not json\n", b"[1, 2]\n", b'{"op": "status", "id": 1}\n', b'{"op": "fly"}\n',
+                     b'{"op": "status", "id": 1, "at": "noon"}\n'):
+            self.writer.write(line)
+            response = json.loads(await self.reader.readline())
+            self.assertFalse(response["ok"])
+            self.assertIn("error", response)
+        self.assertTrue((await self.ask({"op": "ping"}))["ok"])
+
+    async def test_pipelined_requests_from_many_clients(self):
+        connections = [await asyncio.open_connection(self.host, self.port) for _ in range(10)]
+        for _, writer in connections:
+            writer.write("".join(json.dumps({"op": "status", "id": package_id, "at": "12:00:00",
+                                             "request_id": package_id}) + "\n"
+                                 for package_id in range(1, 41)).encode())
+        for reader, writer in connections:
+            responses = [json.loads(await reader.readline()) for _ in range(40)]
+            self.assertEqual([response["request_id"] for response in responses], list(range(1, 41)))
+            writer.close()
+
+    async def test_replan_swaps_without_blocking_queries(self):
+        real_load_state = status_server.load_state
+
+        def slow_load_state(*args):
+            time.sleep(0.2)
+            return real_load_state(*args)
+
+        with mock.patch('status_server.load_state', slow_load_state):
+            replan = asyncio.create_task(self.ask({"op": "replan", "options": {"deadline_aware": True}}))
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            started = time.perf_counter()
+            during = await self.ask({"op": "report"}, reader, writer)
+            self.assertLess(time.perf_counter() - started, 0.15)
+            self.assertEqual(during["plan"], self.state.key)
+            self.assertFalse(during["options"]["deadline_aware"])
+
+            response = await replan
+            after = await self.ask({"op": "report"}, reader, writer)
+            writer.close()
+        self.assertNotEqual(response["plan"], self.state.key)
+        self.assertEqual(after["plan"], response["plan"])
+        self.assertEqual(after["late_packages"], [])
+
+    async def test_replan_with_other_options_runs_after_the_current_one(self):
+        real_load_state = status_server.load_state
+        calls = []
+
+        def slow_load_state(options, *args):
+            calls.append(options)
+            time.sleep(0.1)
+            return real_load_state(options, *args)
+
+        with mock.patch('status_server.load_state', slow_load_state):
+            connections = [await asyncio.open_connection(self.host, self.port) for _ in range(2)]
+            first = asyncio.create_task(self.ask({"op": "replan", "options": {"deadline_aware": True}}))
+            joined = asyncio.create_task(self.ask({"op": "replan", "options": {"deadline_aware": True}},
+                                                  *connections[0]))
+            await asyncio.sleep(0.02)
+            second = await self.ask({"op": "replan", "options": {"assign": True}}, *connections[1])
+            first, joined = await first, await joined
+            for _, writer in connections:
+                writer.close()
+        self.assertEqual([options["assign"] for options in calls], [False, True])
+        self.assertTrue(first["options"]["deadline_aware"])
+        self.assertEqual(joined["plan"], first["plan"])
+        self.assertTrue(second["options"]["assign"])
+        self.assertEqual(self.server.state.key, second["plan"])
+
+    async def test_unexpected_errors_are_answered(self):
+        def failing_load_state(*args):
+            raise OSError("cache directory is gone")
+
+        with mock.patch('status_server.load_state', failing_load_state):
+            response = await self.ask({"op": "replan", "options": {"optimize": True}, "request_id": 7})
+        self.assertEqual((response["ok"], response["request_id"]), (False, 7))
+        self.assertIn("cache directory is gone", response["error"])
+        self.assertTrue((await self.ask({"op": "ping"}))["ok"])
+
+    async def test_unix_socket(self):
+        path = os.path.join(self.directory, "status.sock")
+        server = StatusServer(self.state, self.directory)
+        await server.start(port=0, unix_path=path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        response = await self.ask({"op": "ping"}, reader, writer)
+        writer.close()
+        await server.close()
+        self.assertEqual(response["plan"], self.state.key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# test_time_windows.py
+import datetime
+import unittest
+
+import numpy as np
+
+from main import plan_deliveries
+from package import Package
+from test_fleet_planner import load_project_data
+from time_windows import END_OF_DAY, TimeWindowRouter, deadline_minutes, late_packages, route_arrivals
+
+
+class TestDeadlines(unittest.TestCase):
+
+    def test_deadline_minutes(self):
+        self.assertEqual(deadline_minutes("10:30 AM"), 630)
+        self.assertEqual(deadline_minutes("9:00 AM"), 540)
+        self.assertEqual(deadline_minutes("EOD"), END_OF_DAY)
+
+    def test_late_packages(self):
+        on_time = Package("1", "a", "c", "s", "z", "10:30 AM", "1", "")
+        on_time.delivery_time = datetime.timedelta(hours=10, minutes=30)
+        late = Package("2", "a", "c", "s", "z", "9:00 AM", "1", "")
+        late.delivery_time = datetime.timedelta(hours=9, minutes=1)
+        self.assertEqual([package.package_id for package in late_packages({1: on_time, 2: late})], [2])
+
+
+class TestTimeWindowRouter(unittest.TestCase):
+
+    def setUp(self):
+        # Addresses on a line one mile apart; at 60 mph a mile takes one minute
+        self.values = np.abs(np.subtract.outer(np.arange(12.0), np.arange(12.0)))
+        self.router = TimeWindowRouter(self.values, 60)
+
+    def test_far_deadline_visited_first(self):
+        # Starting at 5, nearest-first would visit 4 and 3 and reach 10 at minute 9, after its deadline of 5
+        stops = [4, 3, 10]
+        deadlines = [END_OF_DAY, END_OF_DAY, 5]
+        route = self.router.build(5, 0, stops, deadlines)
+        self.assertEqual(route.late, [])
+        self.assertEqual(route.order[0], 2)
+        arrivals = route_arrivals(5, 0, [stops[position] for position in route.order], self.router.distances, 60)
+        np.testing.assert_allclose(route.arrivals, arrivals)
+
+    def test_insertion_keeps_earlier_deadlines(self):
+        # The stop at 11 could go last cheaply, but a detour to it before 5 would make 5 late
+        stops = [5, 11, 6]
+        deadlines = [5, END_OF_DAY, 7]
+        route = self.router.build(0, 0, stops, deadlines)
+        self.assertEqual(route.late, [])
+        self.assertEqual([stops[position] for position in route.order], [5, 6, 11])
+
+    def test_infeasible_stop_reported_late(self):
+        route = self.router.build(0, 0, [8, 9], [3, END_OF_DAY])
+        self.assertEqual(len(route.late), 1)
+        self.assertEqual(self.router.lateness(0, 0, [8, 9], [3, END_OF_DAY]), (1, 5.0))
+
+
+class TestProjectDeadlines(unittest.TestCase):
+
+    def test_project_plan_meets_every_deadline(self):
+        hashtable, addresses, distances = load_project_data()
+        _, total_distance = plan_deliveries(hashtable, addresses, distances, deadline_aware=True)
+        self.assertEqual(late_packages(hashtable), [])
+        self.assertLess(total_distance, 106.7)
+
+
+if __name__ == '__main__':
+    unittest.main()
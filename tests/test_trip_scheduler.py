@@ -0,0 +1,157 @@
+# test_trip_scheduler.py
+import datetime
+import unittest
+
+from assignment import AssignmentSolver, Trip, parse_constraints
+from event_log import EventLog
+from test_fleet_planner import load_project_data
+from time_windows import late_packages
+from trip_scheduler import TripScheduler
+from vehicle import Vehicle
+
+DEPOT = "4001 South 700 East"
+EIGHT = datetime.timedelta(hours=8)
+LATE = datetime.timedelta(days=1)
+
+
+def trucks(count, capacity=16, start=EIGHT):
+    return [Vehicle(truck_id, capacity, 18, None, [], 0.0, start, DEPOT) for truck_id in range(1, count + 1)]
+
+
+def scheduler_for(truck_count, drivers, capacity=16):
+    hashtable, addresses, distances = load_project_data()
+    return TripScheduler(hashtable, addresses, distances, trucks(truck_count, capacity), drivers,
+                         address_correction_time=datetime.timedelta(hours=10, minutes=20))
+
+
+def overlapping(intervals):
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    running, most = 0, 0
+    for _, change in events:
+        running += change
+        most = max(most, running)
+    return most
+
+
+class TestTrips(unittest.TestCase):
+
+    def test_trips_cover_every_package_within_capacity(self):
+        hashtable, addresses, distances = load_project_data()
+        solver = AssignmentSolver(hashtable, addresses, distances, DEPOT)
+        trips = solver.trips(6, 18, [1, 2, 3])
+        packages = [package_id for trip in trips for package_id in trip.packages]
+        self.assertEqual(sorted(packages), list(range(1, 41)))
+        self.assertTrue(all(len(trip.packages) <= 6 for trip in trips))
+        self.assertEqual(trips, sorted(trips, key=lambda trip: trip.latest_start))
+        for trip in trips:
+            restricted = {parse_constraints(hashtable.get(package_id)).truck for package_id in trip.packages} - {None}
+            self.assertEqual(restricted, set() if trip.truck is None else {trip.truck})
+
+    def test_group_larger_than_a_truck(self):
+        hashtable, addresses, distances = load_project_data()
+        with self.assertRaises(ValueError):
+            AssignmentSolver(hashtable, addresses, distances, DEPOT).trips(3, 18, [1, 2, 3])
+
+
+class TestTripScheduler(unittest.TestCase):
+
+    def test_project_day_with_two_drivers(self):
+        scheduler = scheduler_for(3, 2)
+        event_log = EventLog()
+        schedule = scheduler.schedule(event_log=event_log)
+
+        delivered = [int(package_id) for trip in schedule.trips for package_id in trip.packages]
+        self.assertEqual(sorted(delivered), list(range(1, 41)))
+        self.assertLessEqual(overlapping([(trip.start, trip.end) for trip in schedule.trips]), 2)
+        for driver_id in (1, 2):
+            self.assertEqual(overlapping([(trip.start, trip.end) for trip in schedule.trips
+                                          if trip.driver_id == driver_id]), 1)
+        for truck in scheduler.trucks.values():
+            truck_trips = [trip for trip in schedule.trips if trip.truck_id == truck.id]
+            self.assertLessEqual(overlapping([(trip.start, trip.end) for trip in truck_trips]), 1)
+            self.assertTrue(all(len(trip.packages) <= truck.max_load for trip in truck_trips))
+            if truck_trips:
+                # The event log's mileage adds up over the truck's trips
+                self.assertAlmostEqual(event_log.vehicle_events(truck.id)[-1].mileage, truck.total_distance)
+                self.assertEqual(truck.current_time, truck_trips[-1].end)
+        self.assertAlmostEqual(schedule.total_distance,
+                               sum(truck.total_distance for truck in scheduler.trucks.values()))
+        self.assertEqual(schedule.finish_time, max(trip.end for trip in schedule.trips))
+
+        for package in scheduler.hashtable.values():
+            constraints = parse_constraints(package)
+            if constraints.available_at is not None:
+                self.assertGreaterEqual(package.departure_time, constraints.available_at)
+            if constraints.truck is not None:
+                self.assertIn(package.package_id, scheduler.trucks[constraints.truck].shipments)
+
+    def test_project_day_has_no_late_packages(self):
+        """Test that the driver back at 8:00 waits for the 9:05 packages instead of taking an end-of-day trip."""
+        scheduler = scheduler_for(3, 2)
+        schedule = scheduler.schedule()
+        self.assertEqual(late_packages(scheduler.hashtable), [])
+        self.assertEqual(min(trip.start for trip in schedule.trips if trip.truck_id == 2),
+                         datetime.timedelta(hours=9, minutes=5))
+
+    def test_driver_waits_for_a_more_urgent_trip(self):
+        scheduler = scheduler_for(2, 1)
+        trips = [Trip([13], None, datetime.timedelta(0), LATE, datetime.timedelta(hours=2)),
+                 Trip([14], None, datetime.timedelta(hours=8, minutes=30), datetime.timedelta(hours=9),
+                      datetime.timedelta(hours=1))]
+        schedule = scheduler.schedule(trips)
+        self.assertEqual([trip.packages for trip in schedule.trips], [['14'], ['13']])
+        self.assertEqual(schedule.trips[0].start, datetime.timedelta(hours=8, minutes=30))
+
+    def test_one_driver_drives_the_trips_back_to_back(self):
+        scheduler = scheduler_for(2, 1)
+        trips = [Trip([13, 14], None, datetime.timedelta(0), LATE), Trip([1, 2], None, datetime.timedelta(0), LATE),
+                 Trip([5, 7], None, datetime.timedelta(0), LATE)]
+        schedule = scheduler.schedule(trips)
+        self.assertEqual(len(schedule.trips), 3)
+        self.assertEqual(schedule.trips[0].start, EIGHT)
+        for before, after in zip(schedule.trips, schedule.trips[1:]):
+            self.assertEqual(after.start, before.end)
+            self.assertEqual(after.driver_id, 1)
+
+    def test_one_truck_is_reloaded(self):
+        scheduler = scheduler_for(1, 3)
+        trips = [Trip([13, 14], None, datetime.timedelta(0), LATE), Trip([1, 2], None, datetime.timedelta(0), LATE)]
+        schedule = scheduler.schedule(trips)
+        self.assertEqual([trip.truck_id for trip in schedule.trips], [1, 1])
+        self.assertEqual(schedule.trips[1].start, schedule.trips[0].end)
+        self.assertNotEqual(schedule.trips[0].driver_id, schedule.trips[1].driver_id)
+        self.assertEqual(scheduler.trucks[1].shipments, schedule.trips[0].packages + schedule.trips[1].packages)
+
+    def test_trip_waits_for_its_packages(self):
+        scheduler = scheduler_for(2, 2)
+        arrival = datetime.timedelta(hours=9, minutes=5)
+        trips = [Trip([6], None, arrival, LATE), Trip([13], None, datetime.timedelta(0), LATE)]
+        schedule = scheduler.schedule(trips)
+        starts = {trip.packages[0]: trip.start for trip in schedule.trips}
+        self.assertEqual(starts['13'], EIGHT)
+        self.assertEqual(starts['6'], arrival)
+
+    def test_most_urgent_ready_trip_leaves_first(self):
+        scheduler = scheduler_for(1, 1)
+        trips = [Trip([13], None, datetime.timedelta(0), LATE),
+                 Trip([14], None, datetime.timedelta(0), datetime.timedelta(hours=9))]
+        schedule = scheduler.schedule(trips)
+        self.assertEqual(schedule.trips[0].packages, ['14'])
+
+    def test_restricted_trip_waits_for_its_truck(self):
+        scheduler = scheduler_for(2, 2)
+        trips = [Trip([3], 2, datetime.timedelta(0), LATE), Trip([18], 2, datetime.timedelta(0), LATE)]
+        schedule = scheduler.schedule(trips)
+        self.assertEqual([trip.truck_id for trip in schedule.trips], [2, 2])
+        self.assertEqual(schedule.trips[1].start, schedule.trips[0].end)
+
+    def test_unknown_restricted_truck(self):
+        scheduler = scheduler_for(1, 1)
+        with self.assertRaises(ValueError):
+            scheduler.schedule([Trip([3], 2, datetime.timedelta(0), LATE)])
+        with self.assertRaises(ValueError):
+            TripScheduler(scheduler.hashtable, scheduler.addresses, scheduler.distances, trucks(1), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
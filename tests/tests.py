@@ -4,6 +4,7 @@ import tempfile
 import os
 
 from main import load_packages_into_hash
+from HashTable import HashTable
 from package import Package
 
 
@@ -101,6 +102,20 @@ class TestLoadPackagesIntoHash(unittest.TestCase):
         finally:
             os.remove(filename)
 
+    def test_sizes_hash_table_once(self):
+        """Test that a HashTable is reserved from the row count so loading does not resize it."""
+        csv_content = "Package ID,Address,City,State,Zip,Deadline,Weight,Notes\n" + "".join(
+            f"{i},195 W Oakland Ave,Salt Lake City,UT,84115,EOD,1,\n" for i in range(1, 101))
+        filename = self.create_temp_csv(csv_content)
+
+        try:
+            hashtable = HashTable()
+            load_packages_into_hash(hashtable, filename)
+            self.assertEqual(len(hashtable), 100)
+            self.assertEqual(hashtable.capacity, 256)
+        finally:
+            os.remove(filename)
+
 
 if __name__ == '__main__':
     unittest.main()
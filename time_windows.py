@@ -0,0 +1,105 @@
+# The 'time_windows' module routes a vehicle so that packages meet their deadlines. Deadlines are parsed once
+# into integer minutes since midnight (EOD is the end of the day). A route keeps two arrays over its stops:
+#   arrival[k] - the time the vehicle reaches stop k (vehicles never wait, so this is also the earliest arrival)
+#   slack[k]   - min over j >= k of deadline[j] - arrival[j], how far stop k and everything after it may be
+#                pushed back without missing a deadline (forward slack)
+# Inserting a stop between positions p and p + 1 delays the rest of the route by the detour, so the insertion is
+# feasible exactly when the new stop is reached by its own deadline and the detour is at most slack[p + 1]. Each
+# candidate is checked in O(1) and all positions of a stop are scored together with NumPy.
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from assignment import parse_clock
+from distance_matrix import DistanceMatrix
+
+END_OF_DAY = 24 * 60
+
+TimeWindowRoute = namedtuple("TimeWindowRoute", ["order", "arrivals", "late"])
+LatePackage = namedtuple("LatePackage", ["package_id", "delivery_time", "deadline"])
+
+
+# The 'deadline_minutes' function converts a deadline such as "10:30 AM" to minutes since midnight, and "EOD"
+# to END_OF_DAY. Each distinct string is parsed once. The time complexity is O(1) after the first call.
+@lru_cache(maxsize=None)
+def deadline_minutes(deadline):
+    parsed = parse_clock(deadline)
+    return END_OF_DAY if parsed is None else int(parsed.total_seconds() // 60)
+
+
+# The 'route_arrivals' function returns the arrival minute at every stop of a route. O(n) vectorized work.
+def route_arrivals(start_index, start_minutes, stop_indexes, distances, velocity):
+    path = np.array([start_index] + list(stop_indexes), dtype=np.intp)
+    legs = distances.values[path[:-1], path[1:]]
+    return start_minutes + np.cumsum(legs) * (60.0 / velocity)
+
+
+# The 'late_packages' function lists the delivered packages in 'hashtable' that missed their deadline, as
+# LatePackage tuples sorted by package ID. The time complexity is O(n).
+def late_packages(hashtable):
+    late = []
+    for package_id, package in hashtable.items():
+        if package.delivery_time is None:
+            continue
+        if package.delivery_time.total_seconds() / 60 > deadline_minutes(package.deadline):
+            late.append(LatePackage(package_id, package.delivery_time, package.deadline))
+    return sorted(late)
+
+
+class TimeWindowRouter:
+    # The __init__ method stores the distances and the vehicle speed in miles per hour.
+    def __init__(self, distances, velocity):
+        self.distances = DistanceMatrix.wrap(distances)
+        self.velocity = velocity
+        self.minutes_per_mile = 60.0 / velocity
+
+    # The 'build' method orders the stops by cheapest feasible insertion, tightest deadline first. Stops that
+    # cannot be inserted without a missed deadline go where they add the least lateness. It returns a
+    # TimeWindowRoute with the visiting order (positions in 'stop_indexes'), the arrival minutes in that order
+    # and the positions that are late. The time complexity is O(n^2) vectorized work.
+    def build(self, start_index, start_minutes, stop_indexes, deadlines):
+        values = self.distances.values
+        stop_indexes = np.asarray(stop_indexes, dtype=np.intp)
+        deadlines = np.asarray(deadlines, dtype=np.float64)
+        # Tightest deadline first; among equal deadlines the farthest stops first, which suits cheapest insertion
+        candidates = np.lexsort((-values[start_index, stop_indexes], deadlines))
+
+        order = []
+        path = np.array([start_index], dtype=np.intp)  # the start followed by the stops in visiting order
+        arrivals = np.array([float(start_minutes)])
+        slack = np.array([np.inf])  # slack[k] for path position k; position 0 is the start and is never pushed
+        for candidate in candidates.tolist():
+            stop = stop_indexes[candidate]
+            following = np.append(path[1:], -1)
+            has_next = following >= 0
+            following = np.where(has_next, following, 0)
+            to_stop = values[path, stop]
+            detour = to_stop + np.where(has_next, values[stop, following] - values[path, following], 0.0)
+            delay = detour * self.minutes_per_mile
+            arrival = arrivals + to_stop * self.minutes_per_mile
+            rest_slack = np.append(slack[1:], np.inf)
+
+            feasible = (arrival <= deadlines[candidate]) & (delay <= rest_slack)
+            if feasible.any():
+                position = int(np.argmin(np.where(feasible, detour, np.inf)))
+            else:
+                lateness = (np.maximum(arrival - deadlines[candidate], 0.0)
+                            + np.maximum(delay - np.maximum(rest_slack, 0.0), 0.0))
+                position = int(np.lexsort((detour, lateness))[0])
+
+            order.insert(position, candidate)
+            path = np.insert(path, position + 1, stop)
+            arrivals = np.concatenate(([start_minutes], route_arrivals(start_index, start_minutes, path[1:],
+                                                                       self.distances, self.velocity)))
+            margin = np.concatenate(([np.inf], deadlines[order] - arrivals[1:]))
+            slack = np.minimum.accumulate(margin[::-1])[::-1]
+
+        late = [position for position, candidate in enumerate(order) if arrivals[position + 1] > deadlines[candidate]]
+        return TimeWindowRoute(order, arrivals[1:], late)
+
+    # The 'lateness' method returns (number of late stops, total minutes late) for a visiting order. O(n).
+    def lateness(self, start_index, start_minutes, stop_indexes, deadlines):
+        arrivals = route_arrivals(start_index, start_minutes, stop_indexes, self.distances, self.velocity)
+        late = np.maximum(arrivals - np.asarray(deadlines, dtype=np.float64), 0.0)
+        return int(np.count_nonzero(late)), float(late.sum())
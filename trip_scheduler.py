@@ -0,0 +1,233 @@
+# The 'trip_scheduler' module schedules a day of deliveries with drivers and trucks as separate resources. The
+# packages are first cut into depot round trips of at most a truck's load (AssignmentSolver.trips); a truck can
+# then drive several of those trips a day, reloading at the depot between them, and a trip leaves as soon as a
+# driver and a suitable truck are both back at the depot and its packages have arrived. The schedule is simulated
+# event by event with priority queues (heaps): drivers and trucks are kept by the time they return, trips that are
+# not at the depot yet by the time they arrive and ready trips by their latest start, so the most urgent ready trip
+# leaves first, unless its driver is needed for a more urgent trip that the other drivers cannot take in time. Each
+# dispatch costs O(log T + R + U log D) for T trips, R trucks that have restricted trips, U urgent trips and D
+# drivers, and a route of at most 'max_load' stops, so hundreds of trucks and thousands of trips are scheduled in
+# near-linear time.
+# This generalizes the project's hand-made rule that truck 3 leaves when the first of trucks 1 and 2 is back.
+#
+# Usage: python trip_scheduler.py [--trucks 3] [--drivers 2] [--capacity 16] [--start 08:00]
+import argparse
+import datetime
+import heapq
+from collections import namedtuple
+
+from address_registry import AddressRegistry
+from assignment import AssignmentSolver
+from distance_matrix import DistanceMatrix
+from event_log import EventLog
+from fleet_planner import DEFAULT_DEPOT
+from main import calculate_return_trip, calculate_route
+from vehicle import Vehicle
+
+ScheduledTrip = namedtuple("ScheduledTrip", ["truck_id", "driver_id", "start", "end", "packages", "distance"])
+Schedule = namedtuple("Schedule", ["trips", "total_distance", "finish_time"])
+
+
+class TripScheduler:
+    # The __init__ method stores the routing data and the fleet: 'trucks' are Vehicle objects (their IDs, loads,
+    # speeds and the time each is first available) and 'drivers' the number of drivers, who start at 'day_start'.
+    # 'optimizer' and 'deadline_aware' are passed on to 'calculate_route'; 'address_correction_time' holds packages
+    # with a wrong address until then.
+    def __init__(self, hashtable, addresses, distances, trucks, drivers, day_start=datetime.timedelta(hours=8),
+                 depot_address=DEFAULT_DEPOT, optimizer=None, deadline_aware=False, address_correction_time=None):
+        if drivers < 1 or not trucks:
+            raise ValueError("A schedule needs at least one driver and one truck.")
+        self.hashtable = hashtable
+        self.addresses = AddressRegistry.wrap(addresses)
+        self.distances = DistanceMatrix.wrap(distances)
+        self.trucks = {truck.id: truck for truck in trucks}
+        self.drivers = drivers
+        self.day_start = day_start
+        self.depot_address = depot_address
+        self.optimizer = optimizer
+        self.deadline_aware = deadline_aware
+        self.address_correction_time = address_correction_time
+
+    # The 'plan_trips' method cuts the packages into trips that fit the smallest truck and routes each trip once for
+    # its latest start and duration. O(n * c log c) plus one route per trip.
+    def plan_trips(self, package_ids=None):
+        solver = AssignmentSolver(self.hashtable, self.addresses, self.distances, self.depot_address,
+                                  address_correction_time=self.address_correction_time, optimizer=self.optimizer,
+                                  deadline_aware=self.deadline_aware)
+        return solver.trips(min(truck.max_load for truck in self.trucks.values()),
+                            min(truck.velocity for truck in self.trucks.values()), list(self.trucks), package_ids)
+
+    # The 'schedule' method drives 'trips' (by default 'plan_trips()'): whenever a driver is back, the most urgent
+    # ready trip leaves with the earliest free truck that may carry it, unless that keeps the driver away while a
+    # more urgent trip has to leave that the other drivers cannot take in time; the driver then waits for it. The
+    # check needs the trip's duration, which 'plan_trips' sets. Routes, package times and events are those of
+    # 'calculate_route' and 'calculate_return_trip'; each truck's mileage in 'event_log' adds up over its trips.
+    # The trucks end with all their shipments, their last return time and their total distance. It returns a
+    # Schedule, and raises ValueError when a trip is restricted to a truck that is not in the fleet.
+    def schedule(self, trips=None, event_log=None):
+        trips = self.plan_trips() if trips is None else list(trips)
+        unknown = {trip.truck for trip in trips if trip.truck is not None and trip.truck not in self.trucks}
+        if unknown:
+            raise ValueError(f"Trips are restricted to trucks {sorted(unknown)}, which are not in the fleet.")
+        for truck in self.trucks.values():
+            truck.shipments, truck.total_distance = [], 0.0
+
+        drivers = [(self.day_start, driver_id) for driver_id in range(1, self.drivers + 1)]
+        truck_free = {truck_id: truck.departure_time for truck_id, truck in self.trucks.items()}
+        free_trucks = [(free_at, truck_id) for truck_id, free_at in truck_free.items()]
+        heapq.heapify(free_trucks)
+        waiting = [(trip.available_at, order, trip) for order, trip in enumerate(trips)]
+        heapq.heapify(waiting)
+        ready, restricted = [], {}
+
+        def release(now):
+            while waiting and waiting[0][0] <= now:
+                _, order, trip = heapq.heappop(waiting)
+                queue = ready if trip.truck is None else restricted.setdefault(trip.truck, [])
+                heapq.heappush(queue, (trip.latest_start, order, trip))
+
+        def earliest_truck():
+            # Entries are left behind when a truck leaves again; only the one matching 'truck_free' counts
+            while free_trucks and truck_free[free_trucks[0][1]] != free_trucks[0][0]:
+                heapq.heappop(free_trucks)
+            return free_trucks[0] if free_trucks else None
+
+        # Trips by latest start, for finding the pending trips that must leave before a driver would be back
+        by_urgency = sorted(range(len(trips)), key=lambda order: (trips[order].latest_start, order))
+        done = [False] * len(trips)
+        first_pending = 0
+
+        def covered(urgent, free):
+            # Whether drivers back at the times 'free' can each take the next urgent trip in time
+            free = sorted(free)
+            for trip in urgent:
+                if not free:
+                    return False
+                start = max(heapq.heappop(free), trip.available_at)
+                if start > trip.latest_start:
+                    return False
+                if trip.duration is not None:
+                    heapq.heappush(free, start + trip.duration)
+            return True
+
+        def strands_urgent_trip(order, now):
+            # Whether driving trip 'order' now keeps this driver away while a more urgent trip has to leave, when
+            # the other drivers cannot take that trip in time but this one could by staying at the depot
+            nonlocal first_pending
+            trip = trips[order]
+            if trip.duration is None:
+                return False
+            while first_pending < len(by_urgency) and done[by_urgency[first_pending]]:
+                first_pending += 1
+            bound = min(trip.latest_start, now + trip.duration)
+            urgent = []
+            for position in range(first_pending, len(by_urgency)):
+                other = by_urgency[position]
+                if trips[other].latest_start >= bound:
+                    break
+                if not done[other] and other != order:
+                    urgent.append(trips[other])
+            if not urgent:
+                return False
+            others = [back for back, _ in heapq.nsmallest(len(urgent), drivers)]
+            return not covered(urgent, others) and covered(urgent, others + [now])
+
+        scheduled = []
+        while waiting or ready or any(restricted.values()):
+            driver_free, driver_id = heapq.heappop(drivers)
+            now = driver_free
+            while True:
+                release(now)
+                options = []
+                first = earliest_truck()
+                if ready and first is not None and first[0] <= now:
+                    options.append((ready[0][0], ready[0][1], ready, first[1]))
+                for truck_id, queue in restricted.items():
+                    if queue and truck_free[truck_id] <= now:
+                        options.append((queue[0][0], queue[0][1], queue, truck_id))
+                # The next arrival of packages or of a truck that has work
+                moments = [waiting[0][0]] if waiting else []
+                if ready and first is not None:
+                    moments.append(first[0])
+                moments.extend(truck_free[truck_id] for truck_id, queue in restricted.items() if queue)
+                later = [moment for moment in moments if moment > now]
+                if options:
+                    best = min(options, key=lambda option: option[:2])
+                    # A trip that is not urgent waits while it would make a more urgent one miss its latest start
+                    if not later or not strands_urgent_trip(best[1], now):
+                        break
+                now = min(later)
+
+            _, order, queue, truck_id = best
+            trip = heapq.heappop(queue)[2]
+            done[order] = True
+            end, shipments, distance = self._drive(trip, self.trucks[truck_id], now, event_log)
+            scheduled.append(ScheduledTrip(truck_id, driver_id, now, end, shipments, distance))
+            truck_free[truck_id] = end
+            heapq.heappush(free_trucks, (end, truck_id))
+            heapq.heappush(drivers, (end, driver_id))
+
+        total_distance = sum(trip.distance for trip in scheduled)
+        finish_time = max((trip.end for trip in scheduled), default=self.day_start)
+        return Schedule(scheduled, total_distance, finish_time)
+
+    # The _drive method routes one trip with the truck leaving at 'start' and coming back to the depot. The events
+    # are copied to 'event_log' with the truck's mileage of the day so far added. It returns (return time,
+    # shipments in delivery order, trip distance).
+    def _drive(self, trip, truck, start, event_log):
+        vehicle = Vehicle(truck.id, truck.max_load, truck.velocity, None, list(trip.packages), 0.0, start,
+                          self.depot_address)
+        trip_log = EventLog() if event_log is not None else None
+        calculate_route(vehicle, self.hashtable, self.addresses, self.distances, trip_log, self.optimizer,
+                        self.deadline_aware)
+        calculate_return_trip(vehicle, vehicle.current_address, self.depot_address, self.distances,
+                              self.addresses, trip_log)
+        if event_log is not None:
+            for event in trip_log:
+                event_log.record(event.kind, event.vehicle_id, event.package_id, event.address_index, event.time,
+                                 truck.total_distance + event.mileage)
+
+        truck.shipments.extend(vehicle.shipments)
+        truck.total_distance += vehicle.total_distance
+        truck.current_time = vehicle.current_time
+        truck.current_address = self.depot_address
+        return vehicle.current_time, list(vehicle.shipments), vehicle.total_distance
+
+
+def main(argv=None):
+    from HashTable import HashTable
+    from main import mileage_summary
+    from snapshot import load_data
+    from time_windows import late_packages
+
+    parser = argparse.ArgumentParser(description="Schedule several trips per truck with a limited number of drivers.")
+    parser.add_argument("--trucks", type=int, default=3)
+    parser.add_argument("--drivers", type=int, default=2)
+    parser.add_argument("--capacity", type=int, default=16)
+    parser.add_argument("--start", default="08:00", help="when the drivers and trucks start (HH:MM)")
+    args = parser.parse_args(argv)
+
+    hours, minutes = (int(part) for part in args.start.split(":"))
+    start = datetime.timedelta(hours=hours, minutes=minutes)
+    hashtable = HashTable()
+    distances, addresses = load_data(hashtable, 'Data/Distances.csv', 'Data/Addresses.csv', 'Data/Packages.csv',
+                                     'Data/project.snapshot')
+    trucks = [Vehicle(truck_id, args.capacity, 18, None, [], 0.0, start, DEFAULT_DEPOT)
+              for truck_id in range(1, args.trucks + 1)]
+    scheduler = TripScheduler(hashtable, addresses, distances, trucks, args.drivers, start,
+                              address_correction_time=datetime.timedelta(hours=10, minutes=20))
+    event_log = EventLog()
+    schedule = scheduler.schedule(event_log=event_log)
+
+    for trip in schedule.trips:
+        print(f"Truck {trip.truck_id} with driver {trip.driver_id}: {trip.start} - {trip.end}, "
+              f"{round(trip.distance, 1)} miles, packages {trip.packages}")
+    used = [truck for truck in trucks if truck.shipments]
+    for line in mileage_summary(used, schedule.total_distance, event_log):
+        print(line)
+    late = late_packages(hashtable)
+    print("Late packages: " + (", ".join(str(package.package_id) for package in late) or "none"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
 import datetime
+from collections import namedtuple
 
 
 # The 'Vehicle' class encapsulates all the properties of a vehicle used for package delivery.
 # This is an example of Object-Oriented Programming (OOP) where we encapsulate related data
-# and methods into objects.
+# and methods into objects. Each vehicle has a home depot ('depot_address') where its route starts and ends;
+# by default it is the address the vehicle starts at.
 
 class Vehicle:
     def __init__(self, id, max_load, velocity, cargo, shipments, distance_travelled, departure_time,
-                 current_address=None):
+                 current_address=None, depot_address=None):
         self.id = id
         self.max_load = max_load
         self.velocity = velocity
@@ -15,6 +17,7 @@ class Vehicle:
         self.shipments = shipments
         self.distance_travelled = distance_travelled
         self.current_address = current_address
+        self.depot_address = depot_address or current_address
         self.departure_time = departure_time
         self.current_time = departure_time
         self.total_distance = 0.0
@@ -25,3 +28,17 @@ class Vehicle:
                 f"Departure Time: {self.departure_time}, Current Address: {self.current_address}, "
                 f"Current Time: {self.current_time}, Total Distance: {self.total_distance}")
 
+
+# The project's fleet: each truck's ID, maximum load, speed in miles per hour, hand-made shipment list and
+# departure time, the trucks it waits for (it leaves when the first of them is back at the depot) and whether it
+# returns to the depot. Plan caches hash this description, so a change here plans the routes again.
+FleetEntry = namedtuple("FleetEntry", ["id", "max_load", "velocity", "shipments", "departure_time", "start_after",
+                                       "return_to_depot"])
+
+PROJECT_FLEET = (
+    FleetEntry(1, 16, 18, (15, 37, 31, 16, 29, 34, 40, 14, 1, 13, 20, 30), datetime.timedelta(hours=8), (), True),
+    FleetEntry(2, 16, 18, (6, 18, 22, 21, 35, 36, 26, 19, 3, 39, 17, 12, 27, 38, 24, 23),
+               datetime.timedelta(hours=10, minutes=20), (), True),
+    FleetEntry(3, 16, 18, (10, 11, 5, 33, 4, 32, 25, 9, 8, 7, 28, 6, 2), datetime.timedelta(hours=9, minutes=5),
+               (1, 2), False),
+)